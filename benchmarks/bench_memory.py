@@ -0,0 +1,78 @@
+# bench_memory.py
+"""
+Memory benchmark: bytes per Pet with the slotted layout and shared,
+interned configs vs. the old layout (a per-pet __dict__ and a PetConfig
+instance per pet).
+
+Pets are loaded from JSON, like storage.py does, so their strings are
+fresh objects unless the Pet canonicalizes them. Run from the repository
+root:
+
+    python benchmarks/bench_memory.py
+"""
+
+import dataclasses
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "console_tamagotchi"))
+
+from pet import Pet, PetConfig, PetState  # noqa: E402
+
+PETS = 20_000
+
+# The old PetConfig: a plain (mutable, dict-backed) dataclass with the
+# fields it had before the evolution settings grew past food_to_adult.
+_FIELDS = [(f.name, f.type, f.default) for f in dataclasses.fields(PetConfig)]
+_LAST = [name for name, _, _ in _FIELDS].index("food_to_adult")
+LegacyConfig = dataclasses.make_dataclass("LegacyConfig", _FIELDS[:_LAST + 1])
+
+
+class LegacyPet:
+    """The attributes the old Pet kept in its __dict__, set from the saved data only."""
+
+    def __init__(self, data: dict) -> None:
+        self.name = data["name"]
+        self.species = data["species"]
+        self._stage = data["stage"]
+        self.hunger = data["hunger"]
+        self.happiness = data["happiness"]
+        self.energy = data["energy"]
+        self.total_food_eaten = data["total_food_eaten"]
+        self._config = LegacyConfig()          # `config or PetConfig()`
+        self._state = PetState(data["state"])  # the shared enum member
+        self._is_sleeping = data["is_sleeping"]
+        self._play_cooldown = 0
+        self._visual_action = None             # old from_dict did not restore it
+        self._visual_action_ticks_remaining = 0
+
+
+def _saved_pets() -> list:
+    pets = [Pet(f"pet-{i}", species=("cat", "dog", "dragon")[i % 3]) for i in range(PETS)]
+    for i, pet in enumerate(pets):
+        if i % 2:
+            pet.feed()
+    return json.loads(json.dumps([pet.to_dict() for pet in pets]))
+
+
+def bytes_per_pet(label: str, load) -> float:
+    saved = _saved_pets()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    pets = [load(data) for data in saved]
+    per_pet = (tracemalloc.get_traced_memory()[0] - before) / len(pets)
+    tracemalloc.stop()
+    print(f"{label:<8} {per_pet:8.0f} bytes/pet")
+    return per_pet
+
+
+def main() -> None:
+    before = bytes_per_pet("before", LegacyPet)
+    after = bytes_per_pet("after", Pet.from_dict)
+    print(f"saved    {before - after:8.0f} bytes/pet ({before / after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
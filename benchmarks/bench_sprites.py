@@ -0,0 +1,54 @@
+# bench_sprites.py
+"""
+Microbenchmark: Pet.get_ascii_frame via the precompiled sprite table vs.
+the old chained dict lookups.
+
+Run from the repository root:
+
+    python benchmarks/bench_sprites.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "console_tamagotchi"))
+
+from pet import ASCII_SPRITES, Pet  # noqa: E402
+
+CALLS = 200_000
+
+
+def legacy_get_ascii_frame(pet: Pet, frame_index: int = 0) -> str:
+    species_sprites = ASCII_SPRITES.get(pet.species, ASCII_SPRITES["cat"])
+    stage_key = getattr(pet, "_stage", "baby")
+    stage_sprites = (
+        species_sprites.get(stage_key)
+        or species_sprites.get("baby")
+        or next(iter(species_sprites.values()))
+    )
+    mode = pet._visual_mode()
+    frames = stage_sprites.get(mode) or stage_sprites["idle"]
+    return frames[frame_index % len(frames)]
+
+
+def bench(label: str, fn, pet: Pet) -> float:
+    start = time.perf_counter_ns()
+    for i in range(CALLS):
+        fn(pet, i)
+    ns_per_call = (time.perf_counter_ns() - start) / CALLS
+    print(f"{label:<10} {ns_per_call:8.1f} ns/call")
+    return ns_per_call
+
+
+def main() -> None:
+    pet = Pet("bench", species="dog")
+    pet.sleep()  # an animated (two-frame) mode
+
+    legacy = bench("dict", legacy_get_ascii_frame, pet)
+    table = bench("table", Pet.get_ascii_frame, pet)
+    print(f"speedup    {legacy / table:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
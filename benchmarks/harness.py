@@ -0,0 +1,151 @@
+# harness.py
+"""
+Minimal benchmark harness (standard library only).
+
+A benchmark is a setup function registered with `@benchmark`. Setup builds
+whatever state it needs and returns `run(n)`, which performs `n`
+operations. The harness calibrates `n` so one sample takes at least
+`min_time` seconds, takes `repeat` samples with `time.perf_counter_ns`,
+and measures peak allocations of setup plus one sample with `tracemalloc`
+(in a separate pass, so tracing never skews the timings).
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List
+
+Runner = Callable[[int], None]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[[], Runner]
+    items: int = 1          # e.g. pets processed per operation
+    quick: bool = True      # included in --quick runs
+
+
+@dataclass
+class Result:
+    name: str
+    ns_per_op: float        # median over samples
+    min_ns_per_op: float
+    ops_per_sample: int
+    samples: int
+    items: int
+    peak_kib: float
+
+    @property
+    def ns_per_item(self) -> float:
+        return self.ns_per_op / self.items
+
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, items: int = 1, quick: bool = True):
+    """Register a setup function under `name`."""
+
+    def register(setup: Callable[[], Runner]) -> Callable[[], Runner]:
+        REGISTRY[name] = Benchmark(name, setup, items, quick)
+        return setup
+
+    return register
+
+
+def _time_once(run: Runner, n: int) -> int:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        run(n)
+        return time.perf_counter_ns() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(bench: Benchmark, repeat: int = 5, min_time: float = 0.1) -> Result:
+    run = bench.setup()
+
+    # Calibrate: grow n until one sample is long enough to time reliably.
+    n = 1
+    while True:
+        elapsed = _time_once(run, n)
+        if elapsed >= min_time * 1e9 or n >= 1 << 30:
+            break
+        n *= 2 if elapsed == 0 else max(2, min(10, int(min_time * 1e9 / elapsed) + 1))
+
+    samples = [_time_once(run, n) / n for _ in range(repeat)]
+
+    tracemalloc.start()
+    try:
+        bench.setup()(1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(
+        name=bench.name,
+        ns_per_op=statistics.median(samples),
+        min_ns_per_op=min(samples),
+        ops_per_sample=n,
+        samples=repeat,
+        items=bench.items,
+        peak_kib=peak / 1024,
+    )
+
+
+# ------------- Result files -------------
+
+def to_json(results: List[Result]) -> dict:
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {r.name: asdict(r) for r in results},
+    }
+
+
+def save(results: List[Result], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_json(results), f, indent=2)
+        f.write("\n")
+
+
+def load(path: str) -> Dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results: List[Result], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Names of benchmarks slower than `baseline` by more than `tolerance`.
+
+    Uses the fastest sample, which is the least sensitive to noise from
+    other processes.
+    """
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base and r.min_ns_per_op > base["min_ns_per_op"] * (1 + tolerance):
+            regressions.append(r.name)
+    return regressions
+
+
+def format_table(results: List[Result], baseline: Dict[str, dict] | None = None) -> str:
+    lines = [f"{'benchmark':<28} {'ns/op':>12} {'ns/item':>10} {'peak KiB':>10}" + ("  vs base" if baseline else "")]
+    for r in results:
+        line = f"{r.name:<28} {r.ns_per_op:12.1f} {r.ns_per_item:10.1f} {r.peak_kib:10.1f}"
+        if baseline and r.name in baseline:
+            line += f"  {r.min_ns_per_op / baseline[r.name]['min_ns_per_op']:6.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,254 @@
+# run.py
+"""
+Benchmark suite for the pet model, rendering and serialization.
+
+Run from the repository root:
+
+    python benchmarks/run.py                          # writes benchmarks/latest.json
+    python benchmarks/run.py -o base.json             # store a baseline
+    python benchmarks/run.py --compare base.json      # exit 1 on regressions
+    python benchmarks/run.py --quick -k tick          # subset, shorter samples
+
+Stat deltas are zeroed in the "steady" configs so a pet stays in the
+measured regime for any number of ticks; the code path is the same as
+with the default tuning.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src", "console_tamagotchi"))
+
+import harness  # noqa: E402
+from actions import FEED, PLAY, SLEEP, WAKE, apply_actions  # noqa: E402
+from harness import benchmark  # noqa: E402
+from history import StatHistory  # noqa: E402
+from pet import Pet, PetConfig  # noqa: E402
+from interned import InternedPopulation  # noqa: E402
+from population import PetPopulation  # noqa: E402
+from ui import TerminalRenderer, compose, pet_panel  # noqa: E402
+
+STEADY = PetConfig(
+    hunger_per_tick=0,
+    energy_per_tick=0,
+    happiness_per_tick=0,
+    sleep_energy_gain_per_tick=0,
+    sleep_hunger_increase_per_tick=0,
+    sleep_happiness_change_per_tick=0,
+    feed_amount=0,
+    play_happiness_gain=0,
+    play_energy_cost=0,
+    play_cooldown_ticks=0,
+)
+
+
+def _steady_pet(**stats) -> Pet:
+    return Pet("bench", species="dog", config=STEADY, **stats)
+
+
+# ------------- Pet.tick -------------
+
+def _ticker(pet: Pet):
+    tick = pet.tick
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            tick()
+
+    return run
+
+
+@benchmark("tick.awake")
+def tick_awake():
+    return _ticker(_steady_pet(hunger=50, happiness=50, energy=50))
+
+
+@benchmark("tick.sleeping")
+def tick_sleeping():
+    pet = _steady_pet(hunger=50, happiness=50, energy=50)
+    pet.sleep()
+    return _ticker(pet)
+
+
+@benchmark("tick.dead")
+def tick_dead():
+    return _ticker(_steady_pet(hunger=100))
+
+
+# ------------- Actions -------------
+
+def _action(method_name: str, **stats):
+    method = getattr(_steady_pet(hunger=50, happiness=50, energy=50, **stats), method_name)
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            method()
+
+    return run
+
+
+@benchmark("action.feed")
+def action_feed():
+    return _action("feed")
+
+
+@benchmark("action.play")
+def action_play():
+    return _action("play")
+
+
+@benchmark("action.sleep+wake")
+def action_sleep_wake():
+    pet = _steady_pet(hunger=50, happiness=50, energy=50)
+    sleep, wake = pet.sleep, pet.wake
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            sleep()
+            wake()
+
+    return run
+
+
+# ------------- History -------------
+
+@benchmark("history.record")
+def history_record():
+    history = StatHistory()
+    record = history.record
+
+    def run(n: int) -> None:
+        for i in range(n):
+            record(i & 63, 50, 100 - (i & 63))
+
+    return run
+
+
+# ------------- Rendering -------------
+
+@benchmark("render.ascii_frame")
+def render_ascii_frame():
+    pet = _steady_pet()
+    pet.sleep()  # an animated (two-frame) mode
+    frame = pet.get_ascii_frame
+
+    def run(n: int) -> None:
+        for i in range(n):
+            frame(i)
+
+    return run
+
+
+@benchmark("render.terminal_4_pets")
+def render_terminal():
+    pets = [_steady_pet() for _ in range(4)]
+    for pet in pets[::2]:
+        pet.sleep()
+    renderer = TerminalRenderer(io.StringIO(), 120, 30)
+
+    def run(n: int) -> None:
+        for i in range(n):
+            renderer.render(compose([pet_panel(p, i) for p in pets], 4))
+
+    return run
+
+
+# ------------- Serialization -------------
+
+@benchmark("serialize.dict_roundtrip")
+def serialize_roundtrip():
+    pet = Pet("bench", species="dog")
+    pet.feed()
+    to_dict, from_dict = pet.to_dict, Pet.from_dict
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            from_dict(to_dict())
+
+    return run
+
+
+# ------------- Population scaling -------------
+
+def _population(size: int):
+    population = PetPopulation.from_pets(
+        [Pet(f"p{i}", hunger=i % 60, happiness=50 + i % 50, energy=40 + i % 60) for i in range(size)]
+    )
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            population.tick()
+
+    return run
+
+
+for _size, _quick in ((1, True), (1_000, True), (100_000, False)):
+    benchmark(f"population.tick[{_size}]", items=_size, quick=_quick)(
+        lambda size=_size: _population(size)
+    )
+
+
+@benchmark("population.interned_tick[100000]", items=100_000)
+def _interned_population():
+    # Fresh pets of a few species: a handful of distinct states in total.
+    population = InternedPopulation.from_pets(
+        Pet(f"p{i}", species=("cat", "dog", "dragon")[i % 3]) for i in range(100_000)
+    )
+    return population.tick
+
+
+@benchmark("population.apply_actions[10000]", items=10_000)
+def _population_actions():
+    # Every action kind, each pet hit by several actions in the batch.
+    population = PetPopulation.from_pets(
+        [Pet(f"p{i}", hunger=50, happiness=50, energy=50) for i in range(2_500)], STEADY
+    )
+    pets = [i // 4 for i in range(10_000)]
+    batch = [(FEED, PLAY, SLEEP, WAKE)[i % 4] for i in range(10_000)]
+
+    def run(n: int) -> None:
+        for _ in range(n):
+            apply_actions(population, pets, batch)
+
+    return run
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("-o", "--output", default=os.path.join(HERE, "latest.json"),
+                        help="where to write the JSON results")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="JSON results to compare against; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed slowdown before flagging a regression (default 0.10)")
+    parser.add_argument("-k", dest="filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="shorter samples, skip the largest sizes")
+    args = parser.parse_args(argv)
+
+    min_time = 0.02 if args.quick else 0.1
+    results = []
+    for name, bench in harness.REGISTRY.items():
+        if args.filter not in name or (args.quick and not bench.quick):
+            continue
+        results.append(harness.measure(bench, args.repeat, min_time))
+
+    baseline = harness.load(args.compare) if args.compare else None
+    print(harness.format_table(results, baseline))
+    harness.save(results, args.output)
+
+    if baseline is not None:
+        regressions = harness.compare(results, baseline, args.tolerance)
+        for name in regressions:
+            print(f"REGRESSION: {name}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
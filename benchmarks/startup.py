@@ -0,0 +1,123 @@
+# startup.py
+"""
+Startup benchmark for the headless `python -m console_tamagotchi` commands.
+
+Runs each command under `python -X importtime`, adds up the import time
+of everything it loads beyond a bare interpreter, and checks it against
+the budget below. The budget is a multiple of the bare interpreter's own
+import time measured in the same run, so a slower machine slows both
+sides and the check does not depend on where it runs. The headless
+commands must also never import the GUI, the sprite data or the
+process/async machinery they do not use.
+
+Run from the repository root:
+
+    python benchmarks/startup.py              # exit 1 if over budget
+    python benchmarks/startup.py --repeat 10  # best of 10 runs per command
+
+Bytecode is written on a warm-up run first, so the numbers are for a
+normal (cached) start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+
+# Command line per headless command, with the smallest possible workload.
+COMMANDS: Dict[str, List[str]] = {
+    "simulate": ["simulate", "--horizon", "1"],
+    "bench": ["bench", "--pets", "1", "--ticks", "1"],
+}
+# Import time budget per command, as a multiple of the bare interpreter's
+# import time (best of --repeat runs each, interpreter start-up itself
+# excluded from the command). Measured at 5.6-8.0x for simulate and
+# 5.2-7.0x for bench on a busy single-core box, where the ~10 ms bare
+# figure is noisy; raise it only together with a reason in the commit
+# message.
+BUDGET: Dict[str, float] = {
+    "simulate": 10.0,
+    "bench": 9.0,
+}
+FORBIDDEN: Tuple[str, ...] = ("tkinter", "main", "sprites", "multiprocessing", "asyncio")
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPATH"] = SRC
+    return env
+
+
+def importtime(args: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Run `python -X importtime <args>` and parse what it imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=SRC, env=_env(), capture_output=True, text=True, check=True,
+    )
+    return parse(proc.stderr)
+
+
+def parse(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Every imported module -> (cumulative us, nesting depth)."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(cumulative), depth)
+    return modules
+
+
+def measure_baseline(repeat: int) -> Tuple[int, Set[str]]:
+    """Best import time of a bare interpreter, and what it imported."""
+    best = None
+    for _ in range(repeat):
+        modules = importtime(["-c", "pass"])
+        total = sum(us for us, depth in modules.values() if depth == 0)
+        best = total if best is None else min(best, total)
+    return best, set(modules)
+
+
+def measure(command: str, baseline: Set[str], repeat: int) -> Tuple[int, Set[str]]:
+    """Best import time of `command` beyond `baseline`, and what it imported."""
+    args = ["-m", "console_tamagotchi", *COMMANDS[command]]
+    importtime(args)    # warm-up: write bytecode
+    best = None
+    for _ in range(repeat):
+        modules = importtime(args)
+        total = sum(us for name, (us, depth) in modules.items() if depth == 0 and name not in baseline)
+        best = total if best is None else min(best, total)
+    return best, set(modules)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    bare_us, baseline = measure_baseline(args.repeat)
+    failed = False
+    print(f"bare interpreter imports: {bare_us / 1000:.1f} ms")
+    print(f"{'command':<12}{'imports (ms)':>14}{'x bare':>10}{'budget':>10}")
+    for command in COMMANDS:
+        total, modules = measure(command, baseline, args.repeat)
+        ratio = total / bare_us
+        over = ratio > BUDGET[command]
+        print(f"{command:<12}{total / 1000:>14.1f}{ratio:>10.2f}{BUDGET[command]:>10.1f}{'  OVER' if over else ''}")
+        loaded = sorted(name for name in modules if name.split(".")[0] in FORBIDDEN)
+        if loaded:
+            print(f"  {command} imported {', '.join(loaded)}")
+        failed |= over or bool(loaded)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+# __main__.py
+"""
+Command-line entry point: `python -m console_tamagotchi <command>`.
+
+    simulate   run one pet under a caretaker policy (see sweep.py)
+    serve      host pets over a socket (see server.py)
+    bench      measure headless tick throughput
+    gui        start the Tk window (main.py)
+
+Only the modules a command needs are imported, and only once it runs:
+the headless commands never load tkinter or the sprite data. See
+benchmarks/startup.py for the import-time budget this is held to.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import List
+
+# The game modules import each other as siblings (see main.py).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _simulate(args: argparse.Namespace) -> None:
+    import json
+
+    import dataclasses
+
+    from config import get_config, validate
+    from policies import POLICIES
+    from sweep import simulate
+
+    if args.policy not in POLICIES:
+        sys.exit(f"unknown policy {args.policy!r} (choose from {', '.join(POLICIES)})")
+    overrides = {}
+    for spec in args.set:
+        name, _, value = spec.partition("=")
+        overrides[name] = int(value)
+    try:
+        config = validate(dataclasses.replace(get_config(args.config), **overrides))
+    except (TypeError, ValueError) as exc:
+        sys.exit(str(exc))
+    result = simulate(config, POLICIES[args.policy], args.horizon)
+    print(json.dumps(result, indent=2))
+
+
+def _bench(args: argparse.Namespace) -> None:
+    import time
+
+    from pet import Pet
+    from population import PetPopulation
+
+    population = PetPopulation.from_pets(
+        Pet(f"p{i}", hunger=i % 60, happiness=50 + i % 50, energy=40 + i % 60) for i in range(args.pets)
+    )
+    start = time.perf_counter_ns()
+    for _ in range(args.ticks):
+        population.tick()
+    elapsed = time.perf_counter_ns() - start
+    per_tick = elapsed / max(1, args.pets * args.ticks)
+    print(f"{args.pets} pets x {args.ticks} ticks: {elapsed / 1e6:.1f} ms ({per_tick:.1f} ns per pet-tick)")
+
+
+def _serve(args: argparse.Namespace) -> None:
+    import server
+
+    server.main(args.rest)
+
+
+def _gui(args: argparse.Namespace) -> None:
+    import main
+
+    main.main(args.rest)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m console_tamagotchi", description="Console Tamagotchi.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate = commands.add_parser("simulate", help="run one pet under a caretaker policy")
+    simulate.add_argument("--policy", default="attentive", help="a policy name from policies.py")
+    simulate.add_argument("--horizon", type=int, default=7 * 24 * 3600, help="ticks to simulate at most")
+    simulate.add_argument("--config", default="default", help="a named config from configs/")
+    simulate.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE",
+                          help="override a PetConfig field")
+    simulate.set_defaults(run=_simulate)
+
+    bench = commands.add_parser("bench", help="measure headless tick throughput")
+    bench.add_argument("--pets", type=int, default=10_000)
+    bench.add_argument("--ticks", type=int, default=100)
+    bench.set_defaults(run=_bench)
+
+    for name, run, help_text in (
+        ("serve", _serve, "host pets over a socket (arguments go to server.py)"),
+        ("gui", _gui, "start the Tk window (arguments go to main.py)"),
+    ):
+        command = commands.add_parser(name, help=help_text, add_help=False)
+        command.set_defaults(run=run, passthrough=True)
+
+    # serve and gui hand everything after their name (--help included)
+    # to the parser of the module they run.
+    args, rest = parser.parse_known_args(argv)
+    if rest and not getattr(args, "passthrough", False):
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    args.rest = rest
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
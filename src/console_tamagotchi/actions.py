@@ -1,6 +1,121 @@
 # actions.py
-# Placeholder for actions such as feed, play, and rest.
-# These functions will later modify the pet's state.
+"""
+Player actions (feed, play, sleep, wake) as small integer codes.
 
-# TODO: implement action logic later
-pass
+Codes make actions cheap to store in journals and logs and to send over
+the wire; `apply_action` maps a code back onto the Pet method.
+`apply_actions` runs a whole batch of them against a PetPopulation in
+one pass over its columns.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from config import derived
+from pet import Pet
+from population import evolve_row
+from state_machine import DEAD, classify
+
+FEED, PLAY, SLEEP, WAKE = range(4)
+ACTION_NAMES: tuple[str, ...] = ("feed", "play", "sleep", "wake")
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+
+_ACTION_METHODS = (Pet.feed, Pet.play, Pet.sleep, Pet.wake)
+
+
+def apply_action(pet: Pet, action: int) -> bool:
+    """Run action `action` on `pet`; returns what the Pet method returned."""
+    if not 0 <= action < len(_ACTION_METHODS):
+        raise ValueError(f"unknown action code {action}")
+    return _ACTION_METHODS[action](pet)
+
+
+def apply_actions(population, pets: Sequence[int], actions: Sequence[int]) -> bytearray:
+    """
+    Apply `actions[k]` to pet `pets[k]` of a PetPopulation, for every k.
+
+    Actions run strictly in the order given, exactly as if the Pet methods
+    were called one after the other: a pet fed twice in one batch is fed
+    twice, and an action sees the effects of the earlier ones. Returns the
+    success mask, 1 where the Pet method would have returned True.
+    """
+    if len(pets) != len(actions):
+        raise ValueError("pets and actions must have the same length")
+    # Checked up front so that a bad code leaves the population untouched.
+    if actions and not (0 <= min(actions) and max(actions) < len(ACTION_NAMES)):
+        bad = next(a for a in actions if not 0 <= a < len(ACTION_NAMES))
+        raise ValueError(f"unknown action code {bad}")
+    cfg = population.config
+    hunger = population.hunger
+    happiness = population.happiness
+    energy = population.energy
+    food = population.total_food_eaten
+    food_goal = population.food_goal
+    state = population.state
+    sleeping = population.is_sleeping
+    cooldown = population.play_cooldown
+    vaction = population.visual_action
+    vticks = population.visual_action_ticks
+
+    d = derived(cfg)
+    lo, hi, size, table = d.min_stat, d.max_stat, d.size, d.state_table
+    feed_amount = cfg.feed_amount
+    play_gain = cfg.play_happiness_gain
+    play_cost = cfg.play_energy_cost
+    play_cooldown = cfg.play_cooldown_ticks
+    visual_ticks = cfg.action_visual_ticks
+    eat, play = 1, 2        # population.VISUAL_ACTIONS codes
+
+    mask = bytearray(len(actions))
+    for k, (i, action) in enumerate(zip(pets, actions)):
+        if state[i] == DEAD:
+            continue
+        s = sleeping[i]
+
+        if action == FEED or action == PLAY:
+            if s:
+                continue
+            h, e, p = hunger[i], energy[i], happiness[i]
+            if action == FEED:
+                if h <= 0:
+                    continue
+                before = h
+                h -= feed_amount
+            else:
+                if e <= play_cost or cooldown[i] > 0:
+                    continue
+                p += play_gain
+                e -= play_cost
+                cooldown[i] = play_cooldown
+            h = lo if h < lo else hi if h > hi else h
+            e = lo if e < lo else hi if e > hi else e
+            p = lo if p < lo else hi if p > hi else p
+            hunger[i], energy[i], happiness[i] = h, e, p
+            if action == FEED:
+                if before > h:
+                    food[i] += before - h
+                if food[i] >= food_goal[i]:
+                    evolve_row(population, cfg, i)
+            code = table[((h - lo) * size + (e - lo)) * size + (p - lo)]
+            state[i] = code
+            vaction[i] = eat if action == FEED else play
+            vticks[i] = visual_ticks
+        elif action == SLEEP:
+            if s:
+                continue
+            sleeping[i] = 1
+            vaction[i] = 0
+            vticks[i] = 0
+        else:   # WAKE
+            if not s:
+                continue
+            sleeping[i] = 0
+            h, e, p = hunger[i], energy[i], happiness[i]
+            if lo <= h <= hi and lo <= e <= hi and lo <= p <= hi:
+                code = table[((h - lo) * size + (e - lo)) * size + (p - lo)]
+            else:
+                code = classify(h, e, p, cfg)
+            state[i] = code
+        mask[k] = 1
+    return mask
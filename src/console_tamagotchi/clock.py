@@ -0,0 +1,88 @@
+# clock.py
+"""
+Fixed-timestep simulation clock.
+
+Tick k is due at exactly `origin + k * interval` on the monotonic clock.
+Callers ask how many ticks are due and apply them, so the tick rate never
+depends on how long the work or the event loop's timers took, and time
+lost to a stalled loop is made up later instead of dropped.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Dict
+
+
+class FixedStepClock:
+    """
+    Hands out simulation ticks as wall time passes.
+
+    `take()` returns at most `max_catch_up` ticks per call; the rest stays
+    due and is handed out by later calls, so a long stall is caught up over
+    several frames instead of in one long one.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_catch_up: int | None = None,
+        now: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = interval
+        self.max_catch_up = max_catch_up
+        self._now = now
+        self.origin = now()
+        self.ticks = 0             # ticks handed out so far
+
+        # Accuracy counters (see stats()).
+        self.updates = 0
+        self.capped_updates = 0
+        self.max_backlog = 0
+
+    def due(self) -> int:
+        """Ticks that are due now but not yet handed out."""
+        # The epsilon makes waking up at exactly time_of(k) count tick k as
+        # due, even when (k * interval) / interval rounds to just below k.
+        elapsed_ticks = int((self._now() - self.origin) / self.interval + 1e-9)
+        return max(0, elapsed_ticks - self.ticks)
+
+    def take(self) -> int:
+        """Hand out the ticks due now (up to `max_catch_up`)."""
+        due = self.due()
+        if due <= 0:
+            return 0
+        self.updates += 1
+        if due > self.max_backlog:
+            self.max_backlog = due
+        if self.max_catch_up is not None and due > self.max_catch_up:
+            due = self.max_catch_up
+            self.capped_updates += 1
+        self.ticks += due
+        return due
+
+    def time_of(self, ticks_ahead: int) -> float:
+        """When tick `ticks + ticks_ahead` is due (in `now()` time)."""
+        return self.origin + (self.ticks + ticks_ahead) * self.interval
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Long-run accuracy: handed-out ticks against elapsed wall time.
+
+        `lag_ticks` is how far the simulation is behind real time right
+        now (less than 1 when fully caught up); it stays bounded no matter
+        how long the clock runs.
+        """
+        elapsed = self._now() - self.origin
+        expected = elapsed / self.interval
+        return {
+            "elapsed_s": elapsed,
+            "ticks": self.ticks,
+            "expected_ticks": expected,
+            "lag_ticks": expected - self.ticks,
+            "max_backlog": self.max_backlog,
+            "updates": self.updates,
+            "capped_updates": self.capped_updates,
+        }
@@ -1,6 +1,286 @@
 # config.py
-# Placeholder for configuration constants and tuning parameters.
-# Example: max hunger, tick speed, or evolution thresholds.
+"""
+Pet tuning: the PetConfig dataclass and a registry of named configs.
 
-# TODO: add configurable values later
-pass
+A PetConfig is frozen and interned: `intern_config()` returns one shared
+instance per distinct configuration, and `derived()` the values the tick
+code computes from it (per-tick deltas, the state table, a content
+hash), built once per configuration instead of once per pet or per tick.
+
+Named configs are JSON files in `configs/` holding the fields that
+differ from the defaults, e.g. `configs/easy.json`:
+
+    {"hunger_per_tick": 1, "feed_amount": 30}
+
+They are validated and loaded once, the first time `get_config()` is
+called; "default" is always available.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from evolution import STAGES, Evolution
+from state_machine import state_table
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "configs")
+
+# Fields that must not go below zero.
+_NON_NEGATIVE = (
+    "feed_amount",
+    "play_happiness_gain",
+    "play_energy_cost",
+    "play_cooldown_ticks",
+    "action_visual_ticks",
+    "food_to_adult",
+    "age_to_senior",
+    "happy_ticks_to_senior",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PetConfig:
+    max_stat: int = 100
+    min_stat: int = 0
+
+    # Per-tick changes (when awake)
+    hunger_per_tick: int = 2
+    energy_per_tick: int = -1
+    happiness_per_tick: int = -1
+
+    # Per-tick changes (when sleeping)
+    sleep_energy_gain_per_tick: int = 5
+    sleep_hunger_increase_per_tick: int = 1
+    sleep_happiness_change_per_tick: int = 0
+
+    # Action effects
+    feed_amount: int = 25
+    play_happiness_gain: int = 20
+    play_energy_cost: int = 10
+
+    # Cooldown
+    play_cooldown_ticks: int = 2
+
+    # State thresholds
+    hungry_threshold: int = 70
+    tired_threshold: int = 30
+    bored_threshold: int = 30
+
+    # Death conditions
+    death_hunger: int = 100
+    death_energy: int = 0
+    death_happiness: int = 0
+
+    # Sleep control
+    auto_sleep_energy_threshold: int = 15
+    auto_wake_energy_threshold: int = 80
+
+    # Visual action duration (ticks)
+    action_visual_ticks: int = 3
+
+    # ---------- Evolution settings ----------
+    # The default stage chain (see evolution.py); ages are in ticks.
+    food_to_adult: int = 100
+    age_to_senior: int = 3 * 24 * 3600
+    happy_ticks_to_senior: int = 24 * 3600
+    # Species with a chain of their own: (species, steps) pairs, e.g.
+    #     chains={"dragon": [Evolution("adult", food=300), Evolution("senior", age=86_400)]}
+    # A dict, or lists of pairs and step dicts (as read back from JSON), are
+    # accepted and normalized. Other species follow evolution.default_chain().
+    chains: Tuple[Tuple[str, Tuple[Evolution, ...]], ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.chains != ():
+            object.__setattr__(self, "chains", _normalize_chains(self.chains))
+
+
+def _normalize_chains(chains) -> Tuple[Tuple[str, Tuple[Evolution, ...]], ...]:
+    """`chains` as a tuple of (species, steps) sorted by species; ValueError if malformed."""
+    pairs = chains.items() if isinstance(chains, dict) else chains
+    result = {}
+    for pair in pairs:
+        try:
+            species, steps = pair
+            steps = list(steps)
+        except (TypeError, ValueError):
+            raise ValueError(f"chains: expected (species, steps) pairs, got {pair!r}") from None
+        if not isinstance(species, str):
+            raise ValueError(f"chain species must be a str, got {species!r}")
+        chain = []
+        for step in steps:
+            if isinstance(step, dict):
+                try:
+                    step = Evolution(**step)
+                except TypeError:
+                    raise ValueError(f"{species} chain: bad step {step!r}") from None
+            if not isinstance(step, Evolution):
+                raise ValueError(f"{species} chain: expected Evolution steps, got {step!r}")
+            # Stage codes and sprites only exist for STAGES, so other names
+            # are rejected here rather than when a pet reaches them.
+            if step.stage not in STAGES:
+                raise ValueError(
+                    f"{species} chain: unknown stage {step.stage!r} (choose from {', '.join(STAGES)})"
+                )
+            for name in ("food", "age", "happy"):
+                value = getattr(step, name)
+                if type(value) is not int or value < 0:
+                    raise ValueError(f"{species} chain: {name} must be a non-negative int, got {value!r}")
+            chain.append(step)
+        result[species] = tuple(chain)
+    return tuple(sorted(result.items()))
+
+
+CONFIG_FIELDS: Tuple[str, ...] = tuple(field.name for field in dataclasses.fields(PetConfig))
+# Every field but `chains` is a plain int.
+INT_FIELDS: Tuple[str, ...] = tuple(name for name in CONFIG_FIELDS if name != "chains")
+
+
+class Derived:
+    """
+    Everything the per-tick code derives from a config, computed once.
+
+    `awake_deltas` / `sleep_deltas` are the (hunger, energy, happiness)
+    changes of one tick; `digest` is a content hash of the config that is
+    stable across processes and runs (for cache keys and file headers).
+    """
+
+    __slots__ = ("config", "awake_deltas", "sleep_deltas", "min_stat", "max_stat", "size", "state_table", "_digest")
+
+    def __init__(self, config: PetConfig) -> None:
+        self.config = config
+        self.awake_deltas = (config.hunger_per_tick, config.energy_per_tick, config.happiness_per_tick)
+        self.sleep_deltas = (
+            config.sleep_hunger_increase_per_tick,
+            config.sleep_energy_gain_per_tick,
+            config.sleep_happiness_change_per_tick,
+        )
+        self.min_stat = config.min_stat
+        self.max_stat = config.max_stat
+        self.size = config.max_stat - config.min_stat + 1
+        self.state_table = state_table(config)
+        self._digest: str | None = None
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            # Imported here: only caches and file formats need the hash.
+            import hashlib
+            import json
+
+            fields = dataclasses.asdict(self.config)
+            if not fields["chains"]:
+                # Keeps the digests of configs without chains unchanged.
+                del fields["chains"]
+            blob = json.dumps(fields, sort_keys=True)
+            self._digest = hashlib.sha256(blob.encode()).hexdigest()[:20]
+        return self._digest
+
+
+# One instance per distinct configuration, shared by every pet that uses it
+# (PetConfig is frozen, so sharing is safe), with its Derived values.
+# Derived values (and so the state table) are built on first use, not at
+# import: commands that never tick a pet should not pay for them.
+#
+# Sweeps go through many configs, each Derived holding a state table, so
+# only the MAX_CONFIGS most recently used ones are kept (the default config
+# always is). Pets keep their own reference, so an evicted config stays
+# valid for them; equal configs created later get a fresh shared instance.
+MAX_CONFIGS = 32
+DEFAULT_CONFIG = PetConfig()
+_CONFIGS: Dict[PetConfig, Derived] = {}
+_DEFAULT_DERIVED: Derived | None = None
+
+
+def intern_config(config: PetConfig | None) -> PetConfig:
+    """The shared instance equal to `config` (DEFAULT_CONFIG for None)."""
+    return derived(config).config
+
+
+def derived(config: PetConfig | None) -> Derived:
+    """The Derived values of `config` (of DEFAULT_CONFIG for None)."""
+    global _DEFAULT_DERIVED
+    if config is None or config is DEFAULT_CONFIG:
+        if _DEFAULT_DERIVED is None:
+            _DEFAULT_DERIVED = Derived(DEFAULT_CONFIG)
+        return _DEFAULT_DERIVED
+    entry = _CONFIGS.pop(config, None)
+    if entry is None:
+        if config == DEFAULT_CONFIG:
+            return derived(None)
+        entry = Derived(config)
+        if len(_CONFIGS) >= MAX_CONFIGS:
+            # Least recently used first: every hit is moved to the end.
+            del _CONFIGS[next(iter(_CONFIGS))]
+    _CONFIGS[config] = entry
+    return entry
+
+
+def config_digest(config: PetConfig) -> str:
+    """Content hash of `config` (same for equal configs, in any process)."""
+    return derived(config).digest
+
+
+
+# ------------- Registry -------------
+
+def validate(config: PetConfig) -> PetConfig:
+    """Return `config` if its values make sense, else raise ValueError."""
+    for name in INT_FIELDS:
+        value = getattr(config, name)
+        if type(value) is not int:
+            raise ValueError(f"{name} must be an int, got {value!r}")
+    if config.min_stat >= config.max_stat:
+        raise ValueError("min_stat must be below max_stat")
+    for name in _NON_NEGATIVE:
+        if getattr(config, name) < 0:
+            raise ValueError(f"{name} must not be negative")
+    if config.auto_sleep_energy_threshold >= config.auto_wake_energy_threshold:
+        raise ValueError("auto_sleep_energy_threshold must be below auto_wake_energy_threshold")
+    return config
+
+
+def load_config_file(path: str) -> PetConfig:
+    """Read, validate and intern the config overrides in JSON file `path`."""
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        overrides = json.load(f)
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path}: expected a JSON object of PetConfig fields")
+    unknown = sorted(set(overrides) - set(CONFIG_FIELDS))
+    if unknown:
+        raise ValueError(f"{path}: unknown PetConfig fields {', '.join(unknown)}")
+    try:
+        return intern_config(validate(PetConfig(**overrides)))
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+
+
+def load_registry(directory: str = CONFIG_DIR) -> Dict[str, PetConfig]:
+    """Every `*.json` config in `directory` by file name, plus "default"."""
+    registry = {"default": DEFAULT_CONFIG}
+    if os.path.isdir(directory):
+        for entry in sorted(os.listdir(directory)):
+            name, ext = os.path.splitext(entry)
+            if ext == ".json":
+                registry[name] = load_config_file(os.path.join(directory, entry))
+    return registry
+
+
+_registry: Dict[str, PetConfig] | None = None
+
+
+def get_config(name: str) -> PetConfig:
+    """The named config from CONFIG_DIR (loaded on first use)."""
+    global _registry
+    if _registry is None:
+        _registry = load_registry()
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"unknown config {name!r} (choose from {', '.join(_registry)})") from None
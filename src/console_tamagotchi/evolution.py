@@ -1,6 +1,105 @@
 # evolution.py
-# Placeholder for pet evolution and growth logic.
-# Will handle evolution stages (baby → adult → senior) later.
+"""
+Pet evolution: stage chains and the goals that trigger them.
+
+Every species grows through a chain of stages, starting as a "baby".
+Each step of the chain names the next stage and what it takes to get
+there: enough food eaten, enough ticks of age and enough ticks spent
+happy (ending a tick with happiness above `bored_threshold`). All three
+counters only ever grow, so a step that has been reached stays reached.
+
+Pets do not re-check the chain every tick. `resolve()` walks as far
+along the chain as the counters allow and returns, for the step the pet
+is waiting on, the first requirement it has not met yet as a goal for
+that one counter (every other counter gets NEVER). Every time a counter
+changes, a single comparison against its goal tells whether anything can
+have happened; only then is the chain walked again. Column stores keep
+the goals in columns of their own (see population.tick_columns).
+
+Species-specific chains live in `PetConfig.chains`, so they are part of
+the config's digest (sweep caches, worker processes) like any other
+tuning value.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    from config import PetConfig
+
+# The only stage names: populations store a stage as its index here and
+# sprites exist per stage. PetConfig rejects chains naming anything else.
+STAGES: tuple[str, ...] = ("baby", "adult", "senior")
+
+# Goal of a counter nothing is waiting on; larger than any count.
+NEVER = 1 << 62
+
+
+@dataclass(frozen=True, slots=True)
+class Evolution:
+    """One step of a chain: become `stage` once every counter reaches its value."""
+
+    stage: str
+    food: int = 0
+    age: int = 0
+    happy: int = 0
+
+
+# Default chains of the most recently used configs (oldest dropped first),
+# bounded like config._CONFIGS: sweeps go through many configs.
+_DEFAULT_CHAINS: Dict["PetConfig", Tuple[Evolution, ...]] = {}
+_MAX_DEFAULT_CHAINS = 32
+
+
+def default_chain(config: "PetConfig") -> Tuple[Evolution, ...]:
+    """baby -> adult on food eaten, adult -> senior on age and happy ticks."""
+    steps = _DEFAULT_CHAINS.get(config)
+    if steps is None:
+        if len(_DEFAULT_CHAINS) >= _MAX_DEFAULT_CHAINS:
+            del _DEFAULT_CHAINS[next(iter(_DEFAULT_CHAINS))]
+        steps = _DEFAULT_CHAINS[config] = (
+            Evolution("adult", food=config.food_to_adult),
+            Evolution("senior", age=config.age_to_senior, happy=config.happy_ticks_to_senior),
+        )
+    return steps
+
+
+def chain(species: str, config: "PetConfig") -> Tuple[Evolution, ...]:
+    """The stages after "baby" that pets of `species` grow through."""
+    for name, steps in config.chains:
+        if name == species:
+            return steps
+    return default_chain(config)
+
+
+def resolve(
+    species: str, stage: str, food: int, age: int, happy: int, config: "PetConfig"
+) -> Tuple[str, int, int, int]:
+    """
+    Evolve as far as the counters allow, starting from `stage`.
+
+    Returns (stage, food_goal, age_goal, happy_goal). At most one goal is
+    not NEVER: the value of the first counter that falls short of the
+    next step. A stage that is not part of the species' chain is final.
+    """
+    steps = chain(species, config)
+    if stage == "baby":
+        i = 0
+    else:
+        i = next((k + 1 for k, step in enumerate(steps) if step.stage == stage), len(steps))
+    while i < len(steps):
+        step = steps[i]
+        if food < step.food:
+            return stage, step.food, NEVER, NEVER
+        if age < step.age:
+            return stage, NEVER, step.age, NEVER
+        if happy < step.happy:
+            return stage, NEVER, NEVER, step.happy
+        stage = step.stage
+        i += 1
+    return stage, NEVER, NEVER, NEVER
 
-# TODO: implement evolution system later
-pass
@@ -0,0 +1,236 @@
+# history.py
+"""
+Opt-in stat history for a pet, in fixed memory.
+
+A StatHistory keeps hunger, happiness and energy at several resolutions,
+each in a preallocated ring buffer: every tick for the last ten minutes,
+per minute for the last day and per hour for the last thirty days (with
+one tick per second, see main.TICK_INTERVAL_MS). Coarser levels store a
+min / max / sum bucket per stat. The bucket being filled is updated as
+ticks come in, and a full bucket is folded into the open bucket of the
+next level, so no level ever re-reads the raw ticks. A history is
+allocated once and never grows, however long the pet lives.
+
+Recording needs the stats of every tick, so `StatHistory.advance()`
+ticks the pet one tick at a time; pets without a history keep the fast
+`Pet.advance()`.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import List, Sequence, Tuple
+
+from config import PetConfig, derived
+from pet import Pet
+
+STATS: tuple[str, ...] = ("hunger", "happiness", "energy")
+
+# (name, ticks per bucket, buckets kept). The first level holds single
+# ticks; each bucket size must be a multiple of the one before.
+LEVELS: Tuple[Tuple[str, int, int], ...] = (
+    ("tick", 1, 10 * 60),
+    ("minute", 60, 24 * 60),
+    ("hour", 3600, 30 * 24),
+)
+
+
+def _typecode(lo: int, hi: int) -> str:
+    """The smallest signed array typecode holding every value in lo..hi."""
+    for code in ("h", "i", "q"):
+        bits = 8 * array(code).itemsize - 1
+        if -(1 << bits) <= lo and hi < 1 << bits:
+            return code
+    raise ValueError(f"history values {lo}..{hi} do not fit in 64 bits")
+
+
+class _Level:
+    """One ring of aggregate buckets plus the bucket being filled."""
+
+    __slots__ = ("name", "size", "capacity", "lo", "hi", "total", "pos", "filled",
+                 "open_lo", "open_hi", "open_total", "open_count")
+
+    def __init__(self, name: str, size: int, capacity: int, lo: int, hi: int) -> None:
+        self.name = name
+        self.size = size
+        self.capacity = capacity
+        # Columns are as narrow as the stat range lo..hi allows (int16 for
+        # the default 0..100); totals hold `size` of those values.
+        code = _typecode(lo, hi)
+        total_code = _typecode(min(0, lo * size), max(0, hi * size))
+        self.lo = [array(code, bytes(array(code).itemsize * capacity)) for _ in STATS]
+        self.hi = [array(code, bytes(array(code).itemsize * capacity)) for _ in STATS]
+        self.total = [array(total_code, bytes(array(total_code).itemsize * capacity)) for _ in STATS]
+        self.pos = 0            # next bucket to write
+        self.filled = 0         # closed buckets kept so far
+        self.open_lo = [0] * len(STATS)
+        self.open_hi = [0] * len(STATS)
+        self.open_total = [0] * len(STATS)
+        self.open_count = 0     # ticks in the open bucket
+
+    def nbytes(self) -> int:
+        return sum(column.itemsize * len(column) for column in (*self.lo, *self.hi, *self.total))
+
+
+class StatHistory:
+    """
+    Ring buffers of a pet's stats at the resolutions in `levels`.
+
+    `record()` adds one tick. `recent(stat)` returns the per-tick values
+    of the first level and `buckets(stat, level)` the (min, max, mean) of
+    each bucket of a coarser one, oldest first; the last bucket is the
+    one still being filled, if it has any ticks yet.
+
+    Values are stored in columns sized for the stat range of `config`
+    (the default config if None); pets with that config always fit.
+    """
+
+    def __init__(
+        self, levels: Sequence[Tuple[str, int, int]] = LEVELS, config: PetConfig | None = None
+    ) -> None:
+        (self._tick_name, tick_size, capacity), *coarse = levels
+        if tick_size != 1:
+            raise ValueError("the first history level must hold single ticks")
+        if any(kept < 1 for _, _, kept in levels):
+            raise ValueError("every history level must keep at least one bucket")
+        sizes = [tick_size] + [size for _, size, _ in coarse]
+        if any(size % before for before, size in zip(sizes, sizes[1:])):
+            raise ValueError("each history bucket size must be a multiple of the one before")
+
+        d = derived(config)
+        lo, hi = d.min_stat, d.max_stat
+        code = _typecode(lo, hi)
+        self.ticks = 0      # ticks recorded so far
+        self._capacity = capacity
+        self._values = [array(code, bytes(array(code).itemsize * capacity)) for _ in STATS]
+        self._levels = [_Level(name, size, kept, lo, hi) for name, size, kept in coarse]
+        self._by_name = {level.name: level for level in self._levels}
+
+    def nbytes(self) -> int:
+        """Bytes held by the ring buffers (fixed at construction)."""
+        return sum(column.itemsize * len(column) for column in self._values) + sum(
+            level.nbytes() for level in self._levels
+        )
+
+    # ------------- Recording -------------
+
+    def record(self, hunger: int, happiness: int, energy: int) -> None:
+        """Add one tick's stats."""
+        pos = self.ticks % self._capacity
+        h_values, p_values, e_values = self._values
+        h_values[pos] = hunger
+        p_values[pos] = happiness
+        e_values[pos] = energy
+        self.ticks += 1
+        if not self._levels:
+            return
+
+        # The same fold as _add() for a single tick, unrolled: this runs
+        # every tick, the rest once per bucket.
+        level = self._levels[0]
+        if level.open_count == 0:
+            level.open_lo = [hunger, happiness, energy]
+            level.open_hi = [hunger, happiness, energy]
+            level.open_total = [hunger, happiness, energy]
+        else:
+            lo, hi, total = level.open_lo, level.open_hi, level.open_total
+            if hunger < lo[0]:
+                lo[0] = hunger
+            elif hunger > hi[0]:
+                hi[0] = hunger
+            if happiness < lo[1]:
+                lo[1] = happiness
+            elif happiness > hi[1]:
+                hi[1] = happiness
+            if energy < lo[2]:
+                lo[2] = energy
+            elif energy > hi[2]:
+                hi[2] = energy
+            total[0] += hunger
+            total[1] += happiness
+            total[2] += energy
+        level.open_count += 1
+        if level.open_count == level.size:
+            self._close(0)
+
+    def record_pet(self, pet: Pet) -> None:
+        self.record(pet.hunger, pet.happiness, pet.energy)
+
+    def advance(self, pet: Pet, n_ticks: int = 1) -> None:
+        """Tick `pet` `n_ticks` times, recording each tick."""
+        tick, record = pet.tick, self.record
+        for _ in range(n_ticks):
+            tick()
+            record(pet.hunger, pet.happiness, pet.energy)
+
+    def _add(self, index: int, lo: Sequence[int], hi: Sequence[int], total: Sequence[int], count: int) -> None:
+        """Fold `count` ticks with these per-stat aggregates into level `index`."""
+        level = self._levels[index]
+        if level.open_count == 0:
+            level.open_lo = list(lo)
+            level.open_hi = list(hi)
+            level.open_total = list(total)
+        else:
+            open_lo, open_hi, open_total = level.open_lo, level.open_hi, level.open_total
+            for k in range(len(STATS)):
+                if lo[k] < open_lo[k]:
+                    open_lo[k] = lo[k]
+                if hi[k] > open_hi[k]:
+                    open_hi[k] = hi[k]
+                open_total[k] += total[k]
+        level.open_count += count
+        if level.open_count == level.size:
+            self._close(index)
+
+    def _close(self, index: int) -> None:
+        """Store the full open bucket of level `index` and pass it on."""
+        level = self._levels[index]
+        pos = level.pos
+        for k in range(len(STATS)):
+            level.lo[k][pos] = level.open_lo[k]
+            level.hi[k][pos] = level.open_hi[k]
+            level.total[k][pos] = level.open_total[k]
+        level.pos = (pos + 1) % level.capacity
+        level.filled = min(level.filled + 1, level.capacity)
+        level.open_count = 0
+        if index + 1 < len(self._levels):
+            self._add(index + 1, level.open_lo, level.open_hi, level.open_total, level.size)
+
+    # ------------- Reading -------------
+
+    def recent(self, stat: str) -> List[int]:
+        """The stat at each of the last ticks kept, oldest first."""
+        column = self._values[STATS.index(stat)]
+        if self.ticks <= self._capacity:
+            return column[:self.ticks].tolist()
+        pos = self.ticks % self._capacity
+        return column[pos:].tolist() + column[:pos].tolist()
+
+    def buckets(self, stat: str, level: str) -> List[Tuple[int, int, float]]:
+        """(min, max, mean) of the stat per bucket of `level`, oldest first."""
+        if level == self._tick_name:
+            return [(value, value, float(value)) for value in self.recent(stat)]
+        try:
+            ring = self._by_name[level]
+        except KeyError:
+            raise ValueError(f"unknown history level {level!r}") from None
+        k = STATS.index(stat)
+        lo, hi, total = ring.lo[k], ring.hi[k], ring.total[k]
+        start = (ring.pos - ring.filled) % ring.capacity
+        rows = [(start + i) % ring.capacity for i in range(ring.filled)]
+        result = [(lo[row], hi[row], total[row] / ring.size) for row in rows]
+        # Ticks not in a closed bucket yet sit in the open buckets of this
+        # level and of the finer ones (which have not passed them up).
+        open_levels = [
+            finer for finer in self._levels[:self._levels.index(ring) + 1] if finer.open_count
+        ]
+        if open_levels:
+            count = sum(finer.open_count for finer in open_levels)
+            result.append((
+                min(finer.open_lo[k] for finer in open_levels),
+                max(finer.open_hi[k] for finer in open_levels),
+                sum(finer.open_total[k] for finer in open_levels) / count,
+            ))
+        return result
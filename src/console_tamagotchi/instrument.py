@@ -0,0 +1,215 @@
+# instrument.py
+"""
+Opt-in latency instrumentation.
+
+`LatencyHistogram` is an HDR-style histogram: fixed memory, values kept to
+about 1.6% precision from 1 ns up to ~68 s. `Instrumentation` wraps
+functions in timing shims only while it is enabled and puts the originals
+back when disabled, so code that is not being measured runs untouched.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Tuple
+
+# Values below 2**_PRECISION_BITS are counted exactly; above that every
+# power-of-two range is split into 2**(_PRECISION_BITS - 1) equal buckets.
+_PRECISION_BITS = 7
+_LINEAR = 1 << _PRECISION_BITS
+_HALF = _LINEAR >> 1
+MAX_TRACKABLE_NS = (1 << 36) - 1
+_BUCKETS = _LINEAR + (MAX_TRACKABLE_NS.bit_length() - _PRECISION_BITS) * _HALF
+
+
+def _bucket_index(value: int) -> int:
+    if value < _LINEAR:
+        return value
+    shift = value.bit_length() - _PRECISION_BITS
+    return _LINEAR + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def _bucket_bounds(index: int) -> Tuple[int, int]:
+    """Smallest and largest value counted in bucket `index`."""
+    if index < _LINEAR:
+        return index, index
+    shift, offset = divmod(index - _LINEAR, _HALF)
+    shift += 1
+    low = (_HALF + offset) << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Counts of durations in nanoseconds."""
+
+    def __init__(self) -> None:
+        self.counts = array("q", bytes(8 * _BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        """Add one duration; negatives count as 0, huge values saturate."""
+        if ns < 0:
+            ns = 0
+        elif ns > MAX_TRACKABLE_NS:
+            ns = MAX_TRACKABLE_NS
+        self.counts[_bucket_index(ns)] += 1
+        if self.count == 0 or ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.count += 1
+        self.total += ns
+
+    def percentile(self, q: float) -> int:
+        """
+        The value at percentile `q` (0..100), as the top of its bucket.
+
+        Never below the true value, and at most one bucket width above it.
+        """
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_bucket_bounds(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "min_ns": self.min,
+            "mean_ns": round(self.mean),
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "p999_ns": self.percentile(99.9),
+            "max_ns": self.max,
+            # Non-empty buckets as [lowest value, count] so runs from
+            # different machines can be merged or re-analysed.
+            "buckets": [
+                [_bucket_bounds(i)[0], n] for i, n in enumerate(self.counts) if n
+            ],
+        }
+
+
+class Instrumentation:
+    """
+    Named histograms plus the timing shims that fill them.
+
+    `wrap()` only records what to patch; the shims are installed by
+    `enable()` and removed again by `disable()`.
+    """
+
+    def __init__(self) -> None:
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.enabled = False
+        self._targets: List[Tuple[Any, str, str, Callable | None]] = []
+        self._saved: List[Tuple[Any, str, Any, bool]] = []
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        return self.histograms[name]
+
+    def wrap(self, owner: Any, attr: str, name: str, due: Callable[[], float | None] | None = None) -> None:
+        """
+        Time calls to `owner.attr` into histogram `name` while enabled.
+
+        `owner` may be an instance or a class. If `due` is given it returns
+        the time.monotonic() at which the call was scheduled to run (or
+        None), and the delay past it goes into "`name`.late".
+        """
+        self.histogram(name)
+        if due is not None:
+            self.histogram(name + ".late")
+        self._targets.append((owner, attr, name, due))
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        for owner, attr, name, due in self._targets:
+            in_dict = attr in vars(owner)
+            original = vars(owner)[attr] if in_dict else getattr(owner, attr)
+            self._saved.append((owner, attr, original, in_dict))
+            # Class attributes are plain functions; wrap the raw function
+            # so the shim still binds `self`.
+            setattr(owner, attr, self._shim(original, self.histograms[name], due, name))
+        self.enabled = True
+
+    def disable(self) -> None:
+        for owner, attr, original, in_dict in reversed(self._saved):
+            if in_dict:
+                setattr(owner, attr, original)
+            else:
+                delattr(owner, attr)
+        self._saved.clear()
+        self.enabled = False
+
+    def _shim(self, fn: Callable, hist: LatencyHistogram, due, name: str) -> Callable:
+        record = hist.record
+        clock = time.perf_counter_ns
+        if due is None:
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    record(clock() - start)
+        else:
+            record_late = self.histograms[name + ".late"].record
+
+            def timed(*args, **kwargs):
+                scheduled = due()
+                if scheduled is not None:
+                    record_late(round((time.monotonic() - scheduled) * 1e9))
+                start = clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    record(clock() - start)
+        return timed
+
+    # ------------- Reporting -------------
+
+    def summary_lines(self) -> List[str]:
+        lines = [f"{'':<20}{'count':>8}{'p50':>10}{'p99':>10}{'max':>10}"]
+        for name, hist in self.histograms.items():
+            lines.append(
+                f"{name:<20}{hist.count:>8}{format_ns(hist.percentile(50)):>10}"
+                f"{format_ns(hist.percentile(99)):>10}{format_ns(hist.max):>10}"
+            )
+        return lines
+
+    def dump(self, path: str) -> None:
+        data = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+            f.write("\n")
+
+
+def format_ns(ns: int) -> str:
+    if ns < 10_000:
+        return f"{ns}ns"
+    if ns < 10_000_000:
+        return f"{ns / 1000:.0f}us"
+    return f"{ns / 1_000_000:.0f}ms"
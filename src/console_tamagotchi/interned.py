@@ -0,0 +1,241 @@
+# interned.py
+"""
+Hash-consed populations: identical pets are simulated once.
+
+Most pets of a large fleet share their exact simulation state, above all
+fresh ones created with the `Pet` defaults. An InternedPopulation keeps
+one row per distinct state (a "class") in a PetPopulation column store,
+and for every pet only the id of its class. `tick()` runs `tick_columns()`
+over the classes, so its cost follows the number of distinct states, not
+the number of pets. An action on one pet copies its class first (unless
+the pet is alone in it), and classes that end up in the same state are
+merged again, so pets that converge share a row.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+from actions import apply_action
+from config import PetConfig
+from pet import SPECIES, STAGES, STATE_CODES, Pet
+from population import VISUAL_ACTIONS, PetPopulation, tick_columns
+
+# Everything Pet.tick() and the actions read or write, i.e. the class key.
+STATE_COLUMNS = (
+    "species",
+    "stage",
+    "hunger",
+    "happiness",
+    "energy",
+    "total_food_eaten",
+    "state",
+    "is_sleeping",
+    "play_cooldown",
+    "visual_action",
+    "visual_action_ticks",
+    "age",
+    "happy_ticks",
+    # Follow from the rest, but the rows must carry them.
+    "food_goal",
+    "age_goal",
+    "happy_goal",
+)
+
+
+class InternedPopulation:
+    """
+    Pets grouped into classes of identical simulation state.
+
+    Pet ids are indexes in the order pets were appended. `classes` holds
+    one row per class; `class_of[pet]` is the row of each pet and
+    `members[row]` the number of pets in it. Rows left empty or duplicated
+    by actions and ticks are dropped once they make up a quarter of the
+    table, so the occasional pass over every pet stays amortized.
+    """
+
+    def __init__(self, config: PetConfig | None = None) -> None:
+        self.config = config or PetConfig()
+        self.names: List[str] = []
+        self.class_of = array("i")
+        self.classes = PetPopulation(self.config)
+        self.members = array("q")
+        self._index: Dict[Tuple[int, ...], int] = {}
+        # Rows a tick left in the same state as an indexed row, until the
+        # next compaction: indexed row -> the other rows.
+        self._duplicates: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def distinct(self) -> int:
+        """Number of distinct states among the pets."""
+        return len(self._index)
+
+    # ------------- Conversion -------------
+
+    @classmethod
+    def from_pets(cls, pets: Iterable[Pet], config: PetConfig | None = None) -> "InternedPopulation":
+        pets = list(pets)
+        if config is None and pets:
+            config = pets[0]._config
+            if any(pet._config != config for pet in pets):
+                raise ValueError("pets have different configs; pass the config to use for all of them")
+        population = cls(config)
+        for pet in pets:
+            population.append(pet)
+        return population
+
+    def append(self, pet: Pet) -> int:
+        """Add a pet with `pet`'s state and return its id."""
+        self.names.append(pet.name)
+        self.class_of.append(self._intern(pet))
+        return len(self.names) - 1
+
+    def pet_at(self, index: int) -> Pet:
+        """Return a standalone Pet with the state of pet `index`."""
+        pet = self.classes.pet_at(self.class_of[index])
+        pet.name = self.names[index]
+        return pet
+
+    def to_population(self) -> PetPopulation:
+        """Expand into a PetPopulation with one row per pet."""
+        population = PetPopulation(self.config)
+        population.names = list(self.names)
+        for name in STATE_COLUMNS:
+            column = getattr(self.classes, name)
+            getattr(population, name).extend(column[row] for row in self.class_of)
+        return population
+
+    # ------------- Simulation -------------
+
+    def tick(self, n_ticks: int = 1) -> None:
+        """Advance every pet by `n_ticks` ticks (same rules as `Pet.tick()`)."""
+        if n_ticks <= 0:
+            return
+        for _ in range(n_ticks):
+            tick_columns(self.classes, self.config, 0, len(self.classes))
+        self._rehash()
+
+    def act(self, index: int, action: int) -> bool:
+        """Run `action` (an actions.py code) on pet `index` only."""
+        row = self.class_of[index]
+        pet = self.classes.pet_at(row)
+        result = apply_action(pet, action)
+        key = _key_of(pet)
+        if self._index.get(key) == row:
+            return result           # nothing changed
+
+        target = self._index.get(key)
+        if target is None and self.members[row] == 1:
+            # The pet is alone in its class: change the class in place.
+            self._forget(row)
+            self.classes.put(row, pet)
+            self._index[key] = row
+            return result
+        self.members[row] -= 1
+        if self.members[row] == 0:
+            self._forget(row)
+        self.class_of[index] = self._intern(pet) if target is None else target
+        if target is not None:
+            self.members[target] += 1
+        return result
+
+    # ------------- Classes -------------
+
+    def _key(self, row: int) -> Tuple[int, ...]:
+        classes = self.classes
+        return tuple(getattr(classes, name)[row] for name in STATE_COLUMNS)
+
+    def _forget(self, row: int) -> None:
+        """Take `row` out of the index; a duplicate still in use takes its place."""
+        key = self._key(row)
+        if self._index.get(key) != row:
+            return      # an unindexed duplicate: the indexed row stands for it
+        del self._index[key]
+        others = self._duplicates.pop(row, ())
+        for other in others:
+            # Actions may have moved the duplicate off this state since.
+            if other != row and self.members[other] and self._key(other) == key:
+                self._index[key] = other
+                self._duplicates[other] = others
+                break
+
+    def _intern(self, pet: Pet) -> int:
+        """The row of `pet`'s state, with one more member (new if needed)."""
+        key = _key_of(pet)
+        row = self._index.get(key)
+        if row is None:
+            row = self.classes.append(pet)
+            self.classes.names[row] = ""
+            self.members.append(0)
+            self._index[key] = row
+        self.members[row] += 1
+        return row
+
+    def _rehash(self) -> None:
+        """Re-key the classes after a tick and merge duplicates."""
+        index: Dict[Tuple[int, ...], int] = {}
+        duplicates: Dict[int, List[int]] = {}
+        members = self.members
+        columns = [getattr(self.classes, name) for name in STATE_COLUMNS]
+        for row, key in enumerate(zip(*columns)):
+            if members[row]:
+                first = index.setdefault(key, row)
+                if first != row:
+                    duplicates.setdefault(first, []).append(row)
+        self._index = index
+        self._duplicates = duplicates
+        if (len(self.classes) - len(index)) * 4 >= len(self.classes) > 0:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop empty and duplicate rows, remapping every pet."""
+        keep = sorted(self._index.values())
+        new_row = {row: i for i, row in enumerate(keep)}
+        columns = [getattr(self.classes, name) for name in STATE_COLUMNS]
+        translate = array("i", [0]) * len(self.classes)
+        for row, key in enumerate(zip(*columns)):
+            if self.members[row]:
+                translate[row] = new_row[self._index[key]]
+
+        classes = PetPopulation(self.config)
+        classes.names = [""] * len(keep)
+        for name, column in zip(STATE_COLUMNS, columns):
+            getattr(classes, name).extend(column[row] for row in keep)
+        members = array("q", [0]) * len(keep)
+        for row, count in enumerate(self.members):
+            if count:
+                members[translate[row]] += count
+
+        self.classes = classes
+        self.members = members
+        self.class_of = array("i", map(translate.__getitem__, self.class_of))
+        self._index = {key: new_row[row] for key, row in self._index.items()}
+        self._duplicates = {}
+
+
+def _key_of(pet: Pet) -> Tuple[int, ...]:
+    """`pet`'s state as a class key, in STATE_COLUMNS order."""
+    return (
+        SPECIES.index(pet.species),
+        STAGES.index(pet._stage),
+        pet.hunger,
+        pet.happiness,
+        pet.energy,
+        pet.total_food_eaten,
+        STATE_CODES[pet._state],
+        int(pet._is_sleeping),
+        pet._play_cooldown,
+        VISUAL_ACTIONS.index(pet._visual_action),
+        pet._visual_action_ticks_remaining,
+        pet.age,
+        pet.happy_ticks,
+        pet._food_goal,
+        pet._age_goal,
+        pet._happy_goal,
+    )
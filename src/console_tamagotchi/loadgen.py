@@ -0,0 +1,130 @@
+# loadgen.py
+"""
+Load generator for server.py.
+
+Opens several connections, keeps `depth` requests in flight on each for
+a fixed time and reports throughput and request latency percentiles.
+
+Usage (with a server already running):
+
+    python loadgen.py --pets 5000 --connections 8 --depth 16 --seconds 10
+    python loadgen.py --unix /tmp/tamagotchi.sock
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List
+
+from instrument import LatencyHistogram, format_ns
+from server import DEFAULT_PORT, pet_name
+
+# Mostly reads, like a dashboard polling its pets.
+DEFAULT_MIX = {"get": 6, "feed": 1, "play": 1, "sleep": 1, "wake": 1}
+
+
+async def _connection(
+    open_connection,
+    pets: int,
+    depth: int,
+    deadline: float,
+    hist: LatencyHistogram,
+    mix: Dict[str, int],
+    rng: random.Random,
+) -> int:
+    reader, writer = await open_connection()
+    ops = rng.choices(list(mix), weights=list(mix.values()), k=4096)
+    sent_at: Dict[int, int] = {}
+    slots = asyncio.Semaphore(depth)
+    errors = 0
+    sending = True
+
+    async def receive() -> None:
+        nonlocal errors
+        while sending or sent_at:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            reply = json.loads(line)
+            hist.record(time.perf_counter_ns() - sent_at.pop(reply["id"]))
+            errors += not reply["ok"]
+            slots.release()
+
+    receiver = asyncio.create_task(receive())
+    request_id = 0
+    try:
+        while time.monotonic() < deadline:
+            await slots.acquire()
+            request = {"id": request_id, "op": ops[request_id % len(ops)], "pet": pet_name(rng.randrange(pets))}
+            sent_at[request_id] = time.perf_counter_ns()
+            writer.write(json.dumps(request).encode() + b"\n")
+            request_id += 1
+        # Collect the replies still in flight.
+        sending = False
+        if sent_at:
+            await receiver
+    finally:
+        receiver.cancel()
+        writer.close()
+    return errors
+
+
+async def run_load(
+    open_connection,
+    pets: int,
+    connections: int = 4,
+    depth: int = 8,
+    seconds: float = 5.0,
+    mix: Dict[str, int] | None = None,
+    seed: int = 0,
+) -> tuple[LatencyHistogram, int]:
+    """
+    Drive a server; returns the latency histogram and the error count.
+
+    `open_connection` is a coroutine function returning (reader, writer),
+    e.g. `functools.partial(asyncio.open_connection, host, port)`.
+    """
+    hist = LatencyHistogram()
+    deadline = time.monotonic() + seconds
+    errors = await asyncio.gather(*(
+        _connection(open_connection, pets, depth, deadline, hist, mix or DEFAULT_MIX, random.Random(seed + i))
+        for i in range(connections)
+    ))
+    return hist, sum(errors)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test a running pet server.")
+    parser.add_argument("--pets", type=int, default=1000, help="pets on the server (pet-0 .. pet-N-1)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=8, help="requests in flight per connection")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    if args.unix:
+        def open_connection():
+            return asyncio.open_unix_connection(args.unix)
+    else:
+        def open_connection():
+            return asyncio.open_connection(args.host, args.port)
+
+    start = time.monotonic()
+    hist, errors = asyncio.run(
+        run_load(open_connection, args.pets, args.connections, args.depth, args.seconds)
+    )
+    elapsed = time.monotonic() - start
+    print(f"requests  {hist.count} ({hist.count / elapsed:.0f}/s), errors {errors}")
+    print(f"latency   p50 {format_ns(hist.percentile(50))}  p99 {format_ns(hist.percentile(99))}  max {format_ns(hist.max)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,19 +5,65 @@ GUI Tamagotchi using tkinter.
 Author: Buyan-Erdene Batsaikhan
 """
 
+import argparse
+import time
 import tkinter as tk
 from tkinter import ttk
+from typing import NamedTuple
 
+from actions import ACTION_NAMES, FEED, PLAY, SLEEP, WAKE
+from clock import FixedStepClock
+from instrument import Instrumentation
 from pet import Pet, PetState  # pet.py is in the same folder
+from replay import SessionRecorder
+from solver import PolicyTable
 
 TICK_INTERVAL_MS = 1000       # logic tick: 1s
 ANIM_INTERVAL_MS = 333        # ~3 FPS animation
 BAR_WIDTH = 220
 BAR_HEIGHT = 16
+MAX_IDLE_TICKS = 3600         # re-check at least once an hour of game time
+MAX_CATCH_UP_TICKS = 600      # ticks applied per frame when behind
+OVERLAY_INTERVAL_MS = 500     # latency overlay refresh
+DEFAULT_LATENCY_FILE = "tamagotchi-latency.json"
+
+
+def bar_fill_width(value: int, max_value: int = 100, invert: bool = False) -> int:
+    """Width in pixels of the filled part of a stat bar."""
+    value = max(0, min(max_value, value))
+    if invert:
+        value = max_value - value
+    return BAR_WIDTH * value // max_value if max_value > 0 else 0
+
+
+# What the bars draw for each stat, used to skip ticks nobody can see.
+BAR_LEVELS = {
+    "hunger": lambda value: bar_fill_width(value, invert=True),
+    "happiness": lambda value: bar_fill_width(value),
+    "energy": lambda value: bar_fill_width(value),
+}
+
+
+class ViewModel(NamedTuple):
+    """Everything the window shows for the pet, as plain values."""
+
+    art: str
+    state_text: str
+    hunger_fill: int
+    happiness_fill: int
+    energy_fill: int
+    # Enabled flags for the feed, play, sleep and wake buttons
+    buttons: tuple[bool, bool, bool, bool]
+    dead: bool
 
 
 class TamagotchiApp(tk.Tk):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        latency_file: str | None = None,
+        record_file: str | None = None,
+        autopilot: PolicyTable | None = None,
+    ) -> None:
         super().__init__()
 
         self.title("Tamagotchi")
@@ -28,12 +74,51 @@ class TamagotchiApp(tk.Tk):
         self.style.theme_use("clam")
 
         name, species = self.ask_name_and_species()
-        self.pet = Pet(name=name, species=species)
+        self.pet = Pet(name=name, species=species, config=autopilot.config if autopilot else None)
+        # Every tick and action goes through the recorder, so the session
+        # can be replayed exactly (see replay.py); saved with --record.
+        self.session = SessionRecorder(self.pet)
+        self.record_file = record_file
+        # With a solved policy (see solver.py) the pet looks after itself:
+        # before every tick the table's action for the current state runs.
+        self.autopilot = autopilot
 
         self.tick_count = 0
         self.anim_frame = 0
+
+        # Tick scheduling: tick k is due at clock.origin + k * interval;
+        # game_tick only wakes up when the next tick that can change the
+        # display is due and applies the ticks due by then in bulk.
+        self.clock = FixedStepClock(TICK_INTERVAL_MS / 1000, MAX_CATCH_UP_TICKS)
+        self._tick_job: str | None = None
+        self._anim_origin = self.clock.origin
+        self._anim_job: str | None = None
+        # When the pending jobs were meant to run (time.monotonic()), for
+        # measuring how late Tk's after() fires them.
+        self._tick_due: float | None = None
+        self._anim_due: float | None = None
+
+        # Latency histograms, recorded only while enabled (press [L] or
+        # pass --latency) and written to a file on exit.
+        self.latency_file = latency_file
+        self.instruments = Instrumentation()
+        self.instruments.wrap(self, "game_tick", "game_tick", due=lambda: self._tick_due)
+        self.instruments.wrap(self, "animation_tick", "animation_tick", due=lambda: self._anim_due)
+        self.instruments.wrap(self, "_update_ui", "_update_ui")
+        self.instruments.wrap(Pet, "advance", "Pet.advance")
+        self.instruments.wrap(Pet, "tick", "Pet.tick")
+        if latency_file is not None:
+            self.instruments.enable()
+
         self.feedback_text = tk.StringVar(value="Your new pet has hatched!")
 
+        # Retained-mode rendering: the last ViewModel on screen, and how many
+        # Tk calls the latest frame needed to bring the widgets up to date.
+        self._view: ViewModel | None = None
+        self.tk_calls_last_frame = 0
+        self.tk_calls_total = 0
+        self.frames_rendered = 0
+
         self._build_ui()
         self._update_ui()
 
@@ -42,10 +127,11 @@ class TamagotchiApp(tk.Tk):
 
         # Keyboard bindings
         self.bind_all("<Key>", self.on_key)
+        self.protocol("WM_DELETE_WINDOW", self.on_quit)
 
         # Start loops
-        self.after(TICK_INTERVAL_MS, self.game_tick)
-        self.after(ANIM_INTERVAL_MS, self.animation_tick)
+        self._schedule_game_tick()
+        self._schedule_animation()
 
     # ------------- Pet selection dialog -------------
 
@@ -146,14 +232,17 @@ class TamagotchiApp(tk.Tk):
         ttk.Label(bars_frame, text="Hunger").grid(row=0, column=0, sticky="w")
         self.hunger_canvas = tk.Canvas(bars_frame, width=BAR_WIDTH, height=BAR_HEIGHT, highlightthickness=0)
         self.hunger_canvas.grid(row=0, column=1, padx=(8, 0), pady=2)
+        self.hunger_fill = self._create_bar(self.hunger_canvas)
 
         ttk.Label(bars_frame, text="Happiness").grid(row=1, column=0, sticky="w")
         self.happiness_canvas = tk.Canvas(bars_frame, width=BAR_WIDTH, height=BAR_HEIGHT, highlightthickness=0)
         self.happiness_canvas.grid(row=1, column=1, padx=(8, 0), pady=2)
+        self.happiness_fill = self._create_bar(self.happiness_canvas)
 
         ttk.Label(bars_frame, text="Energy").grid(row=2, column=0, sticky="w")
         self.energy_canvas = tk.Canvas(bars_frame, width=BAR_WIDTH, height=BAR_HEIGHT, highlightthickness=0)
         self.energy_canvas.grid(row=2, column=1, padx=(8, 0), pady=2)
+        self.energy_fill = self._create_bar(self.energy_canvas)
 
         feedback_label = ttk.Label(self, textvariable=self.feedback_text, foreground="#555555", padding=(10, 4))
         feedback_label.grid(row=2, column=0, sticky="w")
@@ -176,94 +265,187 @@ class TamagotchiApp(tk.Tk):
         self.quit_button = ttk.Button(buttons_frame, text="Quit [Q]", command=self.on_quit)
         self.quit_button.grid(row=0, column=4, padx=3)
 
-    # ------------- Drawing helpers -------------
+        # Render statistics, shown with [D]; not counted in the stats.
+        self.render_stats_text = tk.StringVar(value="")
+        self.render_stats_label = ttk.Label(
+            self, textvariable=self.render_stats_text, foreground="#888888", padding=(10, 0, 10, 6)
+        )
+        self._show_render_stats = False
 
-    def draw_bar(self, canvas: tk.Canvas, value: int, max_value: int = 100, invert: bool = False) -> None:
-        canvas.delete("all")
-        value = max(0, min(max_value, value))
-        if invert:
-            value = max_value - value
+        # Latency overlay, shown with [L].
+        self.latency_text = tk.StringVar(value="")
+        self.latency_label = tk.Label(
+            self, textvariable=self.latency_text, font=("Consolas", 9), justify="left", anchor="w"
+        )
+        self._overlay_job: str | None = None
 
-        ratio = value / max_value if max_value > 0 else 0
-        fill_width = int(BAR_WIDTH * ratio)
+    # ------------- Drawing helpers -------------
 
+    def _create_bar(self, canvas: tk.Canvas) -> int:
+        """Create a bar's items once; returns the id of the fill rectangle."""
         canvas.create_rectangle(0, 0, BAR_WIDTH, BAR_HEIGHT, outline="#666666", width=1)
-        if fill_width > 0:
-            canvas.create_rectangle(0, 0, fill_width, BAR_HEIGHT, outline="", fill="#4caf50")
+        return canvas.create_rectangle(0, 0, 0, BAR_HEIGHT, outline="", fill="#4caf50")
 
-    def _update_art(self) -> None:
-        art = self.pet.get_ascii_frame(self.anim_frame)
-        self.art_label.config(text=art)
+    def _view_model(self) -> ViewModel:
+        pet = self.pet
+        dead = pet.state == PetState.DEAD
 
-    def _update_ui(self) -> None:
-        self._update_art()
-
-        state_text = self.pet.state.value.upper()
-        if self.pet.is_sleeping and self.pet.state != PetState.DEAD:
+        state_text = pet.state.value.upper()
+        if pet.is_sleeping and not dead:
             state_text += " (SLEEPING)"
-        self.state_label.config(text=f"State: {state_text}")
 
-        self.draw_bar(self.hunger_canvas, self.pet.hunger, invert=True)
-        self.draw_bar(self.happiness_canvas, self.pet.happiness, invert=False)
-        self.draw_bar(self.energy_canvas, self.pet.energy, invert=False)
+        if dead:
+            buttons = (False, False, False, False)
+        elif pet.is_sleeping:
+            buttons = (False, False, False, True)
+        else:
+            buttons = (True, True, True, False)
+
+        return ViewModel(
+            art=pet.get_ascii_frame(self.anim_frame),
+            state_text=f"State: {state_text}",
+            hunger_fill=bar_fill_width(pet.hunger, invert=True),
+            happiness_fill=bar_fill_width(pet.happiness),
+            energy_fill=bar_fill_width(pet.energy),
+            buttons=buttons,
+            dead=dead,
+        )
 
-        if self.pet.state == PetState.DEAD:
-            self.feed_button.state(["disabled"])
-            self.play_button.state(["disabled"])
-            self.sleep_button.state(["disabled"])
-            self.wake_button.state(["disabled"])
+    def _render(self, view: ViewModel) -> None:
+        """Push only the parts of `view` that differ from what is on screen."""
+        last = self._view
+        calls = 0
+
+        if last is None or view.art != last.art:
+            self.art_label.config(text=view.art)
+            calls += 1
+        if last is None or view.state_text != last.state_text:
+            self.state_label.config(text=view.state_text)
+            calls += 1
+
+        for canvas, item, fill, last_fill in (
+            (self.hunger_canvas, self.hunger_fill, view.hunger_fill, last and last.hunger_fill),
+            (self.happiness_canvas, self.happiness_fill, view.happiness_fill, last and last.happiness_fill),
+            (self.energy_canvas, self.energy_fill, view.energy_fill, last and last.energy_fill),
+        ):
+            if last is None or fill != last_fill:
+                canvas.coords(item, 0, 0, fill, BAR_HEIGHT)
+                calls += 1
+
+        buttons = (self.feed_button, self.play_button, self.sleep_button, self.wake_button)
+        for i, button in enumerate(buttons):
+            if last is None or view.buttons[i] != last.buttons[i]:
+                button.state(["!disabled"] if view.buttons[i] else ["disabled"])
+                calls += 1
+
+        if view.dead and (last is None or not last.dead):
             self.feedback_text.set("Your pet has died. Press [Q] to quit.")
+            calls += 1
+
+        self._view = view
+        self.tk_calls_last_frame = calls
+        self.tk_calls_total += calls
+        self.frames_rendered += 1
+        if self._show_render_stats:
+            self.render_stats_text.set(
+                f"Tk calls: {calls} this frame, "
+                f"{self.tk_calls_total / self.frames_rendered:.2f} avg over {self.frames_rendered} frames"
+            )
+
+    def _update_art(self) -> None:
+        if self._view is not None:
+            self._render(self._view._replace(art=self.pet.get_ascii_frame(self.anim_frame)))
+
+    def _update_ui(self) -> None:
+        self._render(self._view_model())
+        if self._anim_job is None and self.pet.frame_count() > 1:
+            self._schedule_animation()
+
+    def toggle_render_stats(self) -> None:
+        self._show_render_stats = not self._show_render_stats
+        if self._show_render_stats:
+            self.render_stats_label.grid(row=4, column=0, sticky="w")
         else:
-            if self.pet.is_sleeping:
-                self.feed_button.state(["disabled"])
-                self.play_button.state(["disabled"])
-                self.sleep_button.state(["disabled"])
-                self.wake_button.state(["!disabled"])
-            else:
-                self.feed_button.state(["!disabled"])
-                self.play_button.state(["!disabled"])
-                self.sleep_button.state(["!disabled"])
-                self.wake_button.state(["disabled"])
+            self.render_stats_label.grid_remove()
+
+    def toggle_latency_overlay(self) -> None:
+        """Show or hide the latency histograms (recording runs while shown or with --latency)."""
+        if self._overlay_job is None:
+            self.instruments.enable()
+            self.latency_label.grid(row=5, column=0, sticky="w", padx=10, pady=(0, 6))
+            self._refresh_latency_overlay()
+        else:
+            self.after_cancel(self._overlay_job)
+            self._overlay_job = None
+            if self.latency_file is None:
+                # Recording started by --latency goes on until exit.
+                self.instruments.disable()
+            self.latency_label.grid_remove()
+
+    def _refresh_latency_overlay(self) -> None:
+        clock = self.clock.stats()
+        lines = self.instruments.summary_lines()
+        lines.append(
+            f"clock: {clock['ticks']} ticks in {clock['elapsed_s']:.0f}s, "
+            f"lag {clock['lag_ticks']:.2f}, max backlog {clock['max_backlog']}, "
+            f"capped {clock['capped_updates']}/{clock['updates']}"
+        )
+        self.latency_text.set("\n".join(lines))
+        self._overlay_job = self.after(OVERLAY_INTERVAL_MS, self._refresh_latency_overlay)
 
     # ------------- Button callbacks -------------
 
     def on_feed(self) -> None:
         if self.pet.state == PetState.DEAD:
             return
-        if self.pet.feed():
+        self._catch_up()
+        if self.session.act(FEED):
             self.feedback_text.set("You feed your pet. Crunch crunch.")
         else:
             self.feedback_text.set("Feeding had no effect.")
         self._update_ui()
+        self._schedule_game_tick()
 
     def on_play(self) -> None:
         if self.pet.state == PetState.DEAD:
             return
-        if self.pet.play():
+        self._catch_up()
+        if self.session.act(PLAY):
             self.feedback_text.set("You play with your pet. It looks happier!")
         else:
             self.feedback_text.set("Your pet is too tired or on cooldown.")
         self._update_ui()
+        self._schedule_game_tick()
 
     def on_sleep(self) -> None:
         if self.pet.state == PetState.DEAD:
             return
-        if self.pet.sleep():
+        self._catch_up()
+        if self.session.act(SLEEP):
             self.feedback_text.set("Your pet curls up and falls asleep.")
         else:
             self.feedback_text.set("Your pet cannot sleep right now.")
         self._update_ui()
+        self._schedule_game_tick()
 
     def on_wake(self) -> None:
         if self.pet.state == PetState.DEAD:
             return
-        if self.pet.wake():
+        self._catch_up()
+        if self.session.act(WAKE):
             self.feedback_text.set("You gently wake your pet.")
         else:
             self.feedback_text.set("Your pet refuses to wake.")
         self._update_ui()
+        self._schedule_game_tick()
 
     def on_quit(self) -> None:
+        # --latency always gets its file; an overlay still open gets one too.
+        if self.latency_file is not None or self.instruments.enabled:
+            self.instruments.disable()
+            self.instruments.dump(self.latency_file or DEFAULT_LATENCY_FILE)
+        if self.record_file is not None:
+            self.session.log.save(self.record_file)
         self.destroy()
 
     # ------------- Keyboard -------------
@@ -273,6 +455,10 @@ class TamagotchiApp(tk.Tk):
 
         if key == "q":
             self.on_quit()
+        elif key == "d":
+            self.toggle_render_stats()
+        elif key == "l":
+            self.toggle_latency_overlay()
         elif self.pet.state == PetState.DEAD:
             return
         elif key == "f":
@@ -290,23 +476,89 @@ class TamagotchiApp(tk.Tk):
         if not self.winfo_exists():
             return
 
-        if self.pet.state != PetState.DEAD:
-            self.pet.tick()
-            self.tick_count += 1
-            self._update_ui()
+        self._tick_job = None
+        self._tick_due = None
+        self._catch_up()
+        self._schedule_game_tick()
 
-        self.after(TICK_INTERVAL_MS, self.game_tick)
+    def _catch_up(self) -> None:
+        """Apply the ticks that are due by now (at most MAX_CATCH_UP_TICKS)."""
+        if self.pet.state == PetState.DEAD:
+            return
+        due = self.clock.take()
+        if due <= 0:
+            return
+        if self.autopilot is None:
+            self.session.tick(due)
+        else:
+            for _ in range(due):
+                action = self.autopilot.action_for(self.pet)
+                if action is not None and self.session.act(action):
+                    self.feedback_text.set(f"Autopilot: {ACTION_NAMES[action]}.")
+                self.session.tick(1)
+        self.tick_count += due
+        self._update_ui()
 
-    def animation_tick(self) -> None:
-        if not self.winfo_exists():
+    def _schedule_game_tick(self) -> None:
+        """Sleep until the next tick that can change what is on screen."""
+        if self._tick_job is not None:
+            self.after_cancel(self._tick_job)
+            self._tick_job = None
+            self._tick_due = None
+        if self.pet.state == PetState.DEAD:
             return
-        self.anim_frame += 1
-        self._update_art()
-        self.after(ANIM_INTERVAL_MS, self.animation_tick)
 
+        if self.clock.due() > 0:
+            # Still catching up after a stall: continue on the next frame.
+            ticks = 0
+        elif self.autopilot is not None:
+            # The autopilot may act before any tick.
+            ticks = 1
+        else:
+            ticks = self.pet.ticks_until_visible_change(MAX_IDLE_TICKS, BAR_LEVELS)
+        wake_at = self.clock.time_of(ticks)
+        delay_ms = max(0, round((wake_at - time.monotonic()) * 1000))
+        self._tick_due = max(wake_at, time.monotonic())
+        self._tick_job = self.after(delay_ms, self.game_tick)
 
-def main() -> None:
-    app = TamagotchiApp()
+    def animation_tick(self) -> None:
+        if not self.winfo_exists():
+            return
+        self._anim_job = None
+        self._anim_due = None
+        self._schedule_animation()
+
+    def _schedule_animation(self) -> None:
+        """
+        Show the frame for the current time and wait for the next one.
+
+        Single-frame sprites never change, so the loop stops for them and
+        _update_ui restarts it once an animated sprite is shown.
+        """
+        interval = ANIM_INTERVAL_MS / 1000
+        elapsed = time.monotonic() - self._anim_origin
+        frame = int(elapsed / interval)
+        if frame != self.anim_frame:
+            self.anim_frame = frame
+            self._update_art()
+
+        if self._anim_job is None and self.pet.frame_count() > 1:
+            delay_ms = max(0, round(((frame + 1) * interval - elapsed) * 1000))
+            self._anim_due = self._anim_origin + (frame + 1) * interval
+            self._anim_job = self.after(delay_ms, self.animation_tick)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="GUI Tamagotchi.")
+    parser.add_argument(
+        "--latency", nargs="?", const=DEFAULT_LATENCY_FILE, metavar="FILE",
+        help=f"record tick/frame latency and write it to FILE on exit (default {DEFAULT_LATENCY_FILE})",
+    )
+    parser.add_argument("--record", metavar="FILE", help="save the session's action log to FILE on exit")
+    parser.add_argument("--autopilot", metavar="FILE", help="let a policy table from solver.py care for the pet")
+    args = parser.parse_args(argv)
+    autopilot = PolicyTable.load(args.autopilot) if args.autopilot else None
+    app = TamagotchiApp(latency_file=args.latency, record_file=args.record, autopilot=autopilot)
     app.mainloop()
 
 
@@ -6,9 +6,13 @@ Author: Buyan-Erdene Batsaikhan
 
 from __future__ import annotations
 
-from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Any, List
+from typing import Any, Callable, Dict
+
+# PetConfig and friends moved to config.py; re-exported for existing imports.
+from config import DEFAULT_CONFIG, PetConfig, derived, intern_config  # noqa: F401
+from evolution import NEVER, STAGES, resolve
+from state_machine import DEAD, classify
 
 
 class PetState(str, Enum):
@@ -19,657 +23,70 @@ class PetState(str, Enum):
     DEAD = "dead"
 
 
-@dataclass
-class PetConfig:
-    max_stat: int = 100
-    min_stat: int = 0
-
-    # Per-tick changes (when awake)
-    hunger_per_tick: int = 2
-    energy_per_tick: int = -1
-    happiness_per_tick: int = -1
-
-    # Per-tick changes (when sleeping)
-    sleep_energy_gain_per_tick: int = 5
-    sleep_hunger_increase_per_tick: int = 1
-    sleep_happiness_change_per_tick: int = 0
-
-    # Action effects
-    feed_amount: int = 25
-    play_happiness_gain: int = 20
-    play_energy_cost: int = 10
-
-    # Cooldown
-    play_cooldown_ticks: int = 2
-
-    # State thresholds
-    hungry_threshold: int = 70
-    tired_threshold: int = 30
-    bored_threshold: int = 30
-
-    # Death conditions
-    death_hunger: int = 100
-    death_energy: int = 0
-    death_happiness: int = 0
-
-    # Sleep control
-    auto_sleep_energy_threshold: int = 15
-    auto_wake_energy_threshold: int = 80
-
-    # Visual action duration (ticks)
-    action_visual_ticks: int = 3
-
-    # ---------- Evolution settings ----------
-    food_to_adult: int = 100
-
-
-
-# Big ASCII sprites, per species and visual "mode"
-# Cheap but good enough.
-# species -> stage -> visual-mode -> frames
-ASCII_SPRITES: Dict[str, Dict[str, Dict[str, List[str]]]] = {
-    "cat": {
-        "baby": {
-            "idle": [
-r"""
-  /\_/\  
- ( >^< ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-            "eat":  [
-r"""
-  /\_/\  
- ( =ω= ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-            "sleep":[
-r"""
-  /\_/\  
- ( -^- )  zz
- /  ^  \ 
- \_/ \_/ 
-""",
-r"""
-  /\_/\  
- ( -^- )  zzz
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-            "play": [
-r"""
-  /\_/\ ♪
- ( >o< ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-r"""
-♪ /\_/\  
- ( >o< ) 
- /  ^  \ 
- \_/ \_/ 
-""",      
-        ],
-            "hungry":[
-r"""
-  /\_/\  
- ( ·_· ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-r"""
-  /\_/\  
- ( ;_; ) 
- /  ^  \ 
- \_/ \_/ 
-""",        
-        ],
-            "tired":[
-r"""
-  /\_/\  
- ( -_- ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-r"""
-  /\_/\  
- ( -.- ) z
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-            "bored":[
-r"""
-  /\_/\  
- ( -^- ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-            "dead": [
-r"""
-  /\_/\  
- ( x^x ) 
- /  ^  \ 
- \_/ \_/ 
-""",
-        ],
-        },
-        "adult": {
-            "idle": [
-r"""
-  /\___/\  
- (  >^<  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "eat":  [
-r"""
-   /\___/\  
-  (   >^<  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-r"""
-   /\___/\  
-  (   =ω=  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",        
-        ],
-            "sleep":[
-r"""
-  /\___/\  
- (  -^-  )  zz
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-r"""
-  /\___/\  
- (  -^-  )  zzz
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],  
-            "play": [
-r"""
-  /\___/\ ♪ 
- (  >o<  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-r"""
-♪ /\___/\  
- (  >o<  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "hungry":[
-r"""
-  /\___/\  
- (  ·_·  )  
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-r"""
-  /\___/\  
- (  ;_;  )  
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "tired":[
-r"""
- /\___/\  
-( -_-  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-r"""
- /\___/\  
-( -.-  )   zz
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "bored":[
-r"""
-  /\___/\  
- (  -^-  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "dead": [
-r"""
-  /\___/\  
- (  x^x  ) 
- /  | |  \ 
-/   | |   \
-\___/ \___/
-""",
-        ], 
-        },
-    },
-    "dog": {
-        "baby": {
-            "idle": [
-r"""
-  _____  
- /)UᴥU(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "eat":  [
-r"""
-  _____  
- /)=ω=(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "sleep":[
-r"""
-  _____  
- /)-ᴥ-(\  zz
- /  V  \ 
- \_/ \_/ 
-""",
-r"""
-  _____  
- /)-ᴥ-(\  zzz
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "play": [
-r"""
-  _____  
- /)^ᴥ^(\ 
- /  V  \ ⚽
- \_/ \_/ 
-""",
-r"""
-  _____  ⚽
- /)^ᴥ^(\ 
- /  V  \ 
- \_/ \_/
-""",      
-        ],
-            "hungry":[
-r"""
-  _____  
- /)·ᴥ·(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-r"""
-  _____  
- /);ᴥ;(\  
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "tired":[ 
-r"""
-  _____  
- /)-ᴥ-(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-r"""
-  _____  
- /)-ᴥ-(\  zz
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "bored":[
-r"""
-  _____  
- /)-ᴥ-(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-            "dead": [
-r"""
-  _____  
- /)xᴥx(\ 
- /  V  \ 
- \_/ \_/ 
-""",
-        ],
-        },
-        "adult": {
-            "idle": [
-r"""
-  /)   (\  
- /  UᴥU  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "eat":  [
-r"""
-   /)   (\  
-  /   UᴥU  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-r"""
-   /)   (\  
-  /   =ω=  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",        ],
-            "sleep":[
-r"""
-  /)   (\  
- /  -ᴥ-  \  zz
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-r"""
-  /)   (\  
- /  -ᴥ-  \  zzz
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "play": [
-r"""
-  /)   (\ 
- /  ^ᴥ^  \ 
-(   | |   ) ⚽
-/   | |   \
-\___/ \___/
-""",
-r"""
-♪ /)   (\   ⚽
- /  ^ᴥ^  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",      ],
-            "hungry":[
-r"""
-  /)   (\  
- /  ·ᴥ·  \  
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-r"""
-  /)   (\  
- /  ;ᴥ;  \  
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "tired":[
-r"""
- /)   (\  
-/ -ᴥ-  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-r"""
- /)   (\  
-/ -ᴥ-  \   zz
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "bored":[
-r"""
-  /)   (\  
- /  -ᴥ-  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],
-            "dead": [
-r"""
-  /)   (\  
- /  xᴥx  \ 
-(   | |   )
-/   | |   \
-\___/ \___/
-""",
-        ],        
-        },
-    },
-    "dragon": {
-        "baby": {
-            "idle": [
-r"""
-   /\   
- [ +_+ ]
- /  |  \
- \_/ \_/
-""",
-        ],
-            "eat":  [
-r"""
-   /\   
- [ =ω= ]
- /  |  \
- \_/ \_/
-""",
-        ],
-            "sleep":[
-r"""
-   /\   
- [ -_- ]  zz
- /  |  \
- \_/ \_/
-""",
-r"""
-   /\   
- [ -_- ]  zzz
- /  |  \
- \_/ \_/
-""",
-        ],
-            "play": [
-r"""
-   /\   
- [ +.+ ] 
- /  |🔥\
- \_/ \_/
-""",
-r"""
-   /\   
- [ +.+ ] 
- /🔥|🔥\
- \_/ \_/
-""",      
-        ],
-            "hungry":[
-r"""
-   /\   
- [ ·_· ] 
- /  |  \
- \_/ \_/
-""",
-r"""
-   /\   
- [ ;_; ] 
- /  |  \
- \_/ \_/
-""",      
-        ],
-            "tired":[
-r"""
-   /\   
- [ -_- ]  
- /  |  \
- \_/ \_/
-""",
-r"""
-   /\   
- [ -.- ]  zz
- /  |  \
- \_/ \_/
-""",
-        ],
-            "bored":[
-r"""
-   /\   
- [ -_- ]
- /  |  \
- \_/ \_/
-""",
-        ],
-            "dead": [
-r"""
-   /\   
- [ x_x ]
- /  |  \
- \_/ \_/
-""",
-        ],        
-        },
-        "adult": {
-            "idle": [
-r"""
-      /\  
-   <[ +_+ ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-        ],
-            "eat":  [
-r"""
-       /\  
-    <[  +_+ ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-r"""
-       /\  
-    <[  =ω= ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",        
-        ],
-            "sleep":[
-r"""
-      /\  
-   <[ -_- ]>  z
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-r"""
-      /\  
-   <[ -_- ]>  zzz
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-        ],
-            "play": [
-r"""
-      /\   
-   <[ +.+ ]>
-   /  | |  \
-  /   | | 🔥\
-  \___/ \___==^
-""",
-r"""
-      /\   
-   <[ +.+ ]>
-   /  | |  \
-  / 🔥| |🔥 \
-  \___/ \___==^
-""",      
-        ],
-            "hungry":[
-r"""
-      /\   
-   <[ ·_· ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-r"""
-      /\   
-   <[ ;_; ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",      
-        ],
-            "tired":[
-r"""
-     /\  
-  <[ -_- ]>  
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-r"""
-     /\  
-  <[ -.- ]>   zz
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-        ],
-            "bored":[
-r"""
-      /\  
-   <[ -_- ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-        ],
-            "dead": [
-r"""
-      /\  
-   <[ x_x ]>
-   /  | |  \
-  /   | |   \
-  \___/ \___==^
-""",
-        ],
-        },
-    },
-}
+# PetState for each state_machine code (ALIVE, HUNGRY, TIRED, BORED, DEAD).
+STATES: tuple[PetState, ...] = tuple(PetState)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+
+# Sprite data lives in sprites.py and is only loaded the first time a pet
+# is drawn (see _load_sprites), so headless users never pay for it. Every
+# (species, stage, mode) slot of the compiled SPRITE_TABLE holds
+# SPRITE_SLOT_FRAMES entries, so a frame is a single index:
+# slot * SPRITE_SLOT_FRAMES + frame_index % SPRITE_SLOT_FRAMES.
+SPECIES: tuple[str, ...] = ("cat", "dog", "dragon")
+VISUAL_MODES: tuple[str, ...] = (
+    "idle", "eat", "sleep", "play", "hungry", "tired", "bored", "dead",
+)
+_MODE_CODES = {mode: code for code, mode in enumerate(VISUAL_MODES)}
+# Canonical copies of the names pets store, so that strings decoded from
+# JSON are not kept once per pet.
+_NAMES = {name: name for name in (*SPECIES, *STAGES, "eat", "play")}
+_SPRITE_NAMES = ("ASCII_SPRITES", "SPRITE_TABLE", "SPRITE_FRAME_COUNTS", "SPRITE_SLOT_FRAMES")
+
+
+def _load_sprites() -> None:
+    """Import sprites.py and bind its tables as globals of this module."""
+    import sprites
+
+    globals().update({name: getattr(sprites, name) for name in _SPRITE_NAMES})
+
+
+def __getattr__(name: str) -> Any:
+    # `from pet import SPRITE_TABLE` and friends still work; they just
+    # load the sprite data on first use.
+    if name in _SPRITE_NAMES:
+        _load_sprites()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def sprite_slot(species_code: int, stage_code: int, mode_code: int) -> int:
+    """Slot number of a (species, stage, mode) triple in SPRITE_TABLE."""
+    return (species_code * len(STAGES) + stage_code) * len(VISUAL_MODES) + mode_code
+
+
+# Returned by Pet._ticks_before_next_event when nothing will ever happen.
+_NO_EVENT = 1 << 62
+
+
+def _first_tick_at_or_above(value: int, step: int, target: int) -> int | None:
+    """Smallest j >= 1 with value + j * step >= target, or None."""
+    if step > 0:
+        return max(1, -((value - target) // step))
+    return 1 if value + step >= target else None
+
+
+def _first_tick_at_or_below(value: int, step: int, target: int) -> int | None:
+    """Smallest j >= 1 with value + j * step <= target, or None."""
+    return _first_tick_at_or_above(-value, -step, -target)
+
+
+def _ticks_above(value: int, step: int, bound: int, n: int) -> int:
+    """Number of j in 1..n with value + j * step > bound."""
+    if step >= 0:
+        first = _first_tick_at_or_above(value, step, bound + 1)
+        return 0 if first is None else max(0, n - first + 1)
+    return min(n, _first_tick_at_or_below(value, step, bound) - 1)
 
 
 class Pet:
@@ -677,6 +94,31 @@ class Pet:
     Tamagotchi pet with FSM and visual state.
     """
 
+    # No per-pet __dict__: with many pets the attribute dict was most of
+    # a pet's size.
+    __slots__ = (
+        "name",
+        "_sprite_offset",
+        "_species",
+        "_stage",
+        "hunger",
+        "happiness",
+        "energy",
+        "total_food_eaten",
+        "age",
+        "happy_ticks",
+        "_food_goal",
+        "_age_goal",
+        "_happy_goal",
+        "_config",
+        "_derived",
+        "_state",
+        "_is_sleeping",
+        "_play_cooldown",
+        "_visual_action",
+        "_visual_action_ticks_remaining",
+    )
+
     def __init__(
         self,
         name: str,
@@ -688,15 +130,28 @@ class Pet:
         config: PetConfig | None = None,
     ) -> None:
         self.name = name
-        self.species = species if species in ASCII_SPRITES else "cat"
-        self._stage = stage if stage in ("baby", "adult") else "baby"
+        # Offset of the current sprite slot in SPRITE_TABLE; -1 means it
+        # must be recomputed (state, sleep, visual action, species or stage
+        # changed).
+        self._sprite_offset: int = -1
+        self._species = _NAMES[species] if species in SPECIES else "cat"
+        self._stage = _NAMES[stage] if stage in STAGES else "baby"
 
         self.hunger = hunger
         self.happiness = happiness
         self.energy = energy
+
+        # Evolution counters, and the value each must reach before the
+        # stage chain is looked at again (see evolution.py).
         self.total_food_eaten: int = 0
+        self.age: int = 0
+        self.happy_ticks: int = 0
+        self._food_goal = self._age_goal = self._happy_goal = NEVER
 
-        self._config = config or PetConfig()
+        # Shared by every pet with the same config: the config itself and
+        # the deltas/state table the tick code needs (see config.py).
+        self._derived = derived(config)
+        self._config = self._derived.config
 
         self._state: PetState = PetState.ALIVE
         self._is_sleeping: bool = False
@@ -707,6 +162,18 @@ class Pet:
         self._visual_action_ticks_remaining: int = 0
 
         self._update_state()
+        self._evolve()
+
+    @property
+    def species(self) -> str:
+        return self._species
+
+    @species.setter
+    def species(self, value: str) -> None:
+        self._species = _NAMES[value] if value in SPECIES else "cat"
+        self._sprite_offset = -1
+        # Species may have different stage chains.
+        self._evolve()
 
     @property
     def state(self) -> PetState:
@@ -720,6 +187,8 @@ class Pet:
 
     def tick(self) -> None:
         if self._state == PetState.DEAD:
+            # The dead sprite ignores the visual action, so the cached
+            # sprite stays valid.
             self._visual_action = None
             self._visual_action_ticks_remaining = 0
             return
@@ -739,11 +208,294 @@ class Pet:
             self._visual_action_ticks_remaining -= 1
             if self._visual_action_ticks_remaining == 0:
                 self._visual_action = None
+                self._sprite_offset = -1
 
         self._maybe_auto_sleep_or_wake()
 
         self._clamp_stats()
+        self._update_state_clamped()
+
+        self.age += 1
+        if self.happiness > self._config.bored_threshold:
+            self.happy_ticks += 1
+        if self.age >= self._age_goal or self.happy_ticks >= self._happy_goal:
+            self._evolve()
+
+    def advance(self, n_ticks: int) -> None:
+        """Fast-forward the pet by `n_ticks` ticks.
+
+        The result is identical to calling `tick()` `n_ticks` times, but
+        stretches where nothing but the stats change are jumped over in one
+        step. Only ticks where something else happens (death, auto
+        sleep/wake, a stat hitting a clamp bound) are run through `tick()`,
+        so the cost grows with the number of such events, not with
+        `n_ticks`. A pet that is left alone either dies or ends up cycling
+        through the same states; once an event finds the pet in a state it
+        was in at an earlier event, whole periods are skipped (up to the
+        next evolution, see `skip_periods`), so after that the cost no
+        longer depends on `n_ticks` at all.
+        """
+        remaining = n_ticks
+        # Remaining tick count and evolution counters at each event, keyed
+        # by the state there.
+        seen: Dict[tuple, tuple] | None = {}
+        while remaining > 0:
+            if self._state == PetState.DEAD:
+                # Every tick after death does the same thing.
+                self.tick()
+                return
+
+            jump = min(remaining, self._ticks_before_next_event())
+            if jump == 0:
+                if seen is not None:
+                    key = self.cycle_key()
+                    before = seen.get(key)
+                    if before is None:
+                        seen[key] = (remaining, self.evolution_counters())
+                    else:
+                        then, counters = before
+                        period = then - remaining
+                        periods = remaining // period
+                        skipped = self.skip_periods(counters, periods)
+                        remaining -= skipped * period
+                        # Stopped short of an evolution: look for the
+                        # cycle again once it has happened.
+                        seen = None if skipped == periods else {}
+                        continue
+                self.tick()
+                remaining -= 1
+                continue
+
+            self._apply_ticks_in_bulk(jump)
+            remaining -= jump
+
+    def cycle_key(self) -> tuple:
+        """
+        Everything the future of the pet depends on, as a hashable tuple.
+
+        Two moments with the same key (and the same caretaker actions from
+        then on) play out identically until the pet evolves. The evolution
+        counters are left out: they only ever grow, and only matter once
+        one of them reaches its goal, which `skip_periods` takes care of.
+        """
+        return (
+            self._stage,
+            self.hunger,
+            self.happiness,
+            self.energy,
+            self._state,
+            self._is_sleeping,
+            self._play_cooldown,
+            self._visual_action,
+            self._visual_action_ticks_remaining,
+        )
+
+    def evolution_counters(self) -> tuple:
+        """(food eaten, age, happy ticks)."""
+        return self.total_food_eaten, self.age, self.happy_ticks
+
+    def skip_periods(self, then: tuple, periods: int) -> int:
+        """
+        Jump over up to `periods` repeats of what happened since `then`.
+
+        `then` is `evolution_counters()` from an earlier moment with the
+        same `cycle_key()`; everything but the counters is as it was then,
+        and each period adds to the counters what the last one did. Stops
+        before a counter reaches its goal, so the pet does not miss an
+        evolution. Returns the number of periods skipped.
+        """
+        counters = self.evolution_counters()
+        goals = (self._food_goal, self._age_goal, self._happy_goal)
+        steps = [now - before for now, before in zip(counters, then)]
+        for value, step, goal in zip(counters, steps, goals):
+            if step > 0:
+                periods = min(periods, (goal - 1 - value) // step)
+        periods = max(0, periods)
+        d_food, d_age, d_happy = steps
+        self.total_food_eaten += periods * d_food
+        self.age += periods * d_age
+        self.happy_ticks += periods * d_happy
+        return periods
+
+    def ticks_until_visible_change(
+        self,
+        limit: int,
+        levels: Dict[str, Callable[[int], int]] | None = None,
+    ) -> int:
+        """Return how many ticks can pass before the pet may look different.
+
+        "Looking different" means a change of state, sleep flag or visual
+        mode, death, or a stat moving to a different drawn level. `levels`
+        maps "hunger" / "energy" / "happiness" to a function turning a stat
+        value into whatever the UI actually draws (e.g. a bar width in
+        pixels); stats without an entry count as changed whenever their
+        value changes.
+
+        Returns:
+            int: k in 1..limit such that ticks 1..k-1 change nothing
+            visible. The answer may be early (a re-check then just finds
+            nothing changed) but is never late.
+        """
+        if limit <= 1:
+            return 1
+        if self._state == PetState.DEAD:
+            # Dead pets never change again (tick only clears the visual
+            # action, and the dead sprite ignores it).
+            return limit
+        segment = self._segment()
+        if segment is None:
+            return 1
+        deltas, moving = segment
+        cfg = self._config
+        levels = levels or {}
+
+        candidates = [self._ticks_before_next_event() + 1]
+        # Counters grow by at most one per tick; evolving changes the sprite.
+        candidates.append(self._age_goal - self.age)
+        candidates.append(self._happy_goal - self.happy_ticks)
+        if self._visual_action_ticks_remaining > 0:
+            candidates.append(self._visual_action_ticks_remaining)
+
+        # Each state threshold splits a stat's range at `split`: values
+        # >= split are on one side, values below it on the other.
+        splits = (
+            ("hunger", self.hunger, cfg.hungry_threshold),
+            ("energy", self.energy, cfg.tired_threshold + 1),
+            ("happiness", self.happiness, cfg.bored_threshold + 1),
+        )
+        for (name, value, split), delta, is_moving in zip(splits, deltas, moving):
+            if not is_moving:
+                continue
+
+            if value >= split:
+                candidates.append(_first_tick_at_or_below(value, delta, split - 1))
+            else:
+                candidates.append(_first_tick_at_or_above(value, delta, split))
+
+            # Leaving the run of values that draw the same.
+            level = levels.get(name)
+            if level is None:
+                candidates.append(1)
+                continue
+            current = level(value)
+            if delta > 0:
+                top = value
+                while top < cfg.max_stat and level(top + 1) == current:
+                    top += 1
+                candidates.append(_first_tick_at_or_above(value, delta, top + 1))
+            else:
+                bottom = value
+                while bottom > cfg.min_stat and level(bottom - 1) == current:
+                    bottom -= 1
+                candidates.append(_first_tick_at_or_below(value, delta, bottom - 1))
+
+        return max(1, min(limit, min(j for j in candidates if j is not None)))
+
+    def _segment(self) -> tuple:
+        """
+        Describe the current stretch of ticks as linear stat movements.
+
+        Returns (deltas, moving) where `deltas` are this tick's per-stat
+        changes for (hunger, energy, happiness) and `moving[i]` is False
+        for a stat that sits on a clamp bound and is being pushed into it
+        (its value stays put). Returns None while any stat is outside the
+        clamp range, since clamping then jumps the value.
+        """
+        d = self._derived
+        deltas = d.sleep_deltas if self._is_sleeping else d.awake_deltas
+
+        min_s, max_s = d.min_stat, d.max_stat
+        moving = []
+        for value, delta in zip((self.hunger, self.energy, self.happiness), deltas):
+            if value < min_s or value > max_s:
+                return None
+            moving.append(
+                delta != 0
+                and not (value == max_s and delta > 0)
+                and not (value == min_s and delta < 0)
+            )
+        return deltas, moving
+
+    def _ticks_before_next_event(self) -> int:
+        """
+        Count the ticks that can be applied in bulk from here.
+
+        An event is any tick where the stats stop moving linearly or where
+        something beyond the stats changes: a clamp bound is crossed, the
+        pet dies, or it auto-sleeps / auto-wakes. The state label is just a
+        function of the stats, so threshold crossings need no special
+        handling. Returns the number of ticks strictly before the first
+        event (possibly 0), or a huge number when no event is coming.
+        """
+        segment = self._segment()
+        if segment is None:
+            return 0
+        (d_hunger, d_energy, d_happiness), (m_hunger, m_energy, m_happiness) = segment
+        cfg = self._config
+
+        # Clamped value after j ticks is `value + j * step` (step 0 when
+        # pinned); the unclamped energy is what auto sleep/wake looks at.
+        s_hunger = d_hunger if m_hunger else 0
+        s_energy = d_energy if m_energy else 0
+        s_happiness = d_happiness if m_happiness else 0
+        raw_energy = self.energy if m_energy else self.energy + d_energy
+
+        candidates = [
+            _first_tick_at_or_above(self.hunger, s_hunger, cfg.death_hunger),
+            _first_tick_at_or_below(self.energy, s_energy, cfg.death_energy),
+            _first_tick_at_or_below(self.happiness, s_happiness, cfg.death_happiness),
+        ]
+        if self._is_sleeping:
+            candidates.append(
+                _first_tick_at_or_above(raw_energy, s_energy, cfg.auto_wake_energy_threshold)
+            )
+        else:
+            candidates.append(
+                _first_tick_at_or_below(raw_energy, s_energy, cfg.auto_sleep_energy_threshold)
+            )
+        for value, step in (
+            (self.hunger, s_hunger),
+            (self.energy, s_energy),
+            (self.happiness, s_happiness),
+        ):
+            if step:
+                candidates.append(_first_tick_at_or_above(value, step, cfg.max_stat + 1))
+                candidates.append(_first_tick_at_or_below(value, step, cfg.min_stat - 1))
+
+        first_event = min((j for j in candidates if j is not None), default=None)
+        if first_event is None:
+            return _NO_EVENT
+        return first_event - 1
+
+    def _apply_ticks_in_bulk(self, n: int) -> None:
+        """
+        Apply `n` event-free ticks at once (see `_ticks_before_next_event`).
+        """
+        (d_hunger, d_energy, d_happiness), (m_hunger, m_energy, m_happiness) = self._segment()
+        self.age += n
+        self.happy_ticks += _ticks_above(
+            self.happiness, d_happiness if m_happiness else 0, self._config.bored_threshold, n
+        )
+        if m_hunger:
+            self.hunger += n * d_hunger
+        if m_energy:
+            self.energy += n * d_energy
+        if m_happiness:
+            self.happiness += n * d_happiness
+
+        self._play_cooldown = max(0, self._play_cooldown - n)
+
+        if self._visual_action_ticks_remaining > 0:
+            if n >= self._visual_action_ticks_remaining:
+                self._visual_action_ticks_remaining = 0
+                self._visual_action = None
+                self._sprite_offset = -1
+            else:
+                self._visual_action_ticks_remaining -= n
+
         self._update_state()
+        if self.age >= self._age_goal or self.happy_ticks >= self._happy_goal:
+            self._evolve()
 
     # ------------- Actions -------------
 
@@ -767,10 +519,10 @@ class Pet:
 
         eaten = max(0, before - self.hunger)
         self.total_food_eaten += eaten
+        if self.total_food_eaten >= self._food_goal:
+            self._evolve()
 
-        self._check_evolution()
-
-        self._update_state()
+        self._update_state_clamped()
         self._set_visual_action("eat")
         return True
 
@@ -787,7 +539,7 @@ class Pet:
         self._play_cooldown = self._config.play_cooldown_ticks
 
         self._clamp_stats()
-        self._update_state()
+        self._update_state_clamped()
 
         self._set_visual_action("play")
         return True
@@ -798,12 +550,14 @@ class Pet:
         self._is_sleeping = True
         self._visual_action = None
         self._visual_action_ticks_remaining = 0
+        self._sprite_offset = -1
         return True
 
     def wake(self) -> bool:
         if self._state == PetState.DEAD or not self._is_sleeping:
             return False
         self._is_sleeping = False
+        self._sprite_offset = -1
         self._update_state()
         return True
 
@@ -812,18 +566,19 @@ class Pet:
     def _set_visual_action(self, action: str) -> None:
         self._visual_action = action
         self._visual_action_ticks_remaining = self._config.action_visual_ticks
+        self._sprite_offset = -1
 
     def _apply_awake_tick(self) -> None:
-        cfg = self._config
-        self.hunger += cfg.hunger_per_tick
-        self.energy += cfg.energy_per_tick
-        self.happiness += cfg.happiness_per_tick
+        d_hunger, d_energy, d_happiness = self._derived.awake_deltas
+        self.hunger += d_hunger
+        self.energy += d_energy
+        self.happiness += d_happiness
 
     def _apply_sleep_tick(self) -> None:
-        cfg = self._config
-        self.energy += cfg.sleep_energy_gain_per_tick
-        self.hunger += cfg.sleep_hunger_increase_per_tick
-        self.happiness += cfg.sleep_happiness_change_per_tick
+        d_hunger, d_energy, d_happiness = self._derived.sleep_deltas
+        self.energy += d_energy
+        self.hunger += d_hunger
+        self.happiness += d_happiness
 
     def _maybe_auto_sleep_or_wake(self) -> None:
         if self._state == PetState.DEAD:
@@ -835,44 +590,63 @@ class Pet:
             self._is_sleeping = True
             self._visual_action = None
             self._visual_action_ticks_remaining = 0
+            self._sprite_offset = -1
 
         if self._is_sleeping and self.energy >= cfg.auto_wake_energy_threshold:
             self._is_sleeping = False
+            self._sprite_offset = -1
 
     def _clamp_stats(self) -> None:
-        min_s = self._config.min_stat
-        max_s = self._config.max_stat
+        d = self._derived
+        min_s, max_s = d.min_stat, d.max_stat
 
         self.hunger = max(min_s, min(max_s, self.hunger))
         self.happiness = max(min_s, min(max_s, self.happiness))
         self.energy = max(min_s, min(max_s, self.energy))
 
     def _update_state(self) -> None:
-        cfg = self._config
-
+        d = self._derived
+        min_s, max_s = d.min_stat, d.max_stat
         if (
-            self.hunger >= cfg.death_hunger
-            or self.energy <= cfg.death_energy
-            or self.happiness <= cfg.death_happiness
+            min_s <= self.hunger <= max_s
+            and min_s <= self.energy <= max_s
+            and min_s <= self.happiness <= max_s
         ):
-            self._state = PetState.DEAD
-            self._is_sleeping = False
-            return
-
-        if self.hunger >= cfg.hungry_threshold:
-            self._state = PetState.HUNGRY
-        elif self.energy <= cfg.tired_threshold:
-            self._state = PetState.TIRED
-        elif self.happiness <= cfg.bored_threshold:
-            self._state = PetState.BORED
+            self._update_state_clamped()
         else:
-            self._state = PetState.ALIVE
+            # Only before the first clamp, e.g. out-of-range constructor stats.
+            self._set_state(classify(self.hunger, self.energy, self.happiness, self._config))
+
+    def _update_state_clamped(self) -> None:
+        """_update_state() for stats known to be within the clamp range."""
+        d = self._derived
+        min_s = d.min_stat
+        size = d.size
+        self._set_state(
+            d.state_table[
+                ((self.hunger - min_s) * size + (self.energy - min_s)) * size
+                + (self.happiness - min_s)
+            ]
+        )
+
+    def _set_state(self, code: int) -> None:
+        if code == DEAD:
+            self._is_sleeping = False
+        state = STATES[code]
+        if state is not self._state:
+            self._state = state
+            self._sprite_offset = -1
 
     # ------------- Visual state + ASCII -------------
 
-    def _check_evolution(self) -> None:
-        if self._stage == "baby" and self.total_food_eaten >= self._config.food_to_adult:
-            self._stage = "adult"
+    def _evolve(self) -> None:
+        """Move along the stage chain as far as the counters allow and set new goals."""
+        stage, self._food_goal, self._age_goal, self._happy_goal = resolve(
+            self._species, self._stage, self.total_food_eaten, self.age, self.happy_ticks, self._config
+        )
+        if stage != self._stage:
+            self._stage = stage
+            self._sprite_offset = -1
 
 
     def _visual_mode(self) -> str:
@@ -903,17 +677,29 @@ class Pet:
 
         frame_index is used to cycle animation (UI calls with its own counter).
         """
-        species_sprites = ASCII_SPRITES.get(self.species, ASCII_SPRITES["cat"])
-        stage_key = getattr(self, "_stage", "baby")
-        stage_sprites = (
-            species_sprites.get(stage_key)
-            or species_sprites.get("baby")
-            or next(iter(species_sprites.values()))
+        offset = self._sprite_offset
+        if offset < 0:
+            offset = self._sprite_offset = self._compute_sprite_offset()
+        return SPRITE_TABLE[offset + frame_index % SPRITE_SLOT_FRAMES]
+
+    def frame_count(self) -> int:
+        """Number of animation frames for the current visual mode."""
+        offset = self._sprite_offset
+        if offset < 0:
+            offset = self._sprite_offset = self._compute_sprite_offset()
+        return SPRITE_FRAME_COUNTS[offset // SPRITE_SLOT_FRAMES]
+
+    def _compute_sprite_offset(self) -> int:
+        # Every sprite lookup computes the offset first, so this is the one
+        # place that has to make sure the sprite tables are there.
+        if "SPRITE_TABLE" not in globals():
+            _load_sprites()
+        slot = sprite_slot(
+            SPECIES.index(self._species),
+            STAGES.index(self._stage),
+            _MODE_CODES[self._visual_mode()],
         )
-        mode = self._visual_mode()
-        frames = stage_sprites.get(mode) or stage_sprites["idle"]
-        idx = frame_index % len(frames)
-        return frames[idx]
+        return slot * SPRITE_SLOT_FRAMES
 
     # ------------- Persistence -------------
 
@@ -928,6 +714,11 @@ class Pet:
             "state": self._state.value,
             "is_sleeping": self._is_sleeping,
             "total_food_eaten": self.total_food_eaten,
+            "age": self.age,
+            "happy_ticks": self.happy_ticks,
+            "play_cooldown": self._play_cooldown,
+            "visual_action": self._visual_action,
+            "visual_action_ticks": self._visual_action_ticks_remaining,
         }
 
     @classmethod
@@ -942,6 +733,14 @@ class Pet:
             config=config,
         )
         pet._is_sleeping = bool(data.get("is_sleeping", False))
+        pet._sprite_offset = -1
         pet.total_food_eaten = int(data.get("total_food_eaten", 0))
+        pet.age = int(data.get("age", 0))
+        pet.happy_ticks = int(data.get("happy_ticks", 0))
+        pet._play_cooldown = int(data.get("play_cooldown", 0))
+        action = data.get("visual_action")
+        pet._visual_action = _NAMES.get(action, action)
+        pet._visual_action_ticks_remaining = int(data.get("visual_action_ticks", 0))
         pet._update_state()
+        pet._evolve()
         return pet
@@ -0,0 +1,59 @@
+# policies.py
+"""
+Scripted caretakers for headless simulations (see sweep.py).
+
+A policy looks at the pet every `check_every` ticks and returns the
+actions (actions.py codes) it performs at that moment.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, NamedTuple
+
+from actions import FEED, PLAY, SLEEP, WAKE
+from pet import Pet, PetState
+
+
+class Policy(NamedTuple):
+    name: str
+    check_every: int                      # ticks between visits
+    decide: Callable[[Pet], List[int]]
+
+
+def _neglect(pet: Pet) -> List[int]:
+    return []
+
+
+def _feed_when_hungry(pet: Pet) -> List[int]:
+    return [FEED] if pet.state == PetState.HUNGRY else []
+
+
+def _attentive(pet: Pet) -> List[int]:
+    """Fix whatever the current state complains about."""
+    state = pet.state
+    if state == PetState.HUNGRY:
+        return [WAKE, FEED] if pet.is_sleeping else [FEED]
+    if state == PetState.TIRED and not pet.is_sleeping:
+        return [SLEEP]
+    if state == PetState.BORED:
+        return [WAKE, PLAY] if pet.is_sleeping else [PLAY]
+    return []
+
+
+def _routine(pet: Pet) -> List[int]:
+    """Feed and play on every visit, no matter what."""
+    return [WAKE, FEED, PLAY] if pet.is_sleeping else [FEED, PLAY]
+
+
+POLICIES: Dict[str, Policy] = {
+    policy.name: policy
+    for policy in (
+        Policy("neglect", 3600, _neglect),
+        Policy("feeder", 5, _feed_when_hungry),
+        Policy("attentive", 5, _attentive),
+        Policy("busy", 30, _attentive),
+        Policy("routine", 15, _routine),
+    )
+}
@@ -0,0 +1,252 @@
+# population.py
+"""
+Columnar pet population: many pets ticked in one call.
+
+A PetPopulation keeps every pet's simulation state in flat typed columns
+(one `array.array` per field) that share a single PetConfig. One call to
+`tick()` advances the whole population with exactly the semantics of
+`Pet.tick()`, without creating or calling into per-pet Python objects.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, List
+
+from config import PetConfig, derived
+from evolution import resolve
+from pet import SPECIES, STAGES, STATE_CODES, STATES, Pet
+from state_machine import DEAD
+
+# Integer codes stored in the columns (states use the state_machine codes).
+VISUAL_ACTIONS: tuple[str | None, ...] = (None, "eat", "play")
+
+
+class PetPopulation:
+    """
+    Many pets stored as columns, all driven by one shared PetConfig.
+    """
+
+    def __init__(self, config: PetConfig | None = None) -> None:
+        self.config = config or PetConfig()
+
+        self.names: List[str] = []
+        self.species = array("b")
+        self.stage = array("b")
+        self.hunger = array("i")
+        self.happiness = array("i")
+        self.energy = array("i")
+        self.total_food_eaten = array("q")
+        self.age = array("q")
+        self.happy_ticks = array("q")
+        self.state = array("b")
+        self.is_sleeping = array("b")
+        self.play_cooldown = array("i")
+        self.visual_action = array("b")
+        self.visual_action_ticks = array("i")
+        # Evolution goals per pet (see evolution.py).
+        self.food_goal = array("q")
+        self.age_goal = array("q")
+        self.happy_goal = array("q")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ------------- Conversion -------------
+
+    @classmethod
+    def from_pets(cls, pets: Iterable[Pet], config: PetConfig | None = None) -> "PetPopulation":
+        """
+        Build a population from Pet objects.
+
+        The population uses `config` for every pet. Without one, the pets
+        must all share a config (ValueError otherwise) and that one is used.
+        """
+        pets = list(pets)
+        if config is None and pets:
+            config = pets[0]._config
+            if any(pet._config != config for pet in pets):
+                raise ValueError("pets have different configs; pass the config to use for all of them")
+        population = cls(config)
+        for pet in pets:
+            population.append(pet)
+        return population
+
+    def append(self, pet: Pet) -> int:
+        """Add a copy of `pet`'s state and return its index."""
+        self.names.append(pet.name)
+        self.species.append(SPECIES.index(pet.species))
+        self.stage.append(STAGES.index(pet._stage))
+        self.hunger.append(pet.hunger)
+        self.happiness.append(pet.happiness)
+        self.energy.append(pet.energy)
+        self.total_food_eaten.append(pet.total_food_eaten)
+        self.age.append(pet.age)
+        self.happy_ticks.append(pet.happy_ticks)
+        self.state.append(STATE_CODES[pet._state])
+        self.is_sleeping.append(pet._is_sleeping)
+        self.play_cooldown.append(pet._play_cooldown)
+        self.visual_action.append(VISUAL_ACTIONS.index(pet._visual_action))
+        self.visual_action_ticks.append(pet._visual_action_ticks_remaining)
+        self.food_goal.append(pet._food_goal)
+        self.age_goal.append(pet._age_goal)
+        self.happy_goal.append(pet._happy_goal)
+        return len(self.names) - 1
+
+    def put(self, index: int, pet: Pet) -> None:
+        """Overwrite pet `index` with `pet`'s state (the name is kept)."""
+        self.species[index] = SPECIES.index(pet.species)
+        self.stage[index] = STAGES.index(pet._stage)
+        self.hunger[index] = pet.hunger
+        self.happiness[index] = pet.happiness
+        self.energy[index] = pet.energy
+        self.total_food_eaten[index] = pet.total_food_eaten
+        self.age[index] = pet.age
+        self.happy_ticks[index] = pet.happy_ticks
+        self.state[index] = STATE_CODES[pet._state]
+        self.is_sleeping[index] = pet._is_sleeping
+        self.play_cooldown[index] = pet._play_cooldown
+        self.visual_action[index] = VISUAL_ACTIONS.index(pet._visual_action)
+        self.visual_action_ticks[index] = pet._visual_action_ticks_remaining
+        self.food_goal[index] = pet._food_goal
+        self.age_goal[index] = pet._age_goal
+        self.happy_goal[index] = pet._happy_goal
+
+    def pet_at(self, index: int) -> Pet:
+        """Return a standalone Pet with the state of pet `index`."""
+        pet = Pet(
+            name=self.names[index],
+            species=SPECIES[self.species[index]],
+            stage=STAGES[self.stage[index]],
+            hunger=self.hunger[index],
+            happiness=self.happiness[index],
+            energy=self.energy[index],
+            config=self.config,
+        )
+        pet.total_food_eaten = self.total_food_eaten[index]
+        pet.age = self.age[index]
+        pet.happy_ticks = self.happy_ticks[index]
+        pet._food_goal = self.food_goal[index]
+        pet._age_goal = self.age_goal[index]
+        pet._happy_goal = self.happy_goal[index]
+        pet._state = STATES[self.state[index]]
+        pet._is_sleeping = bool(self.is_sleeping[index])
+        pet._play_cooldown = self.play_cooldown[index]
+        pet._visual_action = VISUAL_ACTIONS[self.visual_action[index]]
+        pet._visual_action_ticks_remaining = self.visual_action_ticks[index]
+        pet._sprite_offset = -1
+        return pet
+
+    def to_pets(self) -> List[Pet]:
+        return [self.pet_at(i) for i in range(len(self))]
+
+    # ------------- Core loop -------------
+
+    def tick(self) -> None:
+        """Advance every pet by one tick (same rules as `Pet.tick()`)."""
+        tick_columns(self, self.config, 0, len(self))
+
+
+def tick_columns(cols, cfg: PetConfig, start: int, stop: int) -> None:
+    """
+    Tick pets `start`..`stop - 1` of a column store in place.
+
+    `cols` is anything with the PetPopulation column attributes; the
+    columns only need integer indexing, so arrays and memoryviews both
+    work. This is the whole of Pet.tick() (awake/sleep deltas, cooldown
+    and visual decay, auto sleep/wake, clamping and the state update via
+    the shared state table) fused into one loop with everything hoisted
+    into locals. Each counter is compared with its goal column once; the
+    pets that reached a goal are evolved after the loop.
+    """
+    hunger = cols.hunger
+    happiness = cols.happiness
+    energy = cols.energy
+    state = cols.state
+    sleeping = cols.is_sleeping
+    cooldown = cols.play_cooldown
+    vaction = cols.visual_action
+    vticks = cols.visual_action_ticks
+    age = cols.age
+    happy = cols.happy_ticks
+    age_goal = cols.age_goal
+    happy_goal = cols.happy_goal
+    evolving = []
+
+    d = derived(cfg)
+    awake_h, awake_e, awake_p = d.awake_deltas
+    sleep_h, sleep_e, sleep_p = d.sleep_deltas
+    auto_sleep = cfg.auto_sleep_energy_threshold
+    auto_wake = cfg.auto_wake_energy_threshold
+    lo, hi, size = d.min_stat, d.max_stat, d.size
+    table = d.state_table
+    bored = cfg.bored_threshold
+
+    for i in range(start, stop):
+        if state[i] == DEAD:
+            vaction[i] = 0
+            vticks[i] = 0
+            continue
+
+        s = sleeping[i]
+        if s:
+            e = energy[i] + sleep_e
+            h = hunger[i] + sleep_h
+            p = happiness[i] + sleep_p
+        else:
+            h = hunger[i] + awake_h
+            e = energy[i] + awake_e
+            p = happiness[i] + awake_p
+
+        if cooldown[i] > 0:
+            cooldown[i] -= 1
+
+        vt = vticks[i]
+        if vt > 0:
+            vticks[i] = vt - 1
+            if vt == 1:
+                vaction[i] = 0
+
+        if not s and e <= auto_sleep:
+            s = 1
+            vaction[i] = 0
+            vticks[i] = 0
+        if s and e >= auto_wake:
+            s = 0
+
+        h = lo if h < lo else hi if h > hi else h
+        p = lo if p < lo else hi if p > hi else p
+        e = lo if e < lo else hi if e > hi else e
+        hunger[i] = h
+        happiness[i] = p
+        energy[i] = e
+
+        code = table[((h - lo) * size + (e - lo)) * size + (p - lo)]
+        state[i] = code
+        if code == DEAD:
+            s = 0
+        sleeping[i] = s
+
+        a = age[i] + 1
+        age[i] = a
+        if p > bored:
+            happy[i] += 1
+            if happy[i] >= happy_goal[i]:
+                evolving.append(i)
+                continue
+        if a >= age_goal[i]:
+            evolving.append(i)
+
+    for i in evolving:
+        evolve_row(cols, cfg, i)
+
+
+def evolve_row(cols, cfg: PetConfig, i: int) -> None:
+    """Pet._evolve() for pet `i` of a column store."""
+    stage, cols.food_goal[i], cols.age_goal[i], cols.happy_goal[i] = resolve(
+        SPECIES[cols.species[i]], STAGES[cols.stage[i]],
+        cols.total_food_eaten[i], cols.age[i], cols.happy_ticks[i], cfg,
+    )
+    cols.stage[i] = STAGES.index(stage)
@@ -0,0 +1,226 @@
+# replay.py
+"""
+Session recording and deterministic replay.
+
+A `SessionRecorder` drives a pet and logs every action with the tick it
+happened at and what it returned. Ticks themselves are not stored, only
+counted, so the log grows with the number of actions and not with the
+length of the session. `Replayer` rebuilds the pet at any tick: it starts
+from the nearest checkpoint and `Pet.advance()`s over action-free
+stretches. Each replayed action is checked against its recorded result.
+
+Usage (logs are written by `python main.py --record FILE`):
+
+    python replay.py session.tlog --at 86400
+
+File format (little-endian):
+
+    header   magic b"TLOG", version u16, JSON length u32
+    JSON     {"pet": initial Pet.to_dict(), "config": PetConfig fields,
+              "ticks": session length, "actions": action count}
+    actions  per action: varint ticks since the previous action, then one
+             byte (action code | returned-True flag << 2)
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, List, Tuple
+
+from actions import ACTION_NAMES, apply_action
+from config import PetConfig
+from pet import Pet
+
+LOG_MAGIC = b"TLOG"
+LOG_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_RESULT_FLAG = 1 << 2
+
+DEFAULT_CHECKPOINT_EVERY = 3600   # ticks (one hour of game time)
+
+
+class ReplayDivergence(Exception):
+    """A replayed action returned something other than what was recorded."""
+
+
+class ActionLog:
+    """The initial pet, its config, and every action keyed by tick."""
+
+    def __init__(self, initial: Dict[str, Any], config: PetConfig) -> None:
+        self.initial = initial
+        self.config = config
+        self.ticks = array("q")      # tick of each action
+        self.actions = bytearray()   # code | (result << 2) of each action
+        self.length = 0              # ticks in the session
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def append(self, action: int, result: bool) -> None:
+        self.ticks.append(self.length)
+        self.actions.append(action | (_RESULT_FLAG if result else 0))
+
+    # ------------- File format -------------
+
+    def to_bytes(self) -> bytes:
+        meta = json.dumps({
+            "pet": self.initial,
+            "config": dataclasses.asdict(self.config),
+            "ticks": self.length,
+            "actions": len(self.actions),
+        }).encode()
+        out = bytearray(_HEADER.pack(LOG_MAGIC, LOG_VERSION, len(meta)))
+        out += meta
+        previous = 0
+        for tick, action in zip(self.ticks, self.actions):
+            gap = tick - previous
+            previous = tick
+            while gap >= 0x80:
+                out.append(gap & 0x7F | 0x80)
+                gap >>= 7
+            out.append(gap)
+            out.append(action)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ActionLog":
+        if len(data) < _HEADER.size:
+            raise ValueError("not an action log (file too short)")
+        magic, version, meta_len = _HEADER.unpack_from(data)
+        if magic != LOG_MAGIC:
+            raise ValueError("not an action log (bad magic)")
+        if version != LOG_VERSION:
+            raise ValueError(f"unsupported action log version {version}")
+        meta = json.loads(data[_HEADER.size:_HEADER.size + meta_len])
+        log = cls(meta["pet"], PetConfig(**meta["config"]))
+        log.length = meta["ticks"]
+
+        pos = _HEADER.size + meta_len
+        tick = 0
+        try:
+            for _ in range(meta["actions"]):
+                gap = shift = 0
+                while True:
+                    byte = data[pos]
+                    pos += 1
+                    gap |= (byte & 0x7F) << shift
+                    shift += 7
+                    if byte < 0x80:
+                        break
+                tick += gap
+                log.ticks.append(tick)
+                log.actions.append(data[pos])
+                pos += 1
+        except IndexError:
+            raise ValueError("action log is truncated") from None
+        return log
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "ActionLog":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class SessionRecorder:
+    """
+    Drives a pet and records the session into `log`.
+
+    Use `tick()` / `act()` instead of calling the Pet directly.
+    """
+
+    def __init__(self, pet: Pet) -> None:
+        self.pet = pet
+        self.log = ActionLog(pet.to_dict(), pet._config)
+
+    def tick(self, n_ticks: int = 1) -> None:
+        self.pet.advance(n_ticks)
+        self.log.length += n_ticks
+
+    def act(self, action: int) -> bool:
+        """Run action `action` (an actions.py code) and record it."""
+        result = apply_action(self.pet, action)
+        self.log.append(action, result)
+        return result
+
+
+class Replayer:
+    """
+    Rebuilds the recorded pet at any tick of an ActionLog.
+
+    Checkpoints (the pet before the actions of every `checkpoint_every`-th
+    tick) are taken the first time replay passes them, so seeking backwards
+    or repeatedly only replays from the nearest one.
+    """
+
+    def __init__(self, log: ActionLog, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY) -> None:
+        self.log = log
+        self.checkpoint_every = checkpoint_every
+        self._checkpoint_ticks: List[int] = [0]
+        self._checkpoints: List[Tuple[int, Dict[str, Any]]] = [(0, log.initial)]
+
+    def state_at(self, tick: int) -> Pet:
+        """The pet after `tick` ticks and the actions made at that tick."""
+        if not 0 <= tick <= self.log.length:
+            raise ValueError(f"tick {tick} is outside the session (0..{self.log.length})")
+        i = bisect_right(self._checkpoint_ticks, tick) - 1
+        index, snapshot = self._checkpoints[i]
+        pet = Pet.from_dict(snapshot, self.log.config)
+        self._run(pet, self._checkpoint_ticks[i], index, tick)
+        return pet
+
+    def final_state(self) -> Pet:
+        return self.state_at(self.log.length)
+
+    def _run(self, pet: Pet, now: int, index: int, target: int) -> None:
+        ticks, actions = self.log.ticks, self.log.actions
+        count = len(actions)
+        while True:
+            while index < count and ticks[index] == now:
+                action = actions[index] & 3
+                recorded = bool(actions[index] & _RESULT_FLAG)
+                if apply_action(pet, action) != recorded:
+                    raise ReplayDivergence(
+                        f"{ACTION_NAMES[action]} at tick {now} returned {not recorded}, "
+                        f"recorded {recorded}"
+                    )
+                index += 1
+            if now >= target:
+                return
+
+            stop = ticks[index] if index < count and ticks[index] < target else target
+            checkpoint = self._checkpoint_ticks[-1] + self.checkpoint_every
+            if now < checkpoint <= stop:
+                pet.advance(checkpoint - now)
+                now = checkpoint
+                self._checkpoint_ticks.append(now)
+                self._checkpoints.append((index, pet.to_dict()))
+                continue
+            pet.advance(stop - now)
+            now = stop
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Show a recorded pet at any tick.")
+    parser.add_argument("log", help="action log written by main.py --record")
+    parser.add_argument("--at", type=int, help="tick to show (default: end of the session)")
+    args = parser.parse_args(argv)
+
+    log = ActionLog.load(args.log)
+    tick = log.length if args.at is None else args.at
+    print(f"{log.length} ticks, {len(log)} actions")
+    print(json.dumps(Replayer(log).state_at(tick).to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
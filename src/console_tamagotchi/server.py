@@ -0,0 +1,207 @@
+# server.py
+"""
+Multi-pet simulation server (asyncio, newline-delimited JSON).
+
+One process hosts many pets. A single timer task ticks them all, a batch
+at a time, and clients send commands over a localhost TCP or Unix socket:
+
+    {"id": 1, "op": "feed", "pet": "pet-42"}
+    {"id": 1, "ok": true, "result": true}
+
+`op` is one of feed, play, sleep, wake (result: what the Pet method
+returned) or get (result: the pet's to_dict()). Requests that arrive
+within `window` seconds of each other are applied together and each
+connection gets all its responses in one write.
+
+Usage:
+
+    python server.py --pets 5000 --port 7878
+    python server.py --pets 5000 --unix /tmp/tamagotchi.sock
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List, Tuple
+
+from actions import ACTION_CODES, apply_action
+from clock import FixedStepClock
+from pet import Pet
+
+TICK_INTERVAL = 1.0           # logic tick: 1s
+MAX_CATCH_UP_TICKS = 600      # ticks applied per timer wake-up when behind
+TICK_BATCH = 1000             # pets ticked between yields to the event loop
+COALESCE_WINDOW = 0.002       # seconds requests wait for others to join them
+DEFAULT_PORT = 7878
+
+
+def pet_name(index: int) -> str:
+    return f"pet-{index}"
+
+
+class PetServer:
+    """
+    Pets by name plus the tick loop and request batching around them.
+
+    Each pet remembers how many clock ticks it has seen. The tick loop
+    brings every pet up to date in batches; a command first brings its
+    own pet up to date, so it always acts at the current game time even
+    while a tick pass is still working through the other pets.
+    """
+
+    def __init__(
+        self,
+        pets: Dict[str, Pet],
+        tick_interval: float = TICK_INTERVAL,
+        window: float = COALESCE_WINDOW,
+        batch_size: int = TICK_BATCH,
+    ) -> None:
+        self.pets = pets
+        self.window = window
+        self.batch_size = batch_size
+        self.clock = FixedStepClock(tick_interval, MAX_CATCH_UP_TICKS)
+        self._ticks_seen = dict.fromkeys(pets, 0)
+
+        self._pending: List[Tuple[asyncio.StreamWriter, object, object, object]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+        self.requests_handled = 0
+        self.batches_flushed = 0
+
+    # ------------- Ticking -------------
+
+    def _sync(self, name: str) -> Pet:
+        pet = self.pets[name]
+        behind = self.clock.ticks - self._ticks_seen[name]
+        if behind:
+            pet.advance(behind)
+            self._ticks_seen[name] = self.clock.ticks
+        return pet
+
+    async def tick_loop(self) -> None:
+        clock = self.clock
+        sync = self._sync
+        synced = clock.ticks
+        while True:
+            await asyncio.sleep(max(0.0, clock.time_of(1) - time.monotonic()))
+            # Requests take ticks from the clock too, so compare against
+            # the last full pass rather than trusting take()'s result.
+            clock.take()
+            if clock.ticks == synced:
+                continue
+            synced = clock.ticks
+            names = list(self.pets)
+            for start in range(0, len(names), self.batch_size):
+                for name in names[start:start + self.batch_size]:
+                    sync(name)
+                await asyncio.sleep(0)
+
+    # ------------- Requests -------------
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                # Stop reading from a client that does not read its replies.
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    self._pending.append((writer, request.get("id"), request.get("op"), request.get("pet")))
+                except (ValueError, AttributeError):
+                    self._pending.append((writer, None, None, None))
+                if self._flush_handle is None:
+                    self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        except (ConnectionError, ValueError):
+            # ValueError: a line longer than the stream limit.
+            pass
+        finally:
+            writer.close()
+
+    def _flush(self) -> None:
+        """Apply every pending request and answer each connection once."""
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        self.clock.take()
+
+        replies: Dict[asyncio.StreamWriter, List[str]] = {}
+        for writer, request_id, op, name in pending:
+            try:
+                reply = json.dumps(self._execute(request_id, op, name))
+            except Exception as exc:
+                # One bad request must not lose the replies of the rest.
+                reply = json.dumps({"id": request_id, "ok": False, "error": f"internal error: {exc!r}"},
+                                   default=repr)
+            replies.setdefault(writer, []).append(reply)
+        for writer, lines in replies.items():
+            if not writer.is_closing():
+                lines.append("")
+                writer.write("\n".join(lines).encode())
+
+        self.requests_handled += len(pending)
+        self.batches_flushed += 1
+
+    def _execute(self, request_id, op, name) -> dict:
+        if not isinstance(op, str):
+            return {"id": request_id, "ok": False, "error": "bad request"}
+        if not isinstance(name, str) or name not in self.pets:
+            return {"id": request_id, "ok": False, "error": f"unknown pet {name!r}"}
+        pet = self._sync(name)
+        if op == "get":
+            return {"id": request_id, "ok": True, "result": pet.to_dict()}
+        if op in ACTION_CODES:
+            return {"id": request_id, "ok": True, "result": apply_action(pet, ACTION_CODES[op])}
+        return {"id": request_id, "ok": False, "error": f"unknown op {op!r}"}
+
+
+async def serve(
+    server: PetServer,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix_path: str | None = None,
+    started: asyncio.Future | None = None,
+) -> None:
+    """Run `server` until cancelled; `started` gets the listening sockets."""
+    if unix_path is not None:
+        listener = await asyncio.start_unix_server(server.handle_client, unix_path)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+    ticker = asyncio.create_task(server.tick_loop())
+    if started is not None:
+        started.set_result(listener.sockets)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        ticker.cancel()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Host many pets behind a JSON-lines socket.")
+    parser.add_argument("--pets", type=int, default=1000, help="number of pets, named pet-0, pet-1, ...")
+    parser.add_argument("--species", default="cat")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL, help="seconds per tick")
+    parser.add_argument("--window", type=float, default=COALESCE_WINDOW, help="request batching window in seconds")
+    args = parser.parse_args(argv)
+
+    pets = {pet_name(i): Pet(name=pet_name(i), species=args.species) for i in range(args.pets)}
+    server = PetServer(pets, tick_interval=args.tick, window=args.window)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {len(pets)} pets on {where}")
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
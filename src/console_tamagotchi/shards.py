@@ -0,0 +1,176 @@
+# shards.py
+"""
+Multi-core population ticking over shared memory.
+
+A ShardedPopulation copies a PetPopulation's columns into one
+`multiprocessing.shared_memory` block and starts one worker process per
+shard (a contiguous range of pets). Every `tick(n)` is one barrier round:
+the coordinator releases the workers, each runs `tick_columns()` on its
+own range directly in shared memory, and the round ends when all of them
+reach the barrier again. The coordinator reads any pet's stats straight
+from the shared columns, with no copies or pickling, and the results are
+exactly those of `Pet.tick()`.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from config import PetConfig
+from population import PetPopulation, tick_columns
+
+# The PetPopulation columns kept in shared memory, with their typecodes.
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("species", "b"),
+    ("stage", "b"),
+    ("hunger", "i"),
+    ("happiness", "i"),
+    ("energy", "i"),
+    ("total_food_eaten", "q"),
+    ("state", "b"),
+    ("is_sleeping", "b"),
+    ("play_cooldown", "i"),
+    ("visual_action", "b"),
+    ("visual_action_ticks", "i"),
+    ("age", "q"),
+    ("happy_ticks", "q"),
+    ("food_goal", "q"),
+    ("age_goal", "q"),
+    ("happy_goal", "q"),
+)
+_ITEM_SIZES = {"b": 1, "i": 4, "q": 8}
+
+# The block starts with one int64 control word: the number of ticks for
+# the current round, or -1 to tell the workers to exit.
+_CONTROL_BYTES = 8
+_STOP = -1
+
+
+def _layout(size: int) -> Tuple[List[Tuple[str, str, int]], int]:
+    """(name, typecode, offset) of each column and the total block size."""
+    columns = []
+    offset = _CONTROL_BYTES
+    for name, code in COLUMNS:
+        columns.append((name, code, offset))
+        offset += -(-size * _ITEM_SIZES[code] // 8) * 8  # keep 8-byte alignment
+    return columns, offset
+
+
+def _attach(target, buf: memoryview, size: int) -> List[memoryview]:
+    """Set the column views on `target`; returns every view for release."""
+    views = [buf[:_CONTROL_BYTES].cast("q")]
+    target.control = views[0]
+    for name, code, offset in _layout(size)[0]:
+        view = buf[offset:offset + size * _ITEM_SIZES[code]].cast(code)
+        setattr(target, name, view)
+        views.append(view)
+    return views
+
+
+def _worker(shm_name: str, size: int, config: PetConfig, start: int, stop: int, barrier) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    cols = SimpleNamespace()
+    views = _attach(cols, shm.buf, size)
+    control = cols.control
+    try:
+        while True:
+            barrier.wait()
+            n_ticks = control[0]
+            if n_ticks == _STOP:
+                break
+            try:
+                for _ in range(n_ticks):
+                    tick_columns(cols, config, start, stop)
+            except BaseException:
+                # Fail the coordinator's wait instead of leaving it hanging.
+                barrier.abort()
+                raise
+            barrier.wait()
+    finally:
+        for view in views:
+            view.release()
+        shm.close()
+
+
+class ShardedPopulation:
+    """
+    A population ticked by worker processes over shared-memory columns.
+
+    Column attributes (`hunger`, `energy`, ...) are memoryviews into the
+    shared block, indexed like the PetPopulation arrays. Read them between
+    `tick()` calls; call `close()` (or use `with`) to stop the workers and
+    free the block.
+    """
+
+    def __init__(self, population: PetPopulation, workers: int | None = None) -> None:
+        self.config = population.config
+        self.names = list(population.names)
+        size = len(population)
+        workers = max(1, min(workers or os.cpu_count() or 1, size or 1))
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_layout(size)[1])
+        self._views = _attach(self, self._shm.buf, size)
+        for name, _ in COLUMNS:
+            getattr(self, name)[:] = getattr(population, name)
+
+        ctx = multiprocessing.get_context()
+        self._barrier = ctx.Barrier(workers + 1)
+        self.shards = [(size * i // workers, size * (i + 1) // workers) for i in range(workers)]
+        self._workers = [
+            ctx.Process(
+                target=_worker,
+                args=(self._shm.name, size, self.config, start, stop, self._barrier),
+                daemon=True,
+            )
+            for start, stop in self.shards
+        ]
+        for process in self._workers:
+            process.start()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def tick(self, n_ticks: int = 1) -> None:
+        """Advance every pet by `n_ticks` ticks (one barrier round)."""
+        if n_ticks <= 0:
+            return
+        self.control[0] = n_ticks
+        self._barrier.wait()   # start the round
+        self._barrier.wait()   # every shard is done
+
+    def to_population(self) -> PetPopulation:
+        """Copy the current state out into a regular PetPopulation."""
+        population = PetPopulation(self.config)
+        population.names = list(self.names)
+        for name, _ in COLUMNS:
+            getattr(population, name).frombytes(getattr(self, name).tobytes())
+        return population
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        if not self._barrier.broken:
+            self.control[0] = _STOP
+            self._barrier.wait()
+        for process in self._workers:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "ShardedPopulation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,337 @@
+# solver.py
+"""
+Optimal caretaker policies over the whole pet state space.
+
+Between ticks a caretaker may do one action (or nothing), then the tick
+happens. The dynamics are deterministic and only depend on hunger,
+energy, happiness, the sleep flag and the play cooldown; the visual
+action timer and evolution stage only change the sprite. That space is
+finite, so `solve()` finds the best action for every state of it with
+policy iteration: policies are evaluated exactly by pointer doubling
+(2**k ticks ahead in k passes) and improved greedily until stable. Every
+pass is a whole-table gather over flat arrays, the stdlib stand-in for
+vectorized array code.
+
+The result is a `PolicyTable`: one byte (the action to take) per state,
+saved zlib-compressed. Picking an action for a pet is one index into it.
+
+Usage:
+
+    python solver.py --objective survival -o autopilot.tpol
+    python main.py --autopilot autopilot.tpol
+
+Solving the default config (about 4 million states) takes minutes and
+about 350 MB (see `solve()`); the lookups afterwards are O(1).
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import math
+import struct
+import zlib
+from array import array
+from itertools import repeat
+from operator import add, itemgetter, mul
+from typing import List, Sequence
+
+from actions import FEED, PLAY, SLEEP, WAKE
+from config import PetConfig
+from pet import Pet
+from state_machine import DEAD, state_table
+
+IDLE = 4                        # "do nothing", next to the actions.py codes
+CHOICES = (IDLE, FEED, PLAY, SLEEP, WAKE)
+OBJECTIVES = ("survival", "happiness")
+
+POLICY_MAGIC = b"TPOL"
+POLICY_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+
+
+def cooldown_levels(config: PetConfig) -> int:
+    """Distinct play cooldowns seen between ticks: 0 .. play_cooldown_ticks - 1."""
+    return max(1, config.play_cooldown_ticks)
+
+
+def state_count(config: PetConfig) -> int:
+    size = config.max_stat - config.min_stat + 1
+    return size ** 3 * 2 * cooldown_levels(config)
+
+
+def state_index(hunger: int, energy: int, happiness: int, sleeping: bool, cooldown: int, config: PetConfig) -> int:
+    lo = config.min_stat
+    size = config.max_stat - lo + 1
+    levels = cooldown_levels(config)
+    return (
+        ((((hunger - lo) * size + (energy - lo)) * size + (happiness - lo)) * 2 + bool(sleeping)) * levels
+        + min(cooldown, levels - 1)
+    )
+
+
+# ------------- Dynamics -------------
+
+def _transitions(config: PetConfig) -> List[array]:
+    """
+    next[choice][s]: the state after taking `choice` in state s and ticking.
+
+    Index `state_count(config)` is a single absorbing "dead" state. Actions
+    that do nothing in a state (e.g. feeding a sleeping pet) share the
+    idle transition.
+    """
+    cfg = config
+    lo, hi = cfg.min_stat, cfg.max_stat
+    size = hi - lo + 1
+    levels = cooldown_levels(cfg)
+    sink = state_count(cfg)
+    table = state_table(cfg)
+
+    def tick(h: int, e: int, p: int, s: int, c: int) -> int:
+        if table[((h - lo) * size + (e - lo)) * size + (p - lo)] == DEAD:
+            return sink     # e.g. play drained the last of the energy
+        if s:
+            h += cfg.sleep_hunger_increase_per_tick
+            e += cfg.sleep_energy_gain_per_tick
+            p += cfg.sleep_happiness_change_per_tick
+        else:
+            h += cfg.hunger_per_tick
+            e += cfg.energy_per_tick
+            p += cfg.happiness_per_tick
+        if c > 0:
+            c -= 1
+        if not s and e <= cfg.auto_sleep_energy_threshold:
+            s = 1
+        if s and e >= cfg.auto_wake_energy_threshold:
+            s = 0
+        h = lo if h < lo else hi if h > hi else h
+        e = lo if e < lo else hi if e > hi else e
+        p = lo if p < lo else hi if p > hi else p
+        if table[((h - lo) * size + (e - lo)) * size + (p - lo)] == DEAD:
+            return sink
+        return (((((h - lo) * size + (e - lo)) * size + (p - lo)) * 2 + s) * levels + min(c, levels - 1))
+
+    idle, feed, play, sleep, wake = (array("i") for _ in CHOICES)
+    for h in range(lo, hi + 1):
+        for e in range(lo, hi + 1):
+            for p in range(lo, hi + 1):
+                dead = table[((h - lo) * size + (e - lo)) * size + (p - lo)] == DEAD
+                for s in (0, 1):
+                    for c in range(levels):
+                        if dead:
+                            # Actions on a dead pet do nothing.
+                            for column in (idle, feed, play, sleep, wake):
+                                column.append(sink)
+                            continue
+                        rest = tick(h, e, p, s, c)
+                        idle.append(rest)
+                        if s:
+                            feed.append(rest)
+                            play.append(rest)
+                            sleep.append(rest)
+                            wake.append(tick(h, e, p, 0, c))
+                            continue
+                        wake.append(rest)
+                        sleep.append(tick(h, e, p, 1, c))
+                        if h <= 0:
+                            feed.append(rest)
+                        else:
+                            feed.append(tick(max(lo, h - cfg.feed_amount), e, p, 0, c))
+                        if e <= cfg.play_energy_cost or c > 0:
+                            play.append(rest)
+                        else:
+                            play.append(tick(
+                                h,
+                                max(lo, min(hi, e - cfg.play_energy_cost)),
+                                max(lo, min(hi, p + cfg.play_happiness_gain)),
+                                0,
+                                cfg.play_cooldown_ticks,
+                            ))
+    for column in (idle, feed, play, sleep, wake):
+        column.append(sink)
+    return [idle, feed, play, sleep, wake]
+
+
+def _rewards(config: PetConfig, objective: str) -> array:
+    """Reward for arriving in each state (the dead sink earns nothing)."""
+    lo = config.min_stat
+    size = config.max_stat - lo + 1
+    per_happiness = 2 * cooldown_levels(config)
+    if objective == "survival":
+        rewards = array("d", [1.0]) * state_count(config)
+    elif objective == "happiness":
+        # Happiness is the fastest-varying stat index after sleep/cooldown.
+        row = array("d")
+        for p in range(size):
+            row.extend([p / (size - 1) if size > 1 else 1.0] * per_happiness)
+        rewards = row * (size * size)
+    else:
+        raise ValueError(f"unknown objective {objective!r} (expected one of {OBJECTIVES})")
+    rewards.append(0.0)
+    return rewards
+
+
+# ------------- Policy iteration -------------
+
+# States gathered per itemgetter call: large enough to amortize the call,
+# small enough that the tuple of boxed values in between stays small.
+_CHUNK = 1 << 16
+
+
+def _gather(values: array, index: Sequence[int]) -> array:
+    """array of values[i] for each i in `index` (same typecode as `values`)."""
+    out = array(values.typecode)
+    for start in range(0, len(index), _CHUNK):
+        chunk = index[start:start + _CHUNK]
+        if len(chunk) == 1:
+            out.append(values[chunk[0]])
+        else:
+            out.extend(itemgetter(*chunk)(values))
+    return out
+
+
+def _evaluate(step: array, rewards: array, gamma: float) -> array:
+    """Discounted return of following `step` from every state, by doubling."""
+    value = _gather(rewards, step)      # one tick ahead
+    discount = gamma
+    # After k rounds `value` covers 2**k ticks; stop once the tail is negligible.
+    rounds = math.ceil(math.log2(max(2.0, math.log(1e-6) / math.log(gamma))))
+    for _ in range(rounds):
+        ahead = _gather(value, step)
+        value = array("d", map(add, value, map(mul, repeat(discount), ahead)))
+        del ahead
+        step = _gather(step, step)
+        discount *= discount
+    return value
+
+
+def solve(config: PetConfig, objective: str = "survival", gamma: float = 0.99, max_rounds: int = 50) -> "PolicyTable":
+    """
+    Compute the best action for every state of `config`'s state space.
+
+    Memory is a handful of flat arrays over the state_count(config)
+    states: the five transition columns (4 bytes per state each) are kept
+    for the whole solve, plus rewards, values and best-so-far (8 bytes
+    each) and the policy, about 90 bytes per state at the peak. Gathers go
+    from array to array in chunks of _CHUNK states, so no per-state Python
+    objects are kept in between.
+    """
+    rewards = _rewards(config, objective)
+    nexts = _transitions(config)
+    n = len(rewards)
+    policy = bytearray([IDLE]) * n
+    step = nexts[0]
+
+    for _ in range(max_rounds):
+        value = _evaluate(step, rewards, gamma)
+        arrive = array("d", map(add, rewards, map(mul, repeat(gamma), value)))
+        del value
+
+        # Keep the current action unless another one is clearly better, so
+        # ties cannot make the iteration cycle.
+        best = _gather(arrive, step)
+        new_policy = policy
+        for choice, next_states in zip(CHOICES, nexts):
+            q = _gather(arrive, next_states)
+            new_policy = bytearray(
+                choice if qa > b + 1e-9 else old for qa, b, old in zip(q, best, new_policy)
+            )
+            best = array("d", map(max, q, best))
+            del q
+        del arrive, best
+        if new_policy == policy:
+            break
+        policy = new_policy
+        step = array("i", map(_pick, policy, *nexts))
+
+    return PolicyTable(config, objective, bytes(policy[:-1]))
+
+
+def _pick(choice: int, *next_states: int) -> int:
+    return next_states[CHOICES.index(choice)]
+
+
+# ------------- Policy tables -------------
+
+class PolicyTable:
+    """The chosen action (actions.py code, or IDLE) for every state."""
+
+    def __init__(self, config: PetConfig, objective: str, table: bytes) -> None:
+        if len(table) != state_count(config):
+            raise ValueError("policy table does not match the config's state space")
+        self.config = config
+        self.objective = objective
+        self.table = table
+
+    def action_for(self, pet: Pet) -> int | None:
+        """What to do for `pet` before its next tick (None: nothing)."""
+        choice = self.table[state_index(
+            pet.hunger, pet.energy, pet.happiness, pet.is_sleeping, pet._play_cooldown, self.config
+        )]
+        return None if choice == IDLE else choice
+
+    def actions_for_population(self, population) -> bytearray:
+        """The choice for every pet of a PetPopulation (IDLE for nothing)."""
+        cfg = self.config
+        lo = cfg.min_stat
+        size = cfg.max_stat - lo + 1
+        levels = cooldown_levels(cfg)
+        table = self.table
+        return bytearray(
+            table[((((h - lo) * size + (e - lo)) * size + (p - lo)) * 2 + s) * levels + min(c, levels - 1)]
+            for h, e, p, s, c in zip(
+                population.hunger, population.energy, population.happiness,
+                population.is_sleeping, population.play_cooldown,
+            )
+        )
+
+    def to_bytes(self) -> bytes:
+        meta = json.dumps({"config": dataclasses.asdict(self.config), "objective": self.objective}).encode()
+        return _HEADER.pack(POLICY_MAGIC, POLICY_VERSION, len(meta)) + meta + zlib.compress(self.table, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PolicyTable":
+        if len(data) < _HEADER.size:
+            raise ValueError("not a policy table (file too short)")
+        magic, version, meta_len = _HEADER.unpack_from(data)
+        if magic != POLICY_MAGIC:
+            raise ValueError("not a policy table (bad magic)")
+        if version != POLICY_VERSION:
+            raise ValueError(f"unsupported policy table version {version}")
+        meta = json.loads(data[_HEADER.size:_HEADER.size + meta_len])
+        try:
+            table = zlib.decompress(data[_HEADER.size + meta_len:])
+        except zlib.error:
+            raise ValueError("policy table is corrupt") from None
+        return cls(PetConfig(**meta["config"]), meta["objective"], table)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "PolicyTable":
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Solve for the best caretaker action in every pet state.")
+    parser.add_argument("--objective", choices=OBJECTIVES, default="survival")
+    parser.add_argument("--gamma", type=float, default=0.99, help="discount per tick")
+    parser.add_argument("-o", "--output", default="autopilot.tpol")
+    args = parser.parse_args(argv)
+
+    config = PetConfig()
+    print(f"Solving {state_count(config)} states for {args.objective}...")
+    table = solve(config, args.objective, args.gamma)
+    table.save(args.output)
+    counts = {name: table.table.count(code) for name, code in zip(("idle", "feed", "play", "sleep", "wake"), CHOICES)}
+    print(f"Wrote {args.output}: {counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,652 @@
+# sprites.py
+"""
+ASCII sprite data for every species, stage and visual mode.
+
+Kept out of pet.py so that importing the simulation does not build these
+tables; pet.py imports this module the first time a frame is needed.
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List
+
+from pet import SPECIES, STAGES, VISUAL_MODES
+
+# Big ASCII sprites, per species and visual "mode"
+# Cheap but good enough.
+# species -> stage -> visual-mode -> frames
+ASCII_SPRITES: Dict[str, Dict[str, Dict[str, List[str]]]] = {
+    "cat": {
+        "baby": {
+            "idle": [
+r"""
+  /\_/\  
+ ( >^< ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+            "eat":  [
+r"""
+  /\_/\  
+ ( =ω= ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+            "sleep":[
+r"""
+  /\_/\  
+ ( -^- )  zz
+ /  ^  \ 
+ \_/ \_/ 
+""",
+r"""
+  /\_/\  
+ ( -^- )  zzz
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+            "play": [
+r"""
+  /\_/\ ♪
+ ( >o< ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+r"""
+♪ /\_/\  
+ ( >o< ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",      
+        ],
+            "hungry":[
+r"""
+  /\_/\  
+ ( ·_· ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+r"""
+  /\_/\  
+ ( ;_; ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",        
+        ],
+            "tired":[
+r"""
+  /\_/\  
+ ( -_- ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+r"""
+  /\_/\  
+ ( -.- ) z
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+            "bored":[
+r"""
+  /\_/\  
+ ( -^- ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+            "dead": [
+r"""
+  /\_/\  
+ ( x^x ) 
+ /  ^  \ 
+ \_/ \_/ 
+""",
+        ],
+        },
+        "adult": {
+            "idle": [
+r"""
+  /\___/\  
+ (  >^<  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "eat":  [
+r"""
+   /\___/\  
+  (   >^<  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+r"""
+   /\___/\  
+  (   =ω=  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",        
+        ],
+            "sleep":[
+r"""
+  /\___/\  
+ (  -^-  )  zz
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+r"""
+  /\___/\  
+ (  -^-  )  zzz
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],  
+            "play": [
+r"""
+  /\___/\ ♪ 
+ (  >o<  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+r"""
+♪ /\___/\  
+ (  >o<  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "hungry":[
+r"""
+  /\___/\  
+ (  ·_·  )  
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+r"""
+  /\___/\  
+ (  ;_;  )  
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "tired":[
+r"""
+ /\___/\  
+( -_-  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+r"""
+ /\___/\  
+( -.-  )   zz
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "bored":[
+r"""
+  /\___/\  
+ (  -^-  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "dead": [
+r"""
+  /\___/\  
+ (  x^x  ) 
+ /  | |  \ 
+/   | |   \
+\___/ \___/
+""",
+        ], 
+        },
+    },
+    "dog": {
+        "baby": {
+            "idle": [
+r"""
+  _____  
+ /)UᴥU(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "eat":  [
+r"""
+  _____  
+ /)=ω=(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "sleep":[
+r"""
+  _____  
+ /)-ᴥ-(\  zz
+ /  V  \ 
+ \_/ \_/ 
+""",
+r"""
+  _____  
+ /)-ᴥ-(\  zzz
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "play": [
+r"""
+  _____  
+ /)^ᴥ^(\ 
+ /  V  \ ⚽
+ \_/ \_/ 
+""",
+r"""
+  _____  ⚽
+ /)^ᴥ^(\ 
+ /  V  \ 
+ \_/ \_/
+""",      
+        ],
+            "hungry":[
+r"""
+  _____  
+ /)·ᴥ·(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+r"""
+  _____  
+ /);ᴥ;(\  
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "tired":[ 
+r"""
+  _____  
+ /)-ᴥ-(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+r"""
+  _____  
+ /)-ᴥ-(\  zz
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "bored":[
+r"""
+  _____  
+ /)-ᴥ-(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+            "dead": [
+r"""
+  _____  
+ /)xᴥx(\ 
+ /  V  \ 
+ \_/ \_/ 
+""",
+        ],
+        },
+        "adult": {
+            "idle": [
+r"""
+  /)   (\  
+ /  UᴥU  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "eat":  [
+r"""
+   /)   (\  
+  /   UᴥU  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+r"""
+   /)   (\  
+  /   =ω=  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",        ],
+            "sleep":[
+r"""
+  /)   (\  
+ /  -ᴥ-  \  zz
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+r"""
+  /)   (\  
+ /  -ᴥ-  \  zzz
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "play": [
+r"""
+  /)   (\ 
+ /  ^ᴥ^  \ 
+(   | |   ) ⚽
+/   | |   \
+\___/ \___/
+""",
+r"""
+♪ /)   (\   ⚽
+ /  ^ᴥ^  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",      ],
+            "hungry":[
+r"""
+  /)   (\  
+ /  ·ᴥ·  \  
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+r"""
+  /)   (\  
+ /  ;ᴥ;  \  
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "tired":[
+r"""
+ /)   (\  
+/ -ᴥ-  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+r"""
+ /)   (\  
+/ -ᴥ-  \   zz
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "bored":[
+r"""
+  /)   (\  
+ /  -ᴥ-  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],
+            "dead": [
+r"""
+  /)   (\  
+ /  xᴥx  \ 
+(   | |   )
+/   | |   \
+\___/ \___/
+""",
+        ],        
+        },
+    },
+    "dragon": {
+        "baby": {
+            "idle": [
+r"""
+   /\   
+ [ +_+ ]
+ /  |  \
+ \_/ \_/
+""",
+        ],
+            "eat":  [
+r"""
+   /\   
+ [ =ω= ]
+ /  |  \
+ \_/ \_/
+""",
+        ],
+            "sleep":[
+r"""
+   /\   
+ [ -_- ]  zz
+ /  |  \
+ \_/ \_/
+""",
+r"""
+   /\   
+ [ -_- ]  zzz
+ /  |  \
+ \_/ \_/
+""",
+        ],
+            "play": [
+r"""
+   /\   
+ [ +.+ ] 
+ /  |🔥\
+ \_/ \_/
+""",
+r"""
+   /\   
+ [ +.+ ] 
+ /🔥|🔥\
+ \_/ \_/
+""",      
+        ],
+            "hungry":[
+r"""
+   /\   
+ [ ·_· ] 
+ /  |  \
+ \_/ \_/
+""",
+r"""
+   /\   
+ [ ;_; ] 
+ /  |  \
+ \_/ \_/
+""",      
+        ],
+            "tired":[
+r"""
+   /\   
+ [ -_- ]  
+ /  |  \
+ \_/ \_/
+""",
+r"""
+   /\   
+ [ -.- ]  zz
+ /  |  \
+ \_/ \_/
+""",
+        ],
+            "bored":[
+r"""
+   /\   
+ [ -_- ]
+ /  |  \
+ \_/ \_/
+""",
+        ],
+            "dead": [
+r"""
+   /\   
+ [ x_x ]
+ /  |  \
+ \_/ \_/
+""",
+        ],        
+        },
+        "adult": {
+            "idle": [
+r"""
+      /\  
+   <[ +_+ ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+        ],
+            "eat":  [
+r"""
+       /\  
+    <[  +_+ ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+r"""
+       /\  
+    <[  =ω= ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",        
+        ],
+            "sleep":[
+r"""
+      /\  
+   <[ -_- ]>  z
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+r"""
+      /\  
+   <[ -_- ]>  zzz
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+        ],
+            "play": [
+r"""
+      /\   
+   <[ +.+ ]>
+   /  | |  \
+  /   | | 🔥\
+  \___/ \___==^
+""",
+r"""
+      /\   
+   <[ +.+ ]>
+   /  | |  \
+  / 🔥| |🔥 \
+  \___/ \___==^
+""",      
+        ],
+            "hungry":[
+r"""
+      /\   
+   <[ ·_· ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+r"""
+      /\   
+   <[ ;_; ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",      
+        ],
+            "tired":[
+r"""
+     /\  
+  <[ -_- ]>  
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+r"""
+     /\  
+  <[ -.- ]>   zz
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+        ],
+            "bored":[
+r"""
+      /\  
+   <[ -_- ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+        ],
+            "dead": [
+r"""
+      /\  
+   <[ x_x ]>
+   /  | |  \
+  /   | |   \
+  \___/ \___==^
+""",
+        ],
+        },
+    },
+}
+
+if tuple(ASCII_SPRITES) != SPECIES:
+    raise RuntimeError("pet.SPECIES must list the species of ASCII_SPRITES in order")
+
+
+# ASCII_SPRITES compiled once into a flat tuple of frames (the LCM of all
+# frame counts per slot, shorter animations repeated). Missing
+# stages/modes fall back here, exactly like the old dict lookups.
+def _compile_sprites() -> tuple[tuple[str, ...], tuple[int, ...], int]:
+    slots = []
+    for species in SPECIES:
+        species_sprites = ASCII_SPRITES[species]
+        for k, stage in enumerate(STAGES):
+            # Stages without art of their own use the closest earlier one.
+            stage_sprites = next(
+                (species_sprites[s] for s in reversed(STAGES[:k + 1]) if s in species_sprites),
+                None,
+            ) or next(iter(species_sprites.values()))
+            for mode in VISUAL_MODES:
+                slots.append(stage_sprites.get(mode) or stage_sprites["idle"])
+
+    slot_frames = math.lcm(*(len(frames) for frames in slots))
+    table = tuple(
+        frames[i % len(frames)] for frames in slots for i in range(slot_frames)
+    )
+    return table, tuple(len(frames) for frames in slots), slot_frames
+
+
+SPRITE_TABLE, SPRITE_FRAME_COUNTS, SPRITE_SLOT_FRAMES = _compile_sprites()
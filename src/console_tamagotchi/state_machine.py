@@ -1,6 +1,134 @@
 # state_machine.py
-# Placeholder for pet state transitions (e.g., awake, sleeping, dead).
-# Will be implemented later as part of the main loop.
+"""
+Pet state classification (ALIVE, HUNGRY, TIRED, BORED, DEAD).
 
-# TODO: implement state machine logic later
-pass
+The state is a pure function of (hunger, energy, happiness) and the
+config thresholds. Stats are bounded ints in [min_stat, max_stat], so for
+a given config the whole function fits in one table of
+(max_stat - min_stat + 1) ** 3 bytes (~1M entries at the default 0..100).
+`state_table()` builds that table once per distinct set of thresholds and
+shares it between every Pet and population using them; classifying a
+clamped pet is then a single indexed load.
+
+The table grows with the cube of the stat range, so above MAX_TABLE_SIZE
+values per stat `state_table()` returns a view with the same indexing that
+calls `classify()` on each lookup instead of storing anything.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Union
+
+# State codes; the order matches the PetState enum in pet.py.
+ALIVE, HUNGRY, TIRED, BORED, DEAD = range(5)
+
+# Largest stat range (max_stat - min_stat + 1) that gets a stored table:
+# 128 ** 3 bytes = 2 MiB.
+MAX_TABLE_SIZE = 128
+
+
+def classify(hunger: int, energy: int, happiness: int, config) -> int:
+    """Reference classification, valid for any stat values."""
+    if (
+        hunger >= config.death_hunger
+        or energy <= config.death_energy
+        or happiness <= config.death_happiness
+    ):
+        return DEAD
+    if hunger >= config.hungry_threshold:
+        return HUNGRY
+    if energy <= config.tired_threshold:
+        return TIRED
+    if happiness <= config.bored_threshold:
+        return BORED
+    return ALIVE
+
+
+class ComputedTable:
+    """Indexes like a state table but classifies on every lookup."""
+
+    __slots__ = ("config", "min_stat", "size")
+
+    def __init__(self, config) -> None:
+        self.config = config
+        self.min_stat = config.min_stat
+        self.size = config.max_stat - config.min_stat + 1
+
+    def __len__(self) -> int:
+        return self.size ** 3
+
+    def __getitem__(self, index: int) -> int:
+        he, p = divmod(index, self.size)
+        h, e = divmod(he, self.size)
+        lo = self.min_stat
+        return classify(h + lo, e + lo, p + lo, self.config)
+
+
+def state_table(config) -> Union[bytes, ComputedTable]:
+    """
+    The classification table for `config`, shared by all equal configs.
+
+    Index it with `table_index()` (stats must be within the clamp range).
+    Ranges wider than MAX_TABLE_SIZE get a ComputedTable instead.
+    """
+    if config.max_stat - config.min_stat + 1 > MAX_TABLE_SIZE:
+        return ComputedTable(config)
+    return _build_table(
+        config.min_stat,
+        config.max_stat,
+        config.death_hunger,
+        config.death_energy,
+        config.death_happiness,
+        config.hungry_threshold,
+        config.tired_threshold,
+        config.bored_threshold,
+    )
+
+
+def table_index(hunger: int, energy: int, happiness: int, min_stat: int, max_stat: int) -> int:
+    size = max_stat - min_stat + 1
+    return ((hunger - min_stat) * size + (energy - min_stat)) * size + (happiness - min_stat)
+
+
+@lru_cache(maxsize=16)
+def _build_table(
+    min_stat: int,
+    max_stat: int,
+    death_hunger: int,
+    death_energy: int,
+    death_happiness: int,
+    hungry_threshold: int,
+    tired_threshold: int,
+    bored_threshold: int,
+) -> bytes:
+    values = range(min_stat, max_stat + 1)
+    size = len(values)
+
+    # Along the happiness axis only a few distinct rows exist; build each
+    # once and join them.
+    def row(state_if_alive: int) -> bytes:
+        return bytes(
+            DEAD if p <= death_happiness
+            else BORED if state_if_alive == ALIVE and p <= bored_threshold
+            else state_if_alive
+            for p in values
+        )
+
+    dead_row = bytes([DEAD]) * size
+    hungry_row = row(HUNGRY)
+    tired_row = row(TIRED)
+    other_row = row(ALIVE)
+
+    rows = []
+    for h in values:
+        for e in values:
+            if h >= death_hunger or e <= death_energy:
+                rows.append(dead_row)
+            elif h >= hungry_threshold:
+                rows.append(hungry_row)
+            elif e <= tired_threshold:
+                rows.append(tired_row)
+            else:
+                rows.append(other_row)
+    return b"".join(rows)
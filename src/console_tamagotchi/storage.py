@@ -1,6 +1,524 @@
 # storage.py
-# Placeholder for save and load functions.
-# Will handle saving and loading pet data to/from files later.
+"""
+Saving and loading pets.
 
-# TODO: implement save/load logic later
-pass
+`save_pet` / `load_pet` write a single JSON snapshot. `PetJournal` is the
+incremental path: every action and tick is appended to a journal file,
+and a compacted snapshot is only written every `snapshot_every` records,
+so the cost of a save grows with what changed, not with the save size.
+For large fleets, `write_population` / `PopulationFile` use a compact
+fixed-width binary format that can be memory-mapped.
+
+Journal records are buffered and written with one write + fsync per
+group (group commit), either when `commit_batch` records are waiting or
+`commit_interval` seconds have passed. A crash loses at most the records
+of the group that was not yet committed; on open, the journal tail after
+the last snapshot is replayed on top of it.
+
+Author: Syed Hassan Faraz
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+from array import array
+from typing import Any, Dict, List
+
+from actions import ACTION_NAMES, apply_action
+from config import PetConfig
+from pet import SPECIES, STAGES, Pet
+from population import STATES, VISUAL_ACTIONS, PetPopulation, evolve_row
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_FILE = "journal.log"
+
+
+def save_pet(pet: Pet, path: str, extra: Dict[str, Any] | None = None) -> None:
+    """
+    Atomically write `pet` (plus optional `extra` keys) as JSON.
+
+    The file is written to a temporary name, fsynced and renamed over the
+    old one, so readers see either the old or the new save, never half.
+    """
+    data = {"pet": pet.to_dict()}
+    if extra:
+        data.update(extra)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+def load_pet(path: str, config: PetConfig | None = None) -> Pet:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return Pet.from_dict(data["pet"], config=config)
+
+
+def _fsync_dir(directory: str) -> None:
+    # Makes a rename durable on POSIX; directories can't be opened on Windows.
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PetJournal:
+    """
+    Append-only journal of one pet's ticks and actions, with snapshots.
+
+    Use `tick()` and `act()` instead of calling the Pet directly so that
+    every change is recorded. Journal lines look like
+
+        <seq> T <n>              n ticks
+        <seq> A <action> <0|1>   action code and its result
+
+    where `seq` numbers records; the snapshot stores the last `seq` it
+    includes, so records at or below it are skipped on replay.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        pet: Pet,
+        snapshot_every: int = 1000,
+        commit_interval: float = 1.0,
+        commit_batch: int = 64,
+    ) -> None:
+        """
+        Start a new journal for `pet` in `directory` (use `open()` to
+        continue an existing one).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pet = pet
+        self.snapshot_every = snapshot_every
+        self.commit_interval = commit_interval
+        self.commit_batch = commit_batch
+
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._pending: List[list] = []  # [seq, kind, arg, result] not yet written
+        self._last_commit = time.monotonic()
+        self._file = open(self._journal_path(), "a", encoding="utf-8")
+
+        if not os.path.exists(self._snapshot_path()):
+            self.snapshot()
+
+    @classmethod
+    def open(
+        cls,
+        directory: str,
+        config: PetConfig | None = None,
+        **options: Any,
+    ) -> "PetJournal":
+        """
+        Recover the pet from `directory`: load the snapshot and replay the
+        journal records written after it. A torn last line (crash during a
+        write) is dropped and cut off the file.
+        """
+        with open(os.path.join(directory, SNAPSHOT_FILE), encoding="utf-8") as f:
+            data = json.load(f)
+        pet = Pet.from_dict(data["pet"], config=config)
+        snapshot_seq = int(data["seq"])
+        seq = snapshot_seq
+
+        journal_path = os.path.join(directory, JOURNAL_FILE)
+        good_size = 0
+        if os.path.exists(journal_path):
+            with open(journal_path, "rb") as f:
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    try:
+                        record = raw.decode("utf-8").split()
+                        record_seq = int(record[0])
+                        if record_seq > seq:
+                            _replay(pet, record)
+                            seq = record_seq
+                    except (ValueError, IndexError, UnicodeDecodeError):
+                        break
+                    good_size += len(raw)
+            if good_size != os.path.getsize(journal_path):
+                with open(journal_path, "r+b") as f:
+                    f.truncate(good_size)
+
+        journal = cls(directory, pet, **options)
+        journal._seq = seq
+        journal._snapshot_seq = snapshot_seq
+        return journal
+
+    # ------------- Recording -------------
+
+    def tick(self, n: int = 1) -> None:
+        """Advance the pet by `n` ticks and record it."""
+        self.pet.advance(n)
+        last = self._pending[-1] if self._pending else None
+        if last is not None and last[1] == "T":
+            # Consecutive ticks share one record until it is written.
+            last[2] += n
+        else:
+            self._append("T", n)
+        self._maybe_commit()
+
+    def act(self, action: int) -> bool:
+        """Apply action code `action` (see actions.py) and record it."""
+        result = apply_action(self.pet, action)
+        self._append("A", action, result)
+        self._maybe_commit()
+        return result
+
+    def _append(self, kind: str, arg: int, result: bool | None = None) -> None:
+        self._seq += 1
+        self._pending.append([self._seq, kind, arg, result])
+
+    def _maybe_commit(self) -> None:
+        if (
+            len(self._pending) >= self.commit_batch
+            or time.monotonic() - self._last_commit >= self.commit_interval
+        ):
+            self.commit()
+
+    # ------------- Durability -------------
+
+    def commit(self) -> None:
+        """Write and fsync all pending records (one write, one fsync)."""
+        self._write_pending()
+        if self._seq - self._snapshot_seq >= self.snapshot_every:
+            self.snapshot()
+
+    def snapshot(self) -> None:
+        """
+        Write a compacted snapshot and empty the journal.
+
+        Pending records are written first and the snapshot is made durable
+        before the journal is truncated; if we crash in between, the old
+        records are skipped on replay because of their seq.
+        """
+        self._write_pending()
+        save_pet(self.pet, self._snapshot_path(), {"seq": self._seq})
+        self._snapshot_seq = self._seq
+        self._file.truncate(0)
+        self._file.seek(0)
+        os.fsync(self._file.fileno())
+
+    def _write_pending(self) -> None:
+        self._last_commit = time.monotonic()
+        if not self._pending:
+            return
+        lines = []
+        for seq, kind, arg, result in self._pending:
+            if kind == "T":
+                lines.append(f"{seq} T {arg}\n")
+            else:
+                lines.append(f"{seq} A {arg} {int(result)}\n")
+        self._pending.clear()
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
+
+    def __enter__(self) -> "PetJournal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, SNAPSHOT_FILE)
+
+    def _journal_path(self) -> str:
+        return os.path.join(self.directory, JOURNAL_FILE)
+
+
+def _replay(pet: Pet, record: List[str]) -> None:
+    kind = record[1]
+    if kind == "T":
+        pet.advance(int(record[2]))
+    elif kind == "A":
+        action = int(record[2])
+        if action >= len(ACTION_NAMES):
+            raise ValueError(f"unknown action code {action}")
+        apply_action(pet, action)
+    else:
+        raise ValueError(f"unknown journal record {kind!r}")
+
+
+# ------------- Binary population files -------------
+#
+# Layout (little endian):
+#
+#   header   magic "TAMA", version, record size, pet count,
+#            offset of the records, offset of the string table
+#   records  one fixed-width record per pet (see _RECORD)
+#   strings  UTF-8 pet names, each distinct name stored once
+#
+# Readers use the record size from the header, so a later version may
+# append fields to the record without breaking older readers.
+
+POPULATION_MAGIC = b"TAMA"
+POPULATION_VERSION = 2
+
+_HEADER = struct.Struct("<4sHHIQQ")
+# name offset, name length, hunger, happiness, energy, species, stage,
+# state, visual action, flags, play cooldown, visual ticks, food eaten,
+# age, happy ticks (the last two since version 2). Evolution goals are
+# not stored: they depend on the config the file is loaded with.
+_RECORD = struct.Struct("<IHhhhBBBBBHHIII")
+_RECORD_V1 = struct.Struct("<IHhhhBBBBBHHI")
+_RECORDS = {1: _RECORD_V1, 2: _RECORD}
+_FLAG_SLEEPING = 0x01
+
+_INT16 = (-(1 << 15), (1 << 15) - 1)
+_UINT16 = (0, (1 << 16) - 1)
+_UINT32 = (0, (1 << 32) - 1)
+# Population columns and the range their _RECORD field can hold.
+_RECORD_RANGES = (
+    ("hunger", _INT16),
+    ("happiness", _INT16),
+    ("energy", _INT16),
+    ("play_cooldown", _UINT16),
+    ("visual_action_ticks", _UINT16),
+    ("total_food_eaten", _UINT32),
+    ("age", _UINT32),
+    ("happy_ticks", _UINT32),
+)
+
+
+def _check_record_ranges(population: PetPopulation) -> None:
+    """Raise ValueError if a column holds a value its record field cannot."""
+    if not len(population):
+        return
+    for name, (lo, hi) in _RECORD_RANGES:
+        column = getattr(population, name)
+        low, high = min(column), max(column)
+        if low < lo or high > hi:
+            bad = low if low < lo else high
+            raise ValueError(
+                f"{name} value {bad} (pet {population.names[column.index(bad)]!r}) "
+                f"does not fit a population file field ({lo}..{hi})"
+            )
+
+
+def write_population(population: PetPopulation, path: str) -> None:
+    """
+    Write `population` to `path` in the binary format (atomically).
+
+    Raises ValueError, before anything is written, if a value does not
+    fit its record field (e.g. stats outside int16).
+    """
+    _check_record_ranges(population)
+    strings = bytearray()
+    name_refs: Dict[str, tuple[int, int]] = {}
+    for name in population.names:
+        if name not in name_refs:
+            encoded = name.encode("utf-8")
+            if len(encoded) > _UINT16[1]:
+                raise ValueError(f"pet name {name[:20]!r}... is longer than {_UINT16[1]} bytes")
+            name_refs[name] = (len(strings), len(encoded))
+            strings += encoded
+    if len(strings) > _UINT32[1]:
+        raise ValueError("pet names take more than 4 GiB")
+
+    count = len(population)
+    records = bytearray(_RECORD.size * count)
+    pack_into = _RECORD.pack_into
+    for i in range(count):
+        name_offset, name_length = name_refs[population.names[i]]
+        pack_into(
+            records,
+            i * _RECORD.size,
+            name_offset,
+            name_length,
+            population.hunger[i],
+            population.happiness[i],
+            population.energy[i],
+            population.species[i],
+            population.stage[i],
+            population.state[i],
+            population.visual_action[i],
+            _FLAG_SLEEPING if population.is_sleeping[i] else 0,
+            population.play_cooldown[i],
+            population.visual_action_ticks[i],
+            population.total_food_eaten[i],
+            population.age[i],
+            population.happy_ticks[i],
+        )
+
+    records_offset = _HEADER.size
+    strings_offset = records_offset + len(records)
+    header = _HEADER.pack(
+        POPULATION_MAGIC, POPULATION_VERSION, _RECORD.size, count, records_offset, strings_offset
+    )
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(strings)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+class PopulationFile:
+    """
+    Read-only, memory-mapped view of a binary population file.
+
+    Opening a file only parses the header; `pet(i)` decodes one record on
+    demand and `load_population()` bulk-loads every record straight into
+    PetPopulation columns.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file can't be mapped.
+            self._file.close()
+            raise ValueError(f"{path}: not a population file") from None
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: not a population file")
+        magic, version, record_size, count, records_offset, strings_offset = _HEADER.unpack_from(self._map)
+        if magic != POPULATION_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a population file")
+        record = _RECORDS.get(min(version, POPULATION_VERSION))
+        if record is None or record_size < record.size:
+            self.close()
+            raise ValueError(f"{path}: unsupported population file version {version}")
+        # A truncated or corrupt file would otherwise fail later, in pet().
+        records_end = records_offset + count * record_size
+        if not _HEADER.size <= records_offset <= records_end <= strings_offset <= len(self._map):
+            self.close()
+            raise ValueError(f"{path}: population file is truncated or corrupt")
+
+        self.version = version
+        self._struct = record
+        self._record_size = record_size
+        self._count = count
+        self._records_offset = records_offset
+        self._strings_offset = strings_offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, index: int) -> tuple:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._unpack(self._struct.unpack_from(self._map, self._records_offset + index * self._record_size))
+
+    def _unpack(self, record: tuple) -> tuple:
+        # Version 1 records have no age and happy ticks.
+        return record if self._struct is _RECORD else record + (0, 0)
+
+    def _name(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        if start + length > len(self._map):
+            raise ValueError("population file is truncated: a pet name runs past its end")
+        return self._map[start:start + length].decode("utf-8")
+
+    def name(self, index: int) -> str:
+        record = self._record(index)
+        return self._name(record[0], record[1])
+
+    def pet(self, index: int, config: PetConfig | None = None) -> Pet:
+        """Decode only pet `index`."""
+        (name_offset, name_length, hunger, happiness, energy, species, stage,
+         state, visual_action, flags, cooldown, visual_ticks, food, age, happy) = self._record(index)
+        pet = Pet(
+            name=self._name(name_offset, name_length),
+            species=SPECIES[species],
+            stage=STAGES[stage],
+            hunger=hunger,
+            happiness=happiness,
+            energy=energy,
+            config=config,
+        )
+        pet.total_food_eaten = food
+        pet.age = age
+        pet.happy_ticks = happy
+        pet._state = STATES[state]
+        pet._is_sleeping = bool(flags & _FLAG_SLEEPING)
+        pet._play_cooldown = cooldown
+        pet._visual_action = VISUAL_ACTIONS[visual_action]
+        pet._visual_action_ticks_remaining = visual_ticks
+        pet._sprite_offset = -1
+        pet._evolve()
+        return pet
+
+    def load_population(self, config: PetConfig | None = None) -> PetPopulation:
+        """Load every pet into a PetPopulation, one column at a time."""
+        population = PetPopulation(config)
+        if self._count == 0:
+            return population
+
+        data = memoryview(self._map)[
+            self._records_offset:self._records_offset + self._count * self._record_size
+        ]
+        record = self._struct
+        if self._record_size == record.size:
+            rows = record.iter_unpack(data)
+        else:
+            rows = (
+                record.unpack_from(data, i * self._record_size) for i in range(self._count)
+            )
+        if record is not _RECORD:
+            rows = map(self._unpack, rows)
+        (name_offsets, name_lengths, hunger, happiness, energy, species, stage,
+         state, visual_action, flags, cooldown, visual_ticks, food, age, happy) = zip(*rows)
+        data.release()
+
+        # Shared names are decoded once.
+        decoded: Dict[tuple[int, int], str] = {}
+        for ref in set(zip(name_offsets, name_lengths)):
+            decoded[ref] = self._name(*ref)
+        population.names = [decoded[ref] for ref in zip(name_offsets, name_lengths)]
+        population.hunger = array("i", hunger)
+        population.happiness = array("i", happiness)
+        population.energy = array("i", energy)
+        population.species = array("b", species)
+        population.stage = array("b", stage)
+        population.state = array("b", state)
+        population.visual_action = array("b", visual_action)
+        population.is_sleeping = array("b", (f & _FLAG_SLEEPING for f in flags))
+        population.play_cooldown = array("i", cooldown)
+        population.visual_action_ticks = array("i", visual_ticks)
+        population.total_food_eaten = array("q", food)
+        population.age = array("q", age)
+        population.happy_ticks = array("q", happy)
+        count = self._count
+        population.food_goal = array("q", bytes(8 * count))
+        population.age_goal = array("q", bytes(8 * count))
+        population.happy_goal = array("q", bytes(8 * count))
+        for i in range(count):
+            evolve_row(population, population.config, i)
+        return population
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "PopulationFile":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,287 @@
+# sweep.py
+"""
+PetConfig balance sweeps.
+
+Simulates every combination of config values and caretaker policy (see
+policies.py) until the pet dies or a tick horizon is reached, on all
+cores, and reports survival time, ticks spent in each state and when the
+pet became an adult (all in ticks). Results are cached by a hash of the full config,
+the policy and the horizon, so re-running an enlarged grid only
+simulates the new points. Runs that turn periodic (the pet is back in
+a state it was in at an earlier visit) skip ahead by whole periods, so
+long horizons cost no more than short ones.
+
+Usage:
+
+    python sweep.py --grid hunger_per_tick=1,2,3 --grid feed_amount=15,25,35
+    python sweep.py --sample feed_amount=10:40 --sample auto_sleep_energy_threshold=5:30 \\
+        --samples 40 --policies attentive,busy --horizon 604800
+
+Author: Buyan-Erdene Batsaikhan
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+from typing import Any, Dict, Iterable, List, Tuple
+
+from actions import apply_action
+from config import INT_FIELDS, PetConfig, config_digest
+from pet import Pet, PetState
+from policies import POLICIES, Policy
+
+DEFAULT_HORIZON = 7 * 24 * 3600     # one week of ticks
+DEFAULT_CACHE = "sweep-cache.jsonl"
+# Bump when simulate() or a policy changes, so old cache entries are ignored.
+SIM_VERSION = 1
+
+LIVING_STATES = tuple(state.value for state in PetState if state != PetState.DEAD)
+
+# With every stat drawn "the same", ticks_until_visible_change only stops
+# where the state, sleep flag or visual mode can change.
+_STATE_ONLY = {"hunger": lambda v: 0, "energy": lambda v: 0, "happiness": lambda v: 0}
+_LOOKAHEAD_MIN = 32
+
+
+def simulate(config: PetConfig, policy: Policy, horizon: int) -> Dict[str, Any]:
+    """Run one pet under `policy` until it dies or `horizon` ticks pass."""
+    pet = Pet("sim", config=config)
+    state_ticks = dict.fromkeys(LIVING_STATES, 0)
+    adult_at = None
+    died_at = None
+    now = 0
+
+    # At each visit: the pet's cycle key -> (tick, state_ticks, evolution
+    # counters). The policy only sees the pet, so a repeated key means the
+    # run is periodic from here on (until the pet evolves) and whole
+    # periods can be skipped.
+    visits: Dict[tuple, Tuple[int, Dict[str, int], tuple]] | None = {}
+
+    while died_at is None and now < horizon:
+        if visits is not None:
+            key = pet.cycle_key()
+            if key in visits:
+                then, then_ticks, then_counters = visits[key]
+                period = now - then
+                periods = (horizon - now) // period
+                skipped = pet.skip_periods(then_counters, periods)
+                now += skipped * period
+                for state, count in then_ticks.items():
+                    state_ticks[state] += skipped * (state_ticks[state] - count)
+                if skipped == periods:
+                    visits = None
+                    if now >= horizon:
+                        break
+                else:
+                    # Stopped short of an evolution; start over from here.
+                    visits = {key: (now, dict(state_ticks), pet.evolution_counters())}
+            else:
+                visits[key] = (now, dict(state_ticks), pet.evolution_counters())
+
+        for action in policy.decide(pet):
+            apply_action(pet, action)
+        if adult_at is None and pet._stage != "baby":
+            adult_at = now
+        if pet.state == PetState.DEAD:
+            died_at = now
+            break
+
+        # Until the next visit, stop only where the state may change. For
+        # short gaps plain ticks are cheaper than looking ahead.
+        stop = min(now + policy.check_every, horizon)
+        while now < stop:
+            k = 1 if stop - now <= _LOOKAHEAD_MIN else pet.ticks_until_visible_change(stop - now, _STATE_ONLY)
+            if k > 1:
+                state_ticks[pet.state.value] += k - 1
+                pet.advance(k - 1)
+            pet.tick()
+            now += k
+            if pet.state == PetState.DEAD:
+                died_at = now
+                break
+            state_ticks[pet.state.value] += 1
+
+    return {
+        "survived": died_at is None,
+        "survival_ticks": horizon if died_at is None else died_at,
+        "state_ticks": state_ticks,
+        "adult_at": adult_at,
+    }
+
+
+def cache_key(config: PetConfig, policy: Policy, horizon: int) -> str:
+    import hashlib      # only sweeps with a cache need it; keeps startup lean
+
+    blob = json.dumps(
+        {
+            "config": config_digest(config),
+            "policy": [policy.name, policy.check_every],
+            "horizon": horizon,
+            "version": SIM_VERSION,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()[:20]
+
+
+def _run_task(task: Tuple[Dict[str, int], str, int]) -> Dict[str, Any]:
+    overrides, policy_name, horizon = task
+    return simulate(PetConfig(**overrides), POLICIES[policy_name], horizon)
+
+
+# ------------- Sweeps -------------
+
+def grid_points(grid: Dict[str, List[int]]) -> List[Dict[str, int]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def sample_points(ranges: Dict[str, Tuple[int, int]], samples: int, seed: int = 0) -> List[Dict[str, int]]:
+    rng = random.Random(seed)
+    return [{name: rng.randint(lo, hi) for name, (lo, hi) in ranges.items()} for _ in range(samples)]
+
+
+def load_cache(path: str | None) -> Dict[str, Dict[str, Any]]:
+    cache: Dict[str, Dict[str, Any]] = {}
+    if path is None or not os.path.exists(path):
+        return cache
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                cache[entry["key"]] = entry["result"]
+            except (ValueError, KeyError):
+                continue  # a torn last line from an interrupted run
+    return cache
+
+
+def run_sweep(
+    points: Iterable[Dict[str, int]],
+    policies: Iterable[str],
+    horizon: int = DEFAULT_HORIZON,
+    cache_path: str | None = DEFAULT_CACHE,
+    workers: int | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Simulate every (point, policy) pair; returns one row per pair.
+
+    Each row has "params", "policy" and the simulate() results. Points
+    already in the cache file are not simulated again; new results are
+    appended to it.
+    """
+    rows = []
+    todo = []
+    queued = set()
+    cache = load_cache(cache_path)
+    for overrides in points:
+        config = PetConfig(**overrides)
+        for name in policies:
+            key = cache_key(config, POLICIES[name], horizon)
+            row = {"params": overrides, "policy": name, "key": key}
+            rows.append(row)
+            if key in cache:
+                row.update(cache[key])
+            elif key not in queued:
+                queued.add(key)
+                todo.append(row)
+
+    tasks = [(row["params"], row["policy"], horizon) for row in todo]
+    if workers == 1 or len(tasks) <= 1:
+        fresh = _collect(todo, map(_run_task, tasks), cache_path)
+    else:
+        # Imported here: it pulls in multiprocessing, which single runs
+        # (and `python -m console_tamagotchi simulate`) never need.
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunk = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = _collect(todo, pool.map(_run_task, tasks, chunksize=chunk), cache_path)
+
+    for row in rows:
+        if row["key"] in fresh:
+            row.update(fresh[row["key"]])
+    return rows
+
+
+def _collect(todo: List[Dict[str, Any]], results: Iterable[Dict[str, Any]], cache_path: str | None) -> Dict[str, Any]:
+    """Gather results by key, appending each to the cache as it arrives."""
+    fresh = {}
+    cache_file = open(cache_path, "a", encoding="utf-8") if cache_path else None
+    try:
+        for row, result in zip(todo, results):
+            fresh[row["key"]] = result
+            if cache_file is not None:
+                cache_file.write(json.dumps({"key": row["key"], "result": result}) + "\n")
+    finally:
+        if cache_file is not None:
+            cache_file.close()
+    return fresh
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    names = list(rows[0]["params"]) if rows else []
+    header = [*names, "policy", "survival", *(f"%{s}" for s in LIVING_STATES), "adult_at"]
+    lines = ["  ".join(f"{h:>12}" for h in header)]
+    for row in rows:
+        alive = sum(row["state_ticks"].values()) or 1
+        adult = row["adult_at"]
+        cells = [
+            *(str(row["params"][n]) for n in names),
+            row["policy"],
+            f"{row['survival_ticks']}" + ("+" if row["survived"] else ""),
+            *(f"{100 * row['state_ticks'][s] / alive:.0f}" for s in LIVING_STATES),
+            "-" if adult is None else str(adult),
+        ]
+        lines.append("  ".join(f"{c:>12}" for c in cells))
+    return "\n".join(lines)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Sweep PetConfig values against caretaker policies.")
+    parser.add_argument("--grid", action="append", default=[], metavar="FIELD=V1,V2,...")
+    parser.add_argument("--sample", action="append", default=[], metavar="FIELD=LO:HI")
+    parser.add_argument("--samples", type=int, default=20, help="random points drawn from the --sample ranges")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policies", default="neglect,feeder,attentive,busy,routine")
+    parser.add_argument("--horizon", type=int, default=DEFAULT_HORIZON, help="ticks to simulate at most")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="result cache file ('' to disable)")
+    parser.add_argument("--workers", type=int, help="processes to use (default: all cores)")
+    parser.add_argument("--json", metavar="FILE", help="also write the rows as JSON")
+    args = parser.parse_args(argv)
+
+    def field(spec: str) -> Tuple[str, str]:
+        name, sep, values = spec.partition("=")
+        if not sep or name not in INT_FIELDS:
+            parser.error(f"expected FIELD=..., with FIELD an int PetConfig field: {spec!r}")
+        return name, values
+
+    grid = {name: [int(v) for v in values.split(",")] for name, values in map(field, args.grid)}
+    ranges = {}
+    for name, values in map(field, args.sample):
+        lo, _, hi = values.partition(":")
+        ranges[name] = (int(lo), int(hi))
+    policies = args.policies.split(",")
+    for name in policies:
+        if name not in POLICIES:
+            parser.error(f"unknown policy {name!r} (choose from {', '.join(POLICIES)})")
+
+    points = grid_points(grid)
+    if ranges:
+        points = [
+            {**point, **sample}
+            for point in points
+            for sample in sample_points(ranges, args.samples, args.seed)
+        ]
+    rows = run_sweep(points, policies, args.horizon, args.cache or None, args.workers)
+    print(format_report(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,319 @@
 # ui.py
-# Placeholder for terminal UI functions.
-# Will handle displaying pet status and user input later.
+"""
+Terminal frontend for Tamagotchi (no Tk or display needed).
 
-# TODO: Implement UI logic after main structure is complete.
-pass
+Draws one or more pets with plain ANSI escape codes, so it works over SSH
+and on headless servers. The screen is kept in a back buffer; each frame
+only the cells that changed are rewritten (with cursor moves), and the
+whole frame goes out in a single write.
+
+Usage:
+
+    python ui.py Tama:cat Rex:dog
+
+Keys: [F]eed, [P]lay, [S]leep, [W]ake the selected pet, [Tab] selects the
+next pet, [Q] quits.
+
+Author: Yin Zirui
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import unicodedata
+from typing import List, Sequence, TextIO
+
+from clock import FixedStepClock
+from pet import Pet, PetState
+
+TICK_INTERVAL = 1.0           # logic tick: 1s
+ANIM_INTERVAL = 0.333         # ~3 FPS animation
+MAX_CATCH_UP_TICKS = 600      # ticks applied per frame when behind
+BAR_CELLS = 20
+PANEL_WIDTH = 30
+
+# Cursor moves cost a few bytes, so unchanged gaps shorter than this are
+# rewritten instead of jumped over.
+_MIN_SKIP = 6
+
+_ESC = "\x1b["
+
+
+def _is_wide(ch: str) -> bool:
+    return ch != "" and unicodedata.east_asian_width(ch) in ("W", "F")
+
+
+def _cells(text: str) -> List[str]:
+    """
+    Split a line into screen cells.
+
+    Wide characters take two cells: the character itself followed by an
+    empty placeholder cell.
+    """
+    cells: List[str] = []
+    for ch in text:
+        cells.append(ch)
+        if _is_wide(ch):
+            cells.append("")
+    return cells
+
+
+class TerminalRenderer:
+    """
+    Writes frames of text to a terminal, sending only what changed.
+    """
+
+    def __init__(self, out: TextIO, width: int, height: int) -> None:
+        self.out = out
+        self.width = width
+        self.height = height
+        self._back: List[List[str]] | None = None
+        self.bytes_last_frame = 0
+
+    def _layout(self, lines: Sequence[str]) -> List[List[str]]:
+        front = []
+        for row in range(self.height):
+            cells = _cells(lines[row]) if row < len(lines) else []
+            if len(cells) > self.width:
+                cells = cells[: self.width]
+                if _is_wide(cells[-1]):
+                    # A wide character cut in half at the right edge.
+                    cells[-1] = " "
+            cells.extend(" " * (self.width - len(cells)))
+            front.append(cells)
+        return front
+
+    def render(self, lines: Sequence[str]) -> int:
+        """
+        Draw `lines` and return the number of characters written.
+        """
+        front = self._layout(lines)
+        parts: List[str] = []
+
+        if self._back is None:
+            # The screen is blank after clearing, so skip trailing spaces.
+            parts.append(f"{_ESC}?25l{_ESC}2J")
+            for row, cells in enumerate(front):
+                text = "".join(cells).rstrip(" ")
+                if text:
+                    parts.append(f"{_ESC}{row + 1};1H")
+                    parts.append(text)
+        else:
+            for row, (new, old) in enumerate(zip(front, self._back)):
+                if new != old:
+                    parts.extend(self._diff_row(row, new, old))
+
+        self._back = front
+        data = "".join(parts)
+        if data:
+            self.out.write(data)
+            self.out.flush()
+        self.bytes_last_frame = len(data)
+        return len(data)
+
+    def _diff_row(self, row: int, new: List[str], old: List[str]) -> List[str]:
+        parts = []
+        col = 0
+        width = self.width
+        while col < width:
+            if new[col] == old[col]:
+                col += 1
+                continue
+
+            start = col
+            if new[start] == "" and start > 0:
+                # Never start in the middle of a wide character.
+                start -= 1
+            end = col + 1
+            gap = 0
+            while end < width and gap < _MIN_SKIP:
+                if new[end] == old[end]:
+                    gap += 1
+                else:
+                    gap = 0
+                end += 1
+            end -= gap
+            if end < width and new[end] == "":
+                end += 1
+
+            parts.append(f"{_ESC}{row + 1};{start + 1}H")
+            parts.append("".join(new[start:end]))
+            col = end
+        return parts
+
+    def close(self) -> None:
+        self.out.write(f"{_ESC}0m{_ESC}{self.height + 1};1H{_ESC}?25h\n")
+        self.out.flush()
+
+
+# ------------- Pet panels -------------
+
+def text_bar(value: int, invert: bool = False, cells: int = BAR_CELLS) -> str:
+    value = max(0, min(100, value))
+    if invert:
+        value = 100 - value
+    filled = cells * value // 100
+    return "[" + "#" * filled + "." * (cells - filled) + "]"
+
+
+def pet_panel(pet: Pet, frame_index: int, selected: bool = False) -> List[str]:
+    """The lines drawn for one pet."""
+    state_text = pet.state.value.upper()
+    if pet.is_sleeping and pet.state != PetState.DEAD:
+        state_text += " (SLEEPING)"
+
+    marker = ">" if selected else " "
+    lines = [f"{marker} {pet.name} the {pet.species.capitalize()}"]
+    lines.extend(pet.get_ascii_frame(frame_index).strip("\n").split("\n"))
+    lines.append(f"State: {state_text}")
+    lines.append(f"Hunger    {text_bar(pet.hunger, invert=True)}")
+    lines.append(f"Happiness {text_bar(pet.happiness)}")
+    lines.append(f"Energy    {text_bar(pet.energy)}")
+    return lines
+
+
+def compose(panels: Sequence[List[str]], columns: int) -> List[str]:
+    """Lay panels out in a grid, `columns` panels per row."""
+    lines: List[str] = []
+    for first in range(0, len(panels), columns):
+        row = panels[first:first + columns]
+        height = max(len(panel) for panel in row)
+        for i in range(height):
+            cells: List[str] = []
+            for panel in row:
+                text = _cells(panel[i] if i < len(panel) else "")[:PANEL_WIDTH]
+                cells.extend(text)
+                cells.extend(" " * (PANEL_WIDTH - len(text)))
+            lines.append("".join(cells).rstrip())
+        lines.append("")
+    return lines
+
+
+# ------------- Keyboard -------------
+
+class _KeyReader:
+    """Non-blocking single-key input for POSIX terminals and Windows."""
+
+    def __init__(self) -> None:
+        self._saved = None
+        self._interactive = sys.stdin.isatty()
+        if os.name == "nt" or not self._interactive:
+            return
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        self._saved = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+    def read(self, timeout: float) -> str | None:
+        if not self._interactive:
+            # No keyboard (e.g. piped stdin): just let the pets live.
+            time.sleep(max(0.0, timeout))
+            return None
+        if os.name == "nt":
+            import msvcrt
+
+            end = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if time.monotonic() >= end:
+                    return None
+                time.sleep(0.01)
+            return msvcrt.getwch()
+
+        import select
+
+        ready, _, _ = select.select([sys.stdin], [], [], max(0.0, timeout))
+        return sys.stdin.read(1) if ready else None
+
+    def close(self) -> None:
+        if self._saved is not None:
+            import termios
+
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved)
+
+
+# ------------- App -------------
+
+class TerminalApp:
+    """
+    Drives any number of pets and draws them with TerminalRenderer.
+    """
+
+    def __init__(self, pets: List[Pet], out: TextIO = sys.stdout) -> None:
+        self.pets = pets
+        self.selected = 0
+        size = os.get_terminal_size() if out.isatty() else os.terminal_size((100, 40))
+        self.columns = max(1, size.columns // PANEL_WIDTH)
+        self.renderer = TerminalRenderer(out, size.columns, size.lines - 1)
+        self.message = "Your new pets have hatched!" if len(pets) > 1 else "Your new pet has hatched!"
+
+    def frame_lines(self, frame_index: int) -> List[str]:
+        panels = [pet_panel(pet, frame_index, i == self.selected) for i, pet in enumerate(self.pets)]
+        lines = compose(panels, self.columns)
+        lines.append(self.message)
+        lines.append("[F]eed [P]lay [S]leep [W]ake  [Tab] next pet  [Q]uit")
+        return lines
+
+    def on_key(self, key: str) -> bool:
+        """Handle one key press; returns False when the app should quit."""
+        key = key.lower()
+        if key == "q":
+            return False
+        if key == "\t":
+            self.selected = (self.selected + 1) % len(self.pets)
+            return True
+
+        pet = self.pets[self.selected]
+        if pet.state == PetState.DEAD:
+            self.message = f"{pet.name} has died."
+            return True
+        if key == "f":
+            self.message = "You feed your pet. Crunch crunch." if pet.feed() else "Feeding had no effect."
+        elif key == "p":
+            self.message = (
+                "You play with your pet. It looks happier!" if pet.play()
+                else "Your pet is too tired or on cooldown."
+            )
+        elif key == "s":
+            self.message = "Your pet curls up and falls asleep." if pet.sleep() else "Your pet cannot sleep right now."
+        elif key == "w":
+            self.message = "You gently wake your pet." if pet.wake() else "Your pet refuses to wake."
+        return True
+
+    def run(self) -> None:
+        keys = _KeyReader()
+        clock = FixedStepClock(TICK_INTERVAL, MAX_CATCH_UP_TICKS)
+        start = clock.origin
+        try:
+            while True:
+                due = clock.take()
+                if due:
+                    for pet in self.pets:
+                        pet.advance(due)
+
+                frame = int((time.monotonic() - start) / ANIM_INTERVAL)
+                self.renderer.render(self.frame_lines(frame))
+
+                next_frame = start + (frame + 1) * ANIM_INTERVAL
+                key = keys.read(min(next_frame, clock.time_of(1)) - time.monotonic())
+                if key is not None and not self.on_key(key):
+                    break
+        finally:
+            keys.close()
+            self.renderer.close()
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    pets = []
+    for spec in args or ["Tama:cat"]:
+        name, _, species = spec.partition(":")
+        pets.append(Pet(name=name or "Tama", species=species or "cat"))
+    TerminalApp(pets).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# conftest.py
+# The game modules import each other as siblings (see main.py), so put the
+# package folder itself on sys.path for the tests.
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "src", "console_tamagotchi")
+)
+
+# Columns compared between a population and its reference pets.
+COMPARED_COLUMNS = ("hunger", "happiness", "energy", "total_food_eaten", "state", "is_sleeping",
+                    "play_cooldown", "visual_action", "visual_action_ticks", "stage")
+
+
+def population_columns(population):
+    """The COMPARED_COLUMNS of a PetPopulation as lists, by name."""
+    return {name: list(getattr(population, name)) for name in COMPARED_COLUMNS}
@@ -1,5 +1,67 @@
 # test_actions.py
-# Placeholder tests for feed/play/rest actions.
+import random
 
-def test_actions_placeholder():
-    assert True
+import pytest
+
+from actions import ACTION_CODES, ACTION_NAMES, FEED, SLEEP, WAKE, apply_action, apply_actions
+from tests.conftest import population_columns
+from pet import Pet, PetConfig
+from population import PetPopulation
+
+
+def test_action_codes_round_trip():
+    assert [ACTION_CODES[name] for name in ACTION_NAMES] == list(range(len(ACTION_NAMES)))
+
+
+def test_batch_matches_pet_methods():
+    config = PetConfig(food_to_adult=60, play_cooldown_ticks=3)
+    rng = random.Random(23)
+    pets = [
+        Pet(f"p{i}", hunger=rng.randrange(-10, 111), happiness=rng.randrange(0, 101),
+            energy=rng.randrange(0, 101), config=config)
+        for i in range(300)
+    ]
+    for pet in pets[::7]:
+        pet.sleep()
+    population = PetPopulation.from_pets(pets, config)
+    reference = [Pet.from_dict(pet.to_dict(), config) for pet in pets]
+
+    for _ in range(40):
+        # Few pets, many actions: every batch hits some pets repeatedly.
+        indices = [rng.randrange(60) for _ in range(500)]
+        actions = [rng.randrange(len(ACTION_NAMES)) for _ in indices]
+        mask = apply_actions(population, indices, actions)
+        assert list(mask) == [apply_action(reference[i], a) for i, a in zip(indices, actions)]
+        population.tick()
+        for pet in reference:
+            pet.tick()
+        assert population_columns(population) == population_columns(PetPopulation.from_pets(reference, config))
+
+
+def test_batch_runs_in_order():
+    population = PetPopulation.from_pets([Pet("a", hunger=50)])
+    assert list(apply_actions(population, [0, 0, 0, 0], [SLEEP, FEED, WAKE, FEED])) == [1, 0, 1, 1]
+    assert population.hunger[0] == 50 - population.config.feed_amount
+
+
+def test_batch_rejects_bad_input():
+    population = PetPopulation.from_pets([Pet("a")])
+    with pytest.raises(ValueError):
+        apply_actions(population, [0, 0], [FEED])
+    with pytest.raises(ValueError):
+        apply_actions(population, [0], [9])
+
+
+def test_bad_codes_change_nothing():
+    population = PetPopulation.from_pets([Pet("a", hunger=50), Pet("dead", hunger=100)])
+    before = population_columns(population)
+    for actions in ([FEED, FEED, 4], [FEED, -1], [0, 0, 7]):
+        with pytest.raises(ValueError):
+            apply_actions(population, [0, 1, 1][:len(actions)], actions)
+    # A bad code on a dead pet is still an error.
+    with pytest.raises(ValueError):
+        apply_actions(population, [1], [5])
+    assert population_columns(population) == before
+    for code in (-1, 4):
+        with pytest.raises(ValueError):
+            apply_action(Pet("b"), code)
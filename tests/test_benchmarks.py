@@ -0,0 +1,47 @@
+# test_benchmarks.py
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import harness  # noqa: E402
+
+
+def _result(name, ns):
+    return harness.Result(name, ns, ns, 1, 1, 1, 0.0)
+
+
+def test_measure_calibrates_and_reports():
+    calls = []
+    bench = harness.Benchmark("noop", lambda: calls.append)
+    result = harness.measure(bench, repeat=2, min_time=0.001)
+    assert result.ops_per_sample >= 1 and result.samples == 2
+    assert result.min_ns_per_op <= result.ns_per_op
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance(tmp_path):
+    path = str(tmp_path / "base.json")
+    harness.save([_result("a", 100.0), _result("b", 100.0), _result("c", 100.0)], path)
+    baseline = harness.load(path)
+    current = [_result("a", 105.0), _result("b", 150.0), _result("c", 50.0), _result("new", 1e9)]
+    assert harness.compare(current, baseline, tolerance=0.10) == ["b"]
+
+
+def test_headless_commands_skip_gui_and_sprites():
+    import startup
+
+    for command in startup.COMMANDS:
+        _, modules = startup.measure(command, baseline=set(), repeat=1)
+        assert "pet" in modules
+        assert not [name for name in modules if name.split(".")[0] in startup.FORBIDDEN], command
+
+
+def test_importtime_parse_reads_depth():
+    import startup
+
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   typing\n"
+        "import time:       200 |        300 | pet\n"
+    )
+    assert startup.parse(stderr) == {"typing": (100, 1), "pet": (300, 0)}
@@ -0,0 +1,41 @@
+# test_clock.py
+from clock import FixedStepClock
+
+
+class FakeTime:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ticks_follow_wall_time_not_call_pattern():
+    t = FakeTime()
+    clock = FixedStepClock(0.1, now=t)
+    handed_out = 0
+    # Irregular, late wake-ups never lose or gain ticks.
+    for step in (0.05, 0.13, 0.31, 0.02, 0.5, 0.09) * 1000:
+        t.now += step
+        handed_out += clock.take()
+    assert handed_out == clock.ticks
+    assert -1e-6 < clock.stats()["lag_ticks"] < 1
+
+
+def test_catch_up_is_capped_but_not_lost():
+    t = FakeTime()
+    clock = FixedStepClock(1.0, max_catch_up=10, now=t)
+    t.now += 35.5
+    assert [clock.take() for _ in range(5)] == [10, 10, 10, 5, 0]
+    stats = clock.stats()
+    assert stats["max_backlog"] == 35 and stats["capped_updates"] == 3
+    assert clock.time_of(1) == clock.origin + 36.0
+
+
+def test_waking_at_time_of_always_finds_the_tick_due():
+    t = FakeTime()
+    clock = FixedStepClock(1 / 3, now=t)
+    for _ in range(100_000):
+        t.now = clock.time_of(1)
+        assert clock.take() == 1
+    assert clock.time_of(0) == clock.origin + 100_000 * (1 / 3)
@@ -0,0 +1,59 @@
+# test_config.py
+import json
+
+import pytest
+
+import config
+import evolution
+from config import DEFAULT_CONFIG, PetConfig, config_digest, derived, intern_config, load_registry
+from pet import Pet
+
+
+def test_shipped_configs_load_and_validate():
+    registry = load_registry()
+    assert registry["default"] is DEFAULT_CONFIG
+    assert {"easy", "hard"} <= set(registry)
+    for cfg in registry.values():
+        assert config.validate(cfg) is cfg
+        assert intern_config(PetConfig(**{f: getattr(cfg, f) for f in config.CONFIG_FIELDS})) is cfg
+
+
+def test_bad_config_files_are_rejected(tmp_path):
+    (tmp_path / "typo.json").write_text(json.dumps({"hunger_per_tik": 1}))
+    with pytest.raises(ValueError, match="hunger_per_tik"):
+        load_registry(str(tmp_path))
+    (tmp_path / "typo.json").write_text(json.dumps({"min_stat": 100}))
+    with pytest.raises(ValueError, match="typo.json: min_stat"):
+        load_registry(str(tmp_path))
+    (tmp_path / "typo.json").write_text(json.dumps({"feed_amount": "lots"}))
+    with pytest.raises(ValueError, match="feed_amount"):
+        load_registry(str(tmp_path))
+
+
+def test_derived_values_are_shared_per_config():
+    cfg = PetConfig(hunger_per_tick=3, sleep_energy_gain_per_tick=4)
+    d = derived(cfg)
+    assert derived(PetConfig(hunger_per_tick=3, sleep_energy_gain_per_tick=4)) is d
+    assert d.awake_deltas == (3, -1, -1) and d.sleep_deltas == (1, 4, 0)
+    assert Pet("a", config=cfg)._derived is d
+    assert Pet("b")._derived is derived(None)
+
+
+def test_digest_is_a_stable_content_hash():
+    assert config_digest(PetConfig()) == config_digest(DEFAULT_CONFIG)
+    assert config_digest(PetConfig(feed_amount=24)) != config_digest(DEFAULT_CONFIG)
+    # Same value in every process: part of cache keys and file headers.
+    assert config_digest(DEFAULT_CONFIG) == "b061424bb5370f23721c"
+
+
+def test_derived_cache_is_bounded():
+    pet = Pet("old", config=PetConfig(hungry_threshold=11))
+    for threshold in range(12, 12 + 2 * config.MAX_CONFIGS):
+        derived(PetConfig(hungry_threshold=threshold))
+        evolution.default_chain(PetConfig(food_to_adult=threshold))
+    assert len(config._CONFIGS) <= config.MAX_CONFIGS
+    assert len(evolution._DEFAULT_CHAINS) <= evolution._MAX_DEFAULT_CHAINS
+    assert derived(PetConfig()) is derived(None)
+    # Evicted configs keep working for the pets that use them.
+    pet.tick()
+    assert derived(pet._config).awake_deltas == pet._derived.awake_deltas
@@ -0,0 +1,128 @@
+# test_evolution.py
+import copy
+import json
+import random
+from dataclasses import asdict, replace
+
+import pytest
+
+from actions import ACTION_NAMES, apply_action, apply_actions
+from config import config_digest
+from evolution import NEVER, Evolution, resolve
+from interned import InternedPopulation
+from pet import Pet, PetConfig
+from population import PetPopulation
+
+FAST = PetConfig(food_to_adult=40, age_to_senior=300, happy_ticks_to_senior=120)
+
+
+def state(pet):
+    return (
+        pet._stage,
+        pet.total_food_eaten,
+        pet.age,
+        pet.happy_ticks,
+        (pet._food_goal, pet._age_goal, pet._happy_goal),
+        pet.to_dict(),
+    )
+
+
+def test_resolve_walks_the_chain_and_waits_on_one_counter():
+    assert resolve("cat", "baby", 0, 0, 0, FAST) == ("baby", 40, NEVER, NEVER)
+    assert resolve("cat", "baby", 40, 0, 0, FAST) == ("adult", NEVER, 300, NEVER)
+    assert resolve("cat", "baby", 40, 300, 0, FAST) == ("adult", NEVER, NEVER, 120)
+    assert resolve("cat", "baby", 40, 300, 120, FAST) == ("senior", NEVER, NEVER, NEVER)
+    # The stage only moves forward.
+    assert resolve("cat", "senior", 0, 0, 0, FAST) == ("senior", NEVER, NEVER, NEVER)
+
+
+def test_pet_grows_up_on_food_age_and_happy_ticks():
+    config = replace(FAST, hunger_per_tick=0, happiness_per_tick=0, energy_per_tick=0)
+    pet = Pet("tama", hunger=50, happiness=80, config=config)
+    pet.feed()
+    assert pet._stage == "baby"
+    pet.feed()
+    assert pet._stage == "adult"
+    for _ in range(298):
+        pet.tick()
+    assert (pet.age, pet._stage) == (298, "adult")
+    pet.tick()
+    pet.tick()
+    assert (pet.age, pet.happy_ticks, pet._stage) == (300, 300, "senior")
+
+
+def test_species_chains():
+    config = replace(FAST, chains={"dragon": [Evolution("adult", age=5), Evolution("senior", happy=1_000)]})
+    dragon, cat = Pet("d", species="dragon", config=config), Pet("c", config=config)
+    for _ in range(5):
+        dragon.tick()
+        cat.tick()
+    assert (dragon._stage, cat._stage) == ("adult", "baby")
+    dragon.species = "cat"
+    assert dragon._food_goal == NEVER and dragon._age_goal == 300
+
+
+def test_chains_are_part_of_the_config():
+    steps = [Evolution("adult", food=300), Evolution("senior", age=10)]
+    config = PetConfig(chains={"dragon": steps})
+    assert config.chains == (("dragon", tuple(steps)),)
+    # As written by replay/solver files and read back from JSON.
+    loaded = PetConfig(**json.loads(json.dumps(asdict(config))))
+    assert loaded == config and hash(loaded) == hash(config)
+    assert config_digest(config) != config_digest(PetConfig())
+    assert config_digest(PetConfig(chains={})) == config_digest(PetConfig())
+
+
+def test_unknown_stages_are_rejected_up_front():
+    with pytest.raises(ValueError, match="teen"):
+        PetConfig(chains={"dragon": [Evolution("teen", food=10)]})
+    with pytest.raises(ValueError):
+        PetConfig(chains={"dragon": [{"stage": "adult", "wings": 2}]})
+    with pytest.raises(ValueError):
+        PetConfig(chains={"dragon": [Evolution("adult", food=-1)]})
+
+
+def test_advance_matches_repeated_tick_across_evolutions():
+    rng = random.Random(24)
+    for _ in range(200):
+        config = replace(
+            FAST,
+            hunger_per_tick=rng.randint(-1, 1),
+            happiness_per_tick=rng.randint(-2, 2),
+            energy_per_tick=rng.randint(-2, 0),
+            sleep_happiness_change_per_tick=rng.randint(-1, 2),
+            age_to_senior=rng.randint(0, 2_000),
+            happy_ticks_to_senior=rng.randint(0, 1_000),
+        )
+        pet = Pet("tama", stage=rng.choice(["baby", "adult"]), hunger=rng.randint(0, 60),
+                  happiness=rng.randint(0, 100), energy=rng.randint(20, 100), config=config)
+        twin = copy.copy(pet)
+        n = rng.randint(0, 5_000)
+        for _ in range(n):
+            twin.tick()
+        pet.advance(n)
+        assert state(pet) == state(twin)
+
+
+def test_population_matches_pets():
+    rng = random.Random(25)
+    config = replace(FAST, food_to_adult=20, age_to_senior=40, happy_ticks_to_senior=10)
+    pets = [Pet(f"p{i}", species=rng.choice(["cat", "dog", "dragon"]), hunger=rng.randint(0, 60),
+                happiness=rng.randint(0, 100), config=config) for i in range(100)]
+    population = PetPopulation.from_pets(pets, config)
+    interned = InternedPopulation.from_pets(pets, config)
+    for _ in range(400):
+        indices = [rng.randrange(len(pets)) for _ in range(rng.randrange(6))]
+        actions = [rng.randrange(len(ACTION_NAMES)) for _ in indices]
+        apply_actions(population, indices, actions)
+        for i, action in zip(indices, actions):
+            interned.act(i, action)
+            apply_action(pets[i], action)
+        population.tick()
+        interned.tick()
+        for pet in pets:
+            pet.tick()
+    expected = [state(pet) for pet in pets]
+    assert [state(pet) for pet in population.to_pets()] == expected
+    assert [state(pet) for pet in interned.to_population().to_pets()] == expected
+    assert {pet._stage for pet in pets} >= {"adult", "senior"}
@@ -0,0 +1,89 @@
+# test_history.py
+import copy
+import random
+import tracemalloc
+
+import pytest
+
+from history import STATS, StatHistory
+from pet import Pet, PetConfig
+
+SMALL = (("tick", 1, 5), ("quarter", 4, 3), ("hour", 12, 2))
+
+
+def _expected(ticks, size, kept):
+    """(min, max, mean) buckets from the full list of recorded values."""
+    closed = len(ticks) // size
+    rows = []
+    for b in range(max(0, closed - kept), closed):
+        chunk = ticks[b * size:(b + 1) * size]
+        rows.append((min(chunk), max(chunk), sum(chunk) / size))
+    rest = ticks[closed * size:]
+    if rest:
+        rows.append((min(rest), max(rest), sum(rest) / len(rest)))
+    return rows
+
+
+def test_levels_match_brute_force():
+    rng = random.Random(25)
+    history = StatHistory(SMALL)
+    recorded = {stat: [] for stat in STATS}
+    for n in range(100):
+        values = [rng.randint(-5, 105) for _ in STATS]
+        history.record(*values)
+        for stat, value in zip(STATS, values):
+            recorded[stat].append(value)
+        for stat in STATS:
+            assert history.recent(stat) == recorded[stat][-5:]
+            assert history.buckets(stat, "tick") == [(v, v, float(v)) for v in recorded[stat][-5:]]
+            assert history.buckets(stat, "quarter") == _expected(recorded[stat], 4, 3), n
+            assert history.buckets(stat, "hour") == _expected(recorded[stat], 12, 2), n
+
+
+def test_advance_records_every_tick():
+    pet = Pet("tama", hunger=10)
+    twin = copy.copy(pet)
+    history = StatHistory(SMALL)
+    history.advance(pet, 30)
+    seen = []
+    for _ in range(30):
+        twin.tick()
+        seen.append(twin.energy)
+    assert pet.to_dict() == twin.to_dict()
+    assert history.ticks == 30
+    assert history.recent("energy") == seen[-5:]
+
+
+def test_memory_does_not_grow_with_age():
+    history = StatHistory()
+    size = history.nbytes()
+    for i in range(4000):
+        history.record(i % 100, 50, 100 - i % 100)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(8000):
+        history.record(i % 100, 50, 100 - i % 100)
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert history.nbytes() == size
+    assert grown < 1024
+
+
+def test_bad_levels_are_rejected():
+    with pytest.raises(ValueError):
+        StatHistory((("minute", 60, 10),))
+    with pytest.raises(ValueError):
+        StatHistory((("tick", 1, 10), ("minute", 60, 10), ("odd", 90, 10)))
+    with pytest.raises(ValueError):
+        StatHistory(SMALL).buckets("hunger", "day")
+
+
+def test_wide_stat_ranges_fit():
+    config = PetConfig(min_stat=-100_000, max_stat=100_000, death_hunger=100_000, death_energy=-100_000,
+                       death_happiness=-100_000)
+    history = StatHistory(SMALL, config)
+    for value in (100_000, -100_000, 40_000):
+        history.record(value, value, value)
+    assert history.recent("hunger") == [100_000, -100_000, 40_000]
+    assert history.buckets("energy", "quarter") == [(-100_000, 100_000, 40_000 / 3)]
+    assert StatHistory(SMALL).nbytes() < history.nbytes()
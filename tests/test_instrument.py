@@ -0,0 +1,118 @@
+# test_instrument.py
+import json
+import random
+import time
+import types
+
+import main
+from instrument import (
+    _BUCKETS,
+    MAX_TRACKABLE_NS,
+    Instrumentation,
+    LatencyHistogram,
+    _bucket_bounds,
+    _bucket_index,
+)
+from pet import Pet
+
+
+def test_buckets_tile_the_value_range():
+    expected_low = 0
+    for index in range(_BUCKETS):
+        low, high = _bucket_bounds(index)
+        assert low == expected_low and high >= low
+        assert _bucket_index(low) == index and _bucket_index(high) == index
+        expected_low = high + 1
+    assert expected_low == MAX_TRACKABLE_NS + 1
+
+
+def test_percentiles_within_bucket_precision():
+    rng = random.Random(11)
+    values = [int(rng.lognormvariate(12, 2)) for _ in range(20_000)]
+    hist = LatencyHistogram()
+    for v in values:
+        hist.record(v)
+    values.sort()
+    for q in (50, 90, 99, 99.9):
+        exact = values[int(len(values) * q / 100 + 0.5) - 1]
+        assert exact <= hist.percentile(q) <= exact * 1.02 + 1
+    assert hist.percentile(100) == hist.max == values[-1]
+    assert hist.min == values[0] and hist.count == len(values)
+
+
+def test_shims_only_installed_while_enabled():
+    instruments = Instrumentation()
+    pet = Pet("x")
+
+    class Job:
+        due = None
+
+        def run(self):
+            return "ran"
+
+    job = Job()
+    instruments.wrap(Pet, "tick", "Pet.tick")
+    instruments.wrap(job, "run", "job", due=lambda: job.due)
+    original_tick = Pet.tick
+
+    pet.tick()
+    assert instruments.histograms["Pet.tick"].count == 0
+
+    instruments.enable()
+    job.due = time.monotonic() - 0.01
+    pet.tick()
+    assert job.run() == "ran"
+    instruments.disable()
+
+    assert Pet.tick is original_tick and "run" not in vars(job)
+    assert instruments.histograms["Pet.tick"].count == 1
+    assert instruments.histograms["job"].count == 1
+    assert instruments.histograms["job.late"].min >= 10_000_000
+
+
+def _stub_app(instruments, latency_file=None):
+    """Just enough of a TamagotchiApp for the overlay and quit handlers."""
+    jobs = []
+    label = types.SimpleNamespace(grid=lambda **kw: None, grid_remove=lambda: None)
+    app = types.SimpleNamespace(instruments=instruments, latency_label=label, latency_file=latency_file,
+                                _overlay_job=None, after_cancel=jobs.remove, jobs=jobs,
+                                record_file=None, destroy=lambda: None)
+
+    def refresh():
+        app._overlay_job = "job"
+        jobs.append("job")
+
+    app._refresh_latency_overlay = refresh
+    return app
+
+
+def test_hiding_the_overlay_stops_recording():
+    instruments = Instrumentation()
+    instruments.wrap(Pet, "tick", "Pet.tick")
+    original_tick = Pet.tick
+    app = _stub_app(instruments)
+    try:
+        main.TamagotchiApp.toggle_latency_overlay(app)
+        assert instruments.enabled and Pet.tick is not original_tick
+        main.TamagotchiApp.toggle_latency_overlay(app)
+        assert not instruments.enabled and Pet.tick is original_tick
+        assert app._overlay_job is None and app.jobs == []
+    finally:
+        instruments.disable()
+
+
+def test_latency_file_survives_the_overlay(tmp_path):
+    instruments = Instrumentation()
+    instruments.wrap(Pet, "tick", "Pet.tick")
+    path = tmp_path / "latency.json"
+    app = _stub_app(instruments, str(path))
+    instruments.enable()        # as TamagotchiApp does for --latency
+    try:
+        main.TamagotchiApp.toggle_latency_overlay(app)
+        main.TamagotchiApp.toggle_latency_overlay(app)
+        assert instruments.enabled
+        Pet("x").tick()
+        main.TamagotchiApp.on_quit(app)
+    finally:
+        instruments.disable()
+    assert json.loads(path.read_text())["histograms"]["Pet.tick"]["count"] == 1
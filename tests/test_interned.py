@@ -0,0 +1,92 @@
+# test_interned.py
+import random
+
+from actions import ACTION_NAMES, FEED, apply_action
+from tests.conftest import population_columns
+from interned import InternedPopulation
+from pet import Pet, PetConfig
+from population import PetPopulation
+
+
+def test_fresh_pets_share_one_class():
+    population = InternedPopulation.from_pets(Pet(f"p{i}") for i in range(1000))
+    assert len(population) == 1000
+    assert population.distinct == 1
+    population.tick(50)
+    assert population.distinct == 1
+    assert population.pet_at(7).name == "p7"
+    assert population.pet_at(7).to_dict() == {**population.pet_at(0).to_dict(), "name": "p7"}
+
+
+def test_matches_per_pet_simulation():
+    config = PetConfig(food_to_adult=60)
+    rng = random.Random(4)
+    pets = [Pet(f"p{i}", hunger=rng.choice((20, 40)), energy=rng.choice((30, 70)), config=config) for i in range(200)]
+    interned = InternedPopulation.from_pets(pets, config)
+    reference = [Pet.from_dict(pet.to_dict(), config) for pet in pets]
+
+    for _ in range(150):
+        for _ in range(rng.randrange(4)):
+            i = rng.randrange(len(pets))
+            action = rng.randrange(len(ACTION_NAMES))
+            assert interned.act(i, action) == apply_action(reference[i], action)
+        interned.tick()
+        for pet in reference:
+            pet.tick()
+        assert interned.distinct <= len(interned.classes)
+
+    expected = PetPopulation.from_pets(reference, config)
+    assert population_columns(interned.to_population()) == population_columns(expected)
+    assert [interned.pet_at(i).to_dict() for i in range(len(pets))] == [p.to_dict() for p in reference]
+
+
+def test_converging_pets_are_merged():
+    config = PetConfig(feed_amount=10)
+    population = InternedPopulation.from_pets([Pet(f"p{i}", config=config) for i in range(100)], config)
+    for i in range(0, 100, 2):
+        population.act(i, 0)   # feed: hunger 20 -> 10, plus the eat animation
+    assert population.distinct == 2
+    # Once everyone is fed (hunger 10, same food count) it is one state again.
+    for i in range(1, 100, 2):
+        population.act(i, 0)
+    assert population.distinct == 1
+    population.tick()
+    assert len(population.classes) == 1
+    assert sum(population.members) == 100
+
+
+def test_act_on_pets_that_ticked_into_the_same_state():
+    config = PetConfig()
+    pets = [Pet("a", hunger=99, config=config), Pet("b", hunger=98, config=config)]
+    pets += [Pet(f"p{i}", hunger=10 * i, config=config) for i in range(3)]
+    interned = InternedPopulation.from_pets(pets, config)
+    reference = [Pet.from_dict(pet.to_dict(), config) for pet in pets]
+    interned.tick()
+    for pet in reference:
+        pet.tick()
+    # a and b both reach hunger 100 (and die), but only one of their rows is indexed.
+    assert interned.distinct == 4 < len(interned.classes)
+    for i in (1, 0, 2):
+        assert interned.act(i, FEED) == apply_action(reference[i], FEED)
+        assert interned.distinct == len({str(pet.to_dict() | {"name": ""}) for pet in reference})
+    assert [interned.pet_at(i).to_dict() for i in range(len(pets))] == [p.to_dict() for p in reference]
+
+
+def test_actions_after_merging_ticks_fuzz():
+    rng = random.Random(18)
+    for _ in range(30):
+        config = PetConfig(hunger_per_tick=rng.randint(1, 3), feed_amount=rng.randint(1, 30))
+        pets = [Pet(f"p{i}", hunger=rng.randint(60, 100), energy=rng.choice((20, 90)), config=config)
+                for i in range(rng.randint(2, 12))]
+        interned = InternedPopulation.from_pets(pets, config)
+        reference = [Pet.from_dict(pet.to_dict(), config) for pet in pets]
+        for _ in range(30):
+            interned.tick()
+            for pet in reference:
+                pet.tick()
+            for _ in range(rng.randrange(4)):
+                i = rng.randrange(len(pets))
+                action = rng.randrange(len(ACTION_NAMES))
+                assert interned.act(i, action) == apply_action(reference[i], action)
+            assert interned.distinct == len({str(p.to_dict() | {"name": ""}) for p in reference})
+        assert [interned.pet_at(i).to_dict() for i in range(len(pets))] == [p.to_dict() for p in reference]
@@ -1,6 +1,204 @@
 # test_pet.py
-# Placeholder for unit tests related to the Pet class.
+# Unit tests for the Pet class.
 
-# TODO: add unit tests later
-def test_placeholder():
-    assert True
+import copy
+import json
+import random
+from dataclasses import replace
+
+from pet import ASCII_SPRITES, DEFAULT_CONFIG, Pet, PetConfig
+
+
+def full_state(pet):
+    return (
+        pet._stage,
+        pet.total_food_eaten,
+        pet.age,
+        pet.happy_ticks,
+        pet.hunger,
+        pet.happiness,
+        pet.energy,
+        pet._state,
+        pet._is_sleeping,
+        pet._play_cooldown,
+        pet._visual_action,
+        pet._visual_action_ticks_remaining,
+    )
+
+
+def make_pet(rng, config):
+    pet = Pet(
+        "tama",
+        hunger=rng.randint(-5, 105),
+        happiness=rng.randint(-5, 105),
+        energy=rng.randint(-5, 105),
+        config=config,
+    )
+    for _ in range(rng.randint(0, 3)):
+        rng.choice([pet.feed, pet.play, pet.sleep, pet.wake])()
+    return pet
+
+
+def test_advance_matches_repeated_tick_default_config():
+    rng = random.Random(10)
+    for _ in range(300):
+        pet = make_pet(rng, PetConfig())
+        twin = copy.copy(pet)
+        n = rng.randint(0, 200)
+        for _ in range(n):
+            twin.tick()
+        pet.advance(n)
+        assert full_state(pet) == full_state(twin)
+
+
+def test_advance_matches_repeated_tick_random_configs():
+    rng = random.Random(11)
+    for _ in range(300):
+        config = replace(
+            PetConfig(),
+            hunger_per_tick=rng.randint(-2, 3),
+            energy_per_tick=rng.randint(-3, 2),
+            happiness_per_tick=rng.randint(-2, 2),
+            sleep_energy_gain_per_tick=rng.randint(-1, 7),
+            sleep_hunger_increase_per_tick=rng.randint(-2, 2),
+            sleep_happiness_change_per_tick=rng.randint(-2, 2),
+            auto_sleep_energy_threshold=rng.randint(-2, 50),
+            auto_wake_energy_threshold=rng.randint(20, 102),
+            death_hunger=rng.choice([100, 101]),
+            death_energy=rng.choice([-1, 0]),
+            death_happiness=rng.choice([-1, 0]),
+        )
+        pet = make_pet(rng, config)
+        twin = copy.copy(pet)
+        n = rng.randint(0, 500)
+        for _ in range(n):
+            twin.tick()
+        pet.advance(n)
+        assert full_state(pet) == full_state(twin)
+
+
+def test_advance_cost_depends_on_events_not_length(monkeypatch):
+    config = replace(
+        PetConfig(),
+        hunger_per_tick=0,
+        sleep_hunger_increase_per_tick=0,
+        happiness_per_tick=0,
+    )
+    pet = Pet("tama", config=config)
+    calls = 0
+    original_tick = Pet.tick
+
+    def counting_tick(self):
+        nonlocal calls
+        calls += 1
+        original_tick(self)
+
+    monkeypatch.setattr(Pet, "tick", counting_tick)
+    pet.advance(100_000)
+    assert pet.state != "dead"
+    # A full awake/sleep cycle is ~80 ticks and costs a few single ticks.
+    assert calls < 100_000 // 10
+
+
+def test_advance_skips_whole_cycles(monkeypatch):
+    rng = random.Random(13)
+    for _ in range(40):
+        config = replace(
+            PetConfig(),
+            hunger_per_tick=0,
+            sleep_hunger_increase_per_tick=0,
+            happiness_per_tick=rng.randint(-1, 0),
+            sleep_happiness_change_per_tick=rng.randint(0, 2),
+            energy_per_tick=rng.randint(-3, -1),
+            sleep_energy_gain_per_tick=rng.randint(1, 7),
+        )
+        pet = make_pet(rng, config)
+        twin = copy.copy(pet)
+        n = rng.randint(2_000, 20_000)
+        for _ in range(n):
+            twin.tick()
+        pet.advance(n)
+        assert full_state(pet) == full_state(twin)
+
+    # Ten years cost about as much as one cycle.
+    pet = Pet("tama", config=replace(PetConfig(), hunger_per_tick=0, sleep_hunger_increase_per_tick=0,
+                                     happiness_per_tick=0))
+    calls = 0
+    original_tick = Pet.tick
+
+    def counting_tick(self):
+        nonlocal calls
+        calls += 1
+        original_tick(self)
+
+    monkeypatch.setattr(Pet, "tick", counting_tick)
+    pet.advance(10 * 365 * 24 * 3600)
+    assert pet.state != "dead"
+    assert calls < 100
+
+
+def test_ticks_until_visible_change_never_skips_a_change():
+    rng = random.Random(12)
+    levels = {
+        "hunger": lambda v: 220 * (100 - max(0, min(100, v))) // 100,
+        "energy": lambda v: 220 * max(0, min(100, v)) // 100,
+    }
+
+    def view(pet):
+        return (
+            pet.state,
+            pet.is_sleeping,
+            pet._visual_mode(),
+            levels["hunger"](pet.hunger),
+            levels["energy"](pet.energy),
+            pet.happiness,
+        )
+
+    for _ in range(300):
+        config = replace(
+            PetConfig(),
+            hunger_per_tick=rng.randint(0, 2),
+            energy_per_tick=rng.randint(-1, 0),
+            happiness_per_tick=rng.randint(-1, 0),
+        )
+        pet = make_pet(rng, config)
+        k = pet.ticks_until_visible_change(50, levels)
+        assert 1 <= k <= 50
+        before = view(pet)
+        for _ in range(k - 1):
+            pet.tick()
+            assert view(pet) == before
+
+
+def legacy_frame(pet, frame_index):
+    """The dict-walking lookup get_ascii_frame used before the sprite table."""
+    species_sprites = ASCII_SPRITES.get(pet.species, ASCII_SPRITES["cat"])
+    stage_sprites = species_sprites.get(pet._stage) or species_sprites.get("baby")
+    frames = stage_sprites.get(pet._visual_mode()) or stage_sprites["idle"]
+    return frames[frame_index % len(frames)]
+
+
+def test_sprite_table_matches_dict_lookup_through_actions():
+    rng = random.Random(13)
+    for species in ("cat", "dog", "dragon", "unicorn"):
+        for _ in range(20):
+            pet = make_pet(rng, PetConfig())
+            pet.species = species
+            for step in range(80):
+                rng.choice([pet.tick, pet.tick, pet.tick, pet.feed, pet.play, pet.sleep, pet.wake])()
+                frame = rng.randint(0, 10)
+                assert pet.get_ascii_frame(frame) == legacy_frame(pet, frame)
+
+
+def test_pets_are_slotted_and_share_configs():
+    a = Pet("a")
+    assert not hasattr(a, "__dict__")
+    assert a._config is DEFAULT_CONFIG
+    b = Pet("b", config=PetConfig(feed_amount=5))
+    c = Pet("c", config=PetConfig(feed_amount=5))
+    assert b._config is c._config and b._config != DEFAULT_CONFIG
+
+    b.feed()
+    loaded = Pet.from_dict(json.loads(json.dumps(b.to_dict())))
+    assert loaded.species is a.species and loaded._visual_action is b._visual_action
+    assert loaded.to_dict() == b.to_dict()
@@ -0,0 +1,107 @@
+# test_population.py
+# Equivalence tests: PetPopulation must behave exactly like Pet.
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from pet import Pet, PetConfig
+from population import PetPopulation
+
+
+def snapshot(pet):
+    return (
+        pet.name,
+        pet.species,
+        pet._stage,
+        pet.hunger,
+        pet.happiness,
+        pet.energy,
+        pet.total_food_eaten,
+        pet.age,
+        pet.happy_ticks,
+        (pet._food_goal, pet._age_goal, pet._happy_goal),
+        pet._state,
+        pet._is_sleeping,
+        pet._play_cooldown,
+        pet._visual_action,
+        pet._visual_action_ticks_remaining,
+    )
+
+
+def random_pet(rng, config, index):
+    pet = Pet(
+        name=f"pet{index}",
+        species=rng.choice(["cat", "dog", "dragon"]),
+        stage=rng.choice(["baby", "adult", "senior"]),
+        hunger=rng.randint(-5, 105),
+        happiness=rng.randint(-5, 105),
+        energy=rng.randint(-5, 105),
+        config=config,
+    )
+    for _ in range(rng.randint(0, 3)):
+        rng.choice([pet.feed, pet.play, pet.sleep, pet.wake])()
+    return pet
+
+
+def random_config(rng):
+    return replace(
+        PetConfig(),
+        hunger_per_tick=rng.randint(-1, 4),
+        energy_per_tick=rng.randint(-3, 1),
+        happiness_per_tick=rng.randint(-3, 1),
+        sleep_energy_gain_per_tick=rng.randint(0, 8),
+        sleep_hunger_increase_per_tick=rng.randint(-1, 3),
+        sleep_happiness_change_per_tick=rng.randint(-2, 2),
+        play_cooldown_ticks=rng.randint(0, 4),
+        action_visual_ticks=rng.randint(0, 4),
+        auto_sleep_energy_threshold=rng.randint(0, 40),
+        auto_wake_energy_threshold=rng.randint(30, 100),
+        food_to_adult=rng.randint(0, 60),
+        age_to_senior=rng.randint(0, 40),
+        happy_ticks_to_senior=rng.randint(0, 30),
+    )
+
+
+def test_round_trip_preserves_every_field():
+    rng = random.Random(1)
+    config = PetConfig()
+    pets = [random_pet(rng, config, i) for i in range(50)]
+    population = PetPopulation.from_pets(pets)
+    assert len(population) == 50
+    assert [snapshot(p) for p in population.to_pets()] == [snapshot(p) for p in pets]
+
+
+def test_tick_matches_scalar_pet_default_config():
+    rng = random.Random(2)
+    config = PetConfig()
+    pets = [random_pet(rng, config, i) for i in range(200)]
+    population = PetPopulation.from_pets(pets)
+
+    for _ in range(150):
+        for pet in pets:
+            pet.tick()
+        population.tick()
+        assert [snapshot(p) for p in population.to_pets()] == [snapshot(p) for p in pets]
+
+
+def test_tick_matches_scalar_pet_random_configs():
+    rng = random.Random(3)
+    for _ in range(20):
+        config = random_config(rng)
+        pets = [random_pet(rng, config, i) for i in range(30)]
+        population = PetPopulation.from_pets(pets, config)
+
+        for _ in range(60):
+            for pet in pets:
+                pet.tick()
+            population.tick()
+        assert [snapshot(p) for p in population.to_pets()] == [snapshot(p) for p in pets]
+
+
+def test_from_pets_rejects_mixed_configs():
+    pets = [Pet("a"), Pet("b", config=PetConfig(hunger_per_tick=5))]
+    with pytest.raises(ValueError):
+        PetPopulation.from_pets(pets)
+    assert PetPopulation.from_pets(pets, PetConfig()).config == PetConfig()
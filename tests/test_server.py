@@ -0,0 +1,79 @@
+# test_server.py
+import asyncio
+import functools
+import json
+
+from loadgen import run_load
+from pet import Pet
+from server import PetServer, pet_name, serve
+
+
+async def _with_server(pets, body, **options):
+    server = PetServer({pet_name(i): Pet(pet_name(i)) for i in range(pets)}, **options)
+    started = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(serve(server, port=0, started=started))
+    host, port = (await started)[0].getsockname()[:2]
+    try:
+        return server, await body(functools.partial(asyncio.open_connection, host, port))
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+def test_commands_are_batched_and_answered_in_order():
+    async def body(open_connection):
+        reader, writer = await open_connection()
+        requests = [
+            {"id": 1, "op": "feed", "pet": "pet-0"},
+            {"id": 2, "op": "get", "pet": "pet-0"},
+            {"id": 3, "op": "sleep", "pet": "pet-1"},
+            {"id": 4, "op": "wake", "pet": "pet-2"},
+            {"id": 5, "op": "dance", "pet": "pet-0"},
+            {"id": 6, "op": "get", "pet": "nobody"},
+        ]
+        writer.write(b"".join(json.dumps(r).encode() + b"\n" for r in requests) + b"not json\n")
+        replies = [json.loads(await reader.readline()) for _ in range(len(requests) + 1)]
+        writer.close()
+        return replies
+
+    server, replies = asyncio.run(_with_server(3, body, window=0.05))
+    assert [r["id"] for r in replies] == [1, 2, 3, 4, 5, 6, None]
+    assert [r["ok"] for r in replies] == [True, True, True, True, False, False, False]
+    assert replies[0]["result"] is True and replies[3]["result"] is False
+    assert replies[1]["result"]["hunger"] == 0 and replies[1]["result"]["total_food_eaten"] == 20
+    assert server.pets["pet-1"].is_sleeping
+    assert server.batches_flushed == 1 and server.requests_handled == 7
+
+
+def test_malformed_op_does_not_lose_the_batch():
+    async def body(open_connection):
+        reader, writer = await open_connection()
+        writer.write(b'{"id": 1, "op": [], "pet": "pet-0"}\n{"id": 2, "op": {}, "pet": "pet-0"}\n'
+                     b'{"id": 3, "op": "feed", "pet": "pet-0"}\n')
+        replies = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(3)]
+        writer.close()
+        return replies
+
+    server, replies = asyncio.run(_with_server(1, body, window=0.05))
+    assert [(r["id"], r["ok"]) for r in replies] == [(1, False), (2, False), (3, True)]
+    assert server.requests_handled == 3
+
+
+def test_tick_loop_keeps_all_pets_on_the_clock():
+    async def body(open_connection):
+        await asyncio.sleep(0.35)
+
+    server, _ = asyncio.run(_with_server(2500, body, tick_interval=0.1, batch_size=1000))
+    reference = Pet("ref")
+    reference.advance(server.clock.ticks)
+    assert server.clock.ticks >= 2
+    assert all(pet.to_dict()["hunger"] == reference.hunger for pet in server.pets.values())
+
+
+def test_loadgen_reports_latencies():
+    async def body(open_connection):
+        return await run_load(open_connection, pets=50, connections=2, depth=4, seconds=0.3)
+
+    server, (hist, errors) = asyncio.run(_with_server(50, body))
+    assert hist.count == server.requests_handled > 0
+    assert errors == 0 and hist.percentile(50) <= hist.percentile(99) <= hist.max
@@ -0,0 +1,51 @@
+# test_shards.py
+import random
+
+from pet import Pet, PetConfig
+from population import PetPopulation
+from shards import ShardedPopulation
+
+
+def _pets(n, config, seed):
+    rng = random.Random(seed)
+    pets = []
+    for i in range(n):
+        pet = Pet(
+            f"p{i}",
+            species=rng.choice(["cat", "dog", "dragon"]),
+            hunger=rng.randint(0, 100),
+            happiness=rng.randint(0, 100),
+            energy=rng.randint(0, 100),
+            config=config,
+        )
+        if rng.random() < 0.3:
+            pet.sleep()
+        if rng.random() < 0.3:
+            pet.play()
+        pets.append(pet)
+    return pets
+
+
+def test_sharded_ticks_match_pet_tick():
+    config = PetConfig()
+    pets = _pets(503, config, seed=14)
+    with ShardedPopulation(PetPopulation.from_pets(pets), workers=3) as sharded:
+        for n_ticks in (1, 1, 7, 40):
+            sharded.tick(n_ticks)
+            for pet in pets:
+                for _ in range(n_ticks):
+                    pet.tick()
+            # Reads go straight to shared memory.
+            assert [sharded.hunger[i] for i in range(len(pets))] == [p.hunger for p in pets]
+        result = sharded.to_population().to_pets()
+    assert [p.to_dict() for p in result] == [p.to_dict() for p in pets]
+
+
+def test_more_workers_than_pets_and_empty_population():
+    pets = _pets(2, PetConfig(), seed=1)
+    with ShardedPopulation(PetPopulation.from_pets(pets), workers=8) as sharded:
+        assert len(sharded.shards) == 2
+        sharded.tick(3)
+    with ShardedPopulation(PetPopulation(), workers=2) as sharded:
+        sharded.tick()
+        assert len(sharded.to_population()) == 0
@@ -0,0 +1,102 @@
+# test_solver.py
+import pytest
+
+import solver
+from actions import apply_action
+from pet import Pet, PetConfig, PetState
+from population import PetPopulation
+from solver import IDLE, PolicyTable, solve
+
+# A scaled-down config, so solving takes a second instead of minutes.
+SMALL = PetConfig(
+    max_stat=30,
+    hungry_threshold=20,
+    tired_threshold=9,
+    bored_threshold=9,
+    death_hunger=30,
+    auto_sleep_energy_threshold=4,
+    auto_wake_energy_threshold=24,
+    feed_amount=8,
+    play_happiness_gain=6,
+    play_energy_cost=3,
+)
+
+
+@pytest.fixture(scope="module")
+def survival_table():
+    return solve(SMALL, "survival")
+
+
+def _pet(h, e, p, sleeping, cooldown, config=SMALL):
+    pet = Pet("x", hunger=h, energy=e, happiness=p, config=config)
+    pet._is_sleeping = sleeping
+    pet._play_cooldown = cooldown
+    pet._update_state()
+    return pet
+
+
+def _index_of(pet, config=SMALL):
+    if pet.state == PetState.DEAD:
+        return solver.state_count(config)
+    return solver.state_index(pet.hunger, pet.energy, pet.happiness, pet.is_sleeping, pet._play_cooldown, config)
+
+
+def test_transitions_match_pet():
+    nexts = solver._transitions(SMALL)
+    levels = solver.cooldown_levels(SMALL)
+    for h in range(0, 31, 3):
+        for e in range(0, 31, 2):
+            for p in range(0, 31, 5):
+                for sleeping in (False, True):
+                    for cooldown in range(levels):
+                        index = solver.state_index(h, e, p, sleeping, cooldown, SMALL)
+                        for column, choice in zip(nexts, solver.CHOICES):
+                            pet = _pet(h, e, p, sleeping, cooldown)
+                            if choice != IDLE:
+                                apply_action(pet, choice)
+                            pet.tick()
+                            assert column[index] == _index_of(pet), (h, e, p, sleeping, cooldown, choice)
+
+
+def _survival(table, horizon=20000):
+    pet = Pet("x", config=SMALL)
+    for now in range(horizon):
+        if table is not None:
+            action = table.action_for(pet)
+            if action is not None:
+                apply_action(pet, action)
+        pet.tick()
+        if pet.state == PetState.DEAD:
+            return now
+    return horizon
+
+
+def test_survival_policy_outlives_neglect(survival_table):
+    assert _survival(None) < 1000
+    assert _survival(survival_table) == 20000
+
+
+def test_save_and_load_round_trip(tmp_path):
+    table = PolicyTable(SMALL, "happiness", bytes(i % 5 for i in range(solver.state_count(SMALL))))
+    path = str(tmp_path / "policy.tpol")
+    table.save(path)
+    loaded = PolicyTable.load(path)
+    assert loaded.config == SMALL
+    assert loaded.objective == "happiness"
+    assert loaded.table == table.table
+
+    data = table.to_bytes()
+    with pytest.raises(ValueError):
+        PolicyTable.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        PolicyTable.from_bytes(data[:-10])
+    with pytest.raises(ValueError):
+        PolicyTable(PetConfig(), "survival", table.table)
+
+
+def test_population_lookup_matches_single_pet(survival_table):
+    table = survival_table
+    pets = [_pet(h, e, p, h % 2 == 0, e % 2) for h, e, p in ((3, 20, 5), (25, 6, 18), (12, 29, 0), (0, 0, 30))]
+    population = PetPopulation.from_pets(pets, SMALL)
+    expected = [IDLE if table.action_for(pet) is None else table.action_for(pet) for pet in pets]
+    assert list(table.actions_for_population(population)) == expected
@@ -0,0 +1,46 @@
+# test_state_machine.py
+import random
+
+from pet import STATES, PetConfig, PetState
+from state_machine import (
+    ALIVE, BORED, DEAD, HUNGRY, TIRED, MAX_TABLE_SIZE, ComputedTable, classify, state_table, table_index,
+)
+
+
+def test_codes_follow_pet_state_order():
+    assert [STATES[c] for c in (ALIVE, HUNGRY, TIRED, BORED, DEAD)] == list(PetState)
+
+
+def test_table_matches_classify():
+    rng = random.Random(9)
+    for _ in range(5):
+        config = PetConfig(
+            death_hunger=rng.randint(60, 100),
+            death_energy=rng.randint(0, 10),
+            death_happiness=rng.randint(0, 10),
+            hungry_threshold=rng.randint(40, 90),
+            tired_threshold=rng.randint(5, 40),
+            bored_threshold=rng.randint(5, 40),
+        )
+        table = state_table(config)
+        lo, hi = config.min_stat, config.max_stat
+        assert len(table) == (hi - lo + 1) ** 3
+        for _ in range(20_000):
+            h, e, p = (rng.randint(lo, hi) for _ in range(3))
+            assert table[table_index(h, e, p, lo, hi)] == classify(h, e, p, config)
+
+
+def test_table_is_shared_between_equal_configs():
+    assert state_table(PetConfig()) is state_table(PetConfig())
+    assert state_table(PetConfig()) is not state_table(PetConfig(hungry_threshold=50))
+
+
+def test_wide_ranges_classify_on_lookup():
+    config = PetConfig(min_stat=-500, max_stat=1000, death_hunger=900, hungry_threshold=700)
+    table = state_table(config)
+    assert isinstance(table, ComputedTable) and len(table) == 1501 ** 3
+    rng = random.Random(10)
+    for _ in range(2_000):
+        h, e, p = (rng.randint(-500, 1000) for _ in range(3))
+        assert table[table_index(h, e, p, -500, 1000)] == classify(h, e, p, config)
+    assert isinstance(state_table(PetConfig(max_stat=MAX_TABLE_SIZE - 1)), bytes)
@@ -0,0 +1,57 @@
+# test_sweep.py
+import sweep
+from actions import apply_action
+from pet import Pet, PetConfig, PetState
+from policies import POLICIES
+from sweep import run_sweep, simulate
+
+
+def _reference(config, policy, horizon):
+    """simulate() done the slow way: one tick at a time."""
+    pet = Pet("sim", config=config)
+    state_ticks = dict.fromkeys(sweep.LIVING_STATES, 0)
+    adult_at = None
+    for now in range(horizon + 1):
+        if now % policy.check_every == 0:
+            for action in policy.decide(pet):
+                apply_action(pet, action)
+            if adult_at is None and pet._stage != "baby":
+                adult_at = now
+        if pet.state == PetState.DEAD:
+            return {"survived": False, "survival_ticks": now, "state_ticks": state_ticks, "adult_at": adult_at}
+        if now == horizon:
+            break
+        pet.tick()
+        if pet.state != PetState.DEAD:
+            state_ticks[pet.state.value] += 1
+    return {"survived": True, "survival_ticks": horizon, "state_ticks": state_ticks, "adult_at": adult_at}
+
+
+def test_simulate_matches_tick_by_tick():
+    for config in (PetConfig(), PetConfig(hunger_per_tick=1, feed_amount=15), PetConfig(energy_per_tick=-2)):
+        for policy in POLICIES.values():
+            assert simulate(config, policy, 5000) == _reference(config, policy, 5000), policy.name
+
+
+def test_enlarged_grid_only_runs_new_points(tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache.jsonl")
+    ran = []
+    real_run_task = sweep._run_task
+    monkeypatch.setattr(sweep, "_run_task", lambda task: ran.append(task) or real_run_task(task))
+
+    first = run_sweep(sweep.grid_points({"feed_amount": [15, 25]}), ["attentive"], 2000, cache, workers=1)
+    assert len(ran) == 2
+    ran.clear()
+    second = run_sweep(sweep.grid_points({"feed_amount": [15, 25, 35]}), ["attentive"], 2000, cache, workers=1)
+    assert [task[0] for task in ran] == [{"feed_amount": 35}]
+    assert second[:2] == first
+
+
+def test_periodic_runs_skip_to_the_horizon():
+    config = PetConfig(hunger_per_tick=1, feed_amount=15)
+    for policy in POLICIES.values():
+        assert simulate(config, policy, 20_000) == _reference(config, policy, 20_000), policy.name
+    ten_years = 10 * 365 * 24 * 3600
+    result = simulate(PetConfig(), POLICIES["attentive"], ten_years)
+    assert result["survived"]
+    assert sum(result["state_ticks"].values()) == ten_years
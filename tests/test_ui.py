@@ -0,0 +1,51 @@
+# test_ui.py
+# Tests for the diffing terminal renderer.
+
+import io
+
+from pet import Pet
+from ui import TerminalApp, TerminalRenderer
+
+
+def test_first_frame_draws_everything_then_nothing_when_unchanged():
+    out = io.StringIO()
+    renderer = TerminalRenderer(out, width=10, height=3)
+    assert renderer.render(["hello", "world"]) > 0
+    assert "hello" in out.getvalue()
+
+    out.truncate(0)
+    out.seek(0)
+    assert renderer.render(["hello", "world"]) == 0
+    assert out.getvalue() == ""
+
+
+def test_only_changed_cells_are_written():
+    out = io.StringIO()
+    renderer = TerminalRenderer(out, width=40, height=2)
+    renderer.render(["Hunger [##########..........]", "State: ALIVE"])
+
+    out.truncate(0)
+    out.seek(0)
+    renderer.render(["Hunger [#########...........]", "State: ALIVE"])
+    assert out.getvalue() == "\x1b[1;18H."
+
+
+def test_wide_characters_are_rewritten_whole():
+    out = io.StringIO()
+    renderer = TerminalRenderer(out, width=10, height=1)
+    renderer.render(["ab⚽cd"])
+
+    out.truncate(0)
+    out.seek(0)
+    renderer.render(["abxycd"])
+    assert out.getvalue() == "\x1b[1;3Hxy"
+
+
+def test_app_frame_and_keys_drive_the_pets():
+    app = TerminalApp([Pet("Tama"), Pet("Rex", species="dog")], out=io.StringIO())
+    assert any("Rex the Dog" in line for line in app.frame_lines(0))
+
+    assert app.on_key("\t")
+    assert app.on_key("s")
+    assert app.pets[1].is_sleeping and not app.pets[0].is_sleeping
+    assert not app.on_key("q")